@@ -0,0 +1,57 @@
+"""Measure IVF recall@k and latency against exact dense retrieval.
+
+Usage::
+
+    python benchmarks/memory_ann_recall.py --size 200000 --nlist 256 --nprobe 1 4 16 64
+
+Requires ``numpy``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from cognitive_core.core.memory.dense_index import DenseIndex
+from cognitive_core.core.memory.faiss_adapter import _embed
+from cognitive_core.core.memory.ivf_index import IVFIndex
+from memory_retrieval import make_corpus, make_queries
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=200_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--nlist", type=int, default=256)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 4, 16, 64])
+    args = parser.parse_args(argv)
+
+    embeddings = [_embed(text) for text in make_corpus(args.size)]
+    queries = [_embed(text) for text in make_queries(args.queries)]
+
+    exact = DenseIndex(args.dim)
+    exact.add_many(embeddings)
+    start = time.perf_counter()
+    truth = [{slot for _, slot in exact.search(q, args.top_k)} for q in queries]
+    exact_ms = (time.perf_counter() - start) * 1e3 / len(queries)
+
+    start = time.perf_counter()
+    ivf = IVFIndex(args.dim, nlist=args.nlist)
+    ivf.add_many(embeddings)
+    build_s = time.perf_counter() - start
+
+    print(f"entries={args.size} dim={args.dim} nlist={args.nlist} build={build_s:.1f}s")
+    print(f"{'nprobe':>8} {'recall@' + str(args.top_k):>10} {'ms/q':>8}")
+    print(f"{'exact':>8} {1.0:>10.3f} {exact_ms:>8.2f}")
+    for nprobe in args.nprobe:
+        start = time.perf_counter()
+        found = [{slot for _, slot in ivf.search(q, args.top_k, nprobe=nprobe)} for q in queries]
+        ivf_ms = (time.perf_counter() - start) * 1e3 / len(queries)
+        recall = sum(len(t & f) for t, f in zip(truth, found)) / sum(len(t) for t in truth)
+        print(f"{nprobe:>8} {recall:>10.3f} {ivf_ms:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Compare BM25 (MaxScore) with cosine retrieval for quality and latency.
+
+Usage::
+
+    python benchmarks/memory_bm25.py --size 200000 --queries 200
+
+Each query is built from one stored memory ("the answer"): a few of its
+tokens plus frequent filler tokens from the Zipf head.  Quality is reported
+as recall@k and MRR of the answer; latency as milliseconds per query.  The
+``bm25-exhaustive`` column scores every posting of every query token and
+shows what MaxScore pruning saves.
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections import Counter
+import heapq
+import math
+import random
+import time
+from typing import Callable, List, Sequence, Tuple
+
+from cognitive_core.core.memory.bm25_index import BM25Index
+from cognitive_core.core.memory.faiss_adapter import _embed
+from cognitive_core.core.memory.inverted_index import InvertedIndex
+from memory_retrieval import make_corpus
+
+
+def make_known_item_queries(
+    corpus: Sequence[str], count: int, *, fillers: int = 3, seed: int = 2
+) -> List[Tuple[str, int]]:
+    """Return ``(query, answer_slot)`` pairs built from stored memories."""
+
+    rng = random.Random(seed)
+    head = [f"t{rank}" for rank in range(20)]
+    queries = []
+    for _ in range(count):
+        slot = rng.randrange(len(corpus))
+        tokens = sorted(set(corpus[slot].split()))
+        picked = rng.sample(tokens, k=min(3, len(tokens)))
+        queries.append((" ".join(picked + rng.sample(head, k=fillers)), slot))
+    return queries
+
+
+def exhaustive_bm25(index: BM25Index, query: Counter[str], top_k: int) -> List[Tuple[float, int]]:
+    """Score every posting of the query tokens without pruning."""
+
+    count = len(index)
+    norm_a = index.k1 * (1.0 - index.b)
+    norm_b = index.k1 * index.b * count / index._total_length
+    scores: dict[int, float] = {}
+    for token, query_tf in query.items():
+        slots, tfs = index._postings_of(token)
+        if not slots:
+            continue
+        df = len(slots)
+        weight = query_tf * math.log(1.0 + (count - df + 0.5) / (df + 0.5)) * (index.k1 + 1.0)
+        for slot, tf in zip(slots, tfs):
+            denominator = tf + norm_a + norm_b * index._lengths[slot]
+            scores[slot] = scores.get(slot, 0.0) + weight * tf / denominator
+    return heapq.nlargest(top_k, ((s, slot) for slot, s in scores.items()), key=lambda i: (i[0], -i[1]))
+
+
+def _evaluate(
+    search: Callable[[Counter[str], int], List[Tuple[float, int]]],
+    queries: Sequence[Tuple[Counter[str], int]],
+    top_k: int,
+) -> Tuple[float, float, float]:
+    hits = 0
+    reciprocal = 0.0
+    start = time.perf_counter()
+    rankings = [search(query, top_k) for query, _ in queries]
+    elapsed = time.perf_counter() - start
+    for ranking, (_, answer) in zip(rankings, queries):
+        slots = [slot for _, slot in ranking]
+        if answer in slots:
+            hits += 1
+            reciprocal += 1.0 / (slots.index(answer) + 1)
+    return hits / len(queries), reciprocal / len(queries), elapsed * 1e3 / len(queries)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=200_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--fillers", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    corpus = make_corpus(args.size)
+    embeddings = [_embed(text) for text in corpus]
+    queries = [
+        (_embed(query), answer)
+        for query, answer in make_known_item_queries(corpus, args.queries, fillers=args.fillers)
+    ]
+
+    cosine = InvertedIndex()
+    cosine.add_many(embeddings)
+    bm25 = BM25Index()
+    bm25.add_many(embeddings)
+
+    columns = {
+        "cosine": cosine.search,
+        "bm25-maxscore": bm25.search,
+        "bm25-exhaustive": lambda query, top_k: exhaustive_bm25(bm25, query, top_k),
+    }
+    print(f"entries={args.size} queries={args.queries} top_k={args.top_k}")
+    print(f"{'ranking':>16} {'recall@' + str(args.top_k):>10} {'MRR':>8} {'ms/q':>8}")
+    for name, search in columns.items():
+        recall, mrr, ms = _evaluate(search, queries, args.top_k)
+        print(f"{name:>16} {recall:>10.3f} {mrr:>8.3f} {ms:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Measure the RAM footprint of memory index representations.
+
+Usage::
+
+    python benchmarks/memory_footprint.py --size 1000000
+
+Each representation is built from the same synthetic corpus while
+``tracemalloc`` records the Python heap; texts are excluded so the numbers
+show the per-memory cost of the embedding storage alone.
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections import Counter
+import gc
+import tracemalloc
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from cognitive_core.core.memory.bm25_index import BM25Index
+from cognitive_core.core.memory.faiss_adapter import _embed
+from cognitive_core.core.memory.inverted_index import InvertedIndex
+from memory_retrieval import make_corpus
+
+
+class CounterPerMemory:
+    """The original layout: one ``Counter`` per stored memory."""
+
+    def __init__(self) -> None:
+        self.embeddings: List[Counter[str]] = []
+
+    def add(self, embedding: Counter[str]) -> None:
+        self.embeddings.append(embedding)
+
+
+class TuplePostings:
+    """The previous inverted-index layout: string-keyed lists of tuples."""
+
+    def __init__(self) -> None:
+        self.postings: Dict[str, List[Tuple[int, int]]] = {}
+        self.norms: List[float] = []
+
+    def add(self, embedding: Counter[str]) -> None:
+        slot = len(self.norms)
+        for token, weight in embedding.items():
+            self.postings.setdefault(token, []).append((slot, weight))
+        self.norms.append(sum(v * v for v in embedding.values()) ** 0.5)
+
+
+def measure(factory: Callable[[], object], texts: Sequence[str]) -> int:
+    """Return the bytes retained by an index after adding ``texts``."""
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    index = factory()
+    for text in texts:
+        index.add(_embed(text))
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del index
+    return retained
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=1_000_000)
+    args = parser.parse_args(argv)
+
+    texts = make_corpus(args.size)
+    layouts = {
+        "counter-per-memory": CounterPerMemory,
+        "tuple-postings": TuplePostings,
+        "interned-arrays": InvertedIndex,
+        "bm25-arrays": BM25Index,
+    }
+    print(f"entries={args.size}")
+    print(f"{'layout':>20} {'MiB':>10} {'bytes/entry':>12}")
+    for name, factory in layouts.items():
+        retained = measure(factory, texts)
+        print(f"{name:>20} {retained / 2**20:>10.1f} {retained / args.size:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Compare inverted-index and dense retrieval with the original linear scan.
+
+Usage::
+
+    python benchmarks/memory_retrieval.py --sizes 10000 100000 1000000 --queries 20
+
+The dense (NumPy hashing-trick) column is reported when ``numpy`` is installed.
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections import Counter
+import heapq
+import math
+import random
+import time
+from typing import Callable, List, Sequence, Tuple
+
+from cognitive_core.core.memory.dense_index import np
+from cognitive_core.core.memory.faiss_adapter import FaissMemoryAdapter, _embed
+
+
+def make_corpus(size: int, *, vocab_size: int = 50_000, seed: int = 0) -> List[str]:
+    """Generate ``size`` synthetic memories with a Zipf-like token distribution."""
+
+    rng = random.Random(seed)
+    vocab = [f"t{i}" for i in range(vocab_size)]
+    weights = [1.0 / (rank + 1) for rank in range(vocab_size)]
+    return [" ".join(rng.choices(vocab, weights, k=rng.randint(8, 30))) for _ in range(size)]
+
+
+def make_queries(count: int, *, vocab_size: int = 50_000, seed: int = 1) -> List[str]:
+    rng = random.Random(seed)
+    return [
+        " ".join(f"t{rng.randrange(vocab_size)}" for _ in range(rng.randint(2, 6)))
+        for _ in range(count)
+    ]
+
+
+class LinearScanMemory:
+    """Reference implementation scoring every stored memory per query."""
+
+    def __init__(self) -> None:
+        self._store: List[Tuple[Counter[str], str]] = []
+
+    def save(self, text: str) -> None:
+        self._store.append((_embed(text), text))
+
+    def retrieve(self, query: str, top_k: int = 1) -> List[str]:
+        query_emb = _embed(query)
+        norm_q = math.sqrt(sum(v * v for v in query_emb.values()))
+
+        def cosine(embedding: Counter[str]) -> float:
+            dot = sum(query_emb[t] * embedding[t] for t in set(query_emb) & set(embedding))
+            norm_d = math.sqrt(sum(v * v for v in embedding.values()))
+            if norm_q == 0 or norm_d == 0:
+                return 0.0
+            return dot / (norm_q * norm_d)
+
+        scored = ((cosine(embedding), text) for embedding, text in self._store)
+        return [text for _, text in heapq.nlargest(top_k, scored, key=lambda item: item[0])]
+
+
+def _time_queries(retrieve: Callable[[str, int], List[str]], queries: Sequence[str], top_k: int) -> float:
+    start = time.perf_counter()
+    for query in queries:
+        retrieve(query, top_k)
+    return (time.perf_counter() - start) / len(queries)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--dense-dim", type=int, default=1024)
+    args = parser.parse_args(argv)
+
+    queries = make_queries(args.queries)
+    columns = ["linear", "index"] + (["dense"] if np is not None else [])
+    print(f"{'entries':>10} " + " ".join(f"{name + ' ms/q':>12}" for name in columns))
+    for size in args.sizes:
+        corpus = make_corpus(size)
+        stores = {
+            "linear": LinearScanMemory(),
+            "index": FaissMemoryAdapter(),
+        }
+        if np is not None:
+            stores["dense"] = FaissMemoryAdapter(dense_dim=args.dense_dim)
+        for store in stores.values():
+            for text in corpus:
+                store.save(text)
+
+        timings = [_time_queries(stores[name].retrieve, queries, args.top_k) for name in columns]
+        print(f"{size:>10} " + " ".join(f"{seconds * 1e3:>12.2f}" for seconds in timings))
+
+
+if __name__ == "__main__":
+    main()
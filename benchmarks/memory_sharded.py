@@ -0,0 +1,60 @@
+"""Measure retrieval latency of sharded stores against a single adapter.
+
+Usage::
+
+    python benchmarks/memory_sharded.py --size 1000000 --shards 1 2 4 8 --queries 50
+
+Each shard runs in its own process, so latency only falls while there are
+idle cores; ``os.cpu_count()`` is printed alongside the results.
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import os
+import time
+from typing import Callable, List, Sequence
+
+from cognitive_core.core.memory.faiss_adapter import FaissMemoryAdapter
+from cognitive_core.core.memory.sharded import ShardedMemoryAdapter
+from memory_retrieval import make_corpus, make_queries
+
+
+def _latency(retrieve: Callable[[str, int], List[str]], queries: Sequence[str], top_k: int) -> float:
+    retrieve(queries[0], top_k)
+    start = time.perf_counter()
+    for query in queries:
+        retrieve(query, top_k)
+    return (time.perf_counter() - start) * 1e3 / len(queries)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--dense-dim", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    corpus = make_corpus(args.size)
+    queries = make_queries(args.queries)
+
+    factory = functools.partial(FaissMemoryAdapter, dense_dim=args.dense_dim)
+
+    print(f"entries={args.size} queries={args.queries} cpus={os.cpu_count()}")
+    print(f"{'store':>12} {'ms/q':>8}")
+    single = factory()
+    single.save_many(corpus)
+    print(f"{'single':>12} {_latency(single.retrieve, queries, args.top_k):>8.2f}")
+    del single
+    for shards in args.shards:
+        with ShardedMemoryAdapter(shards, factory=factory) as sharded:
+            sharded.save_many(corpus)
+            ms = _latency(sharded.retrieve, queries, args.top_k)
+        print(f"{f'shards={shards}':>12} {ms:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
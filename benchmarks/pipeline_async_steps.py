@@ -0,0 +1,82 @@
+"""Measure the per-step overhead of async steps under ``PipelineExecutor.execute``.
+
+Usage::
+
+    python benchmarks/pipeline_async_steps.py --steps 200 --runs 20
+
+Every pipeline is a chain of small coroutine steps that each yield to the
+loop once.  ``loop-per-step`` reproduces the former behaviour of
+:meth:`~cognitive_core.core.pipeline_executor.PipelineExecutor.execute`,
+which created and closed an event loop with ``asyncio.run`` for every
+awaitable step; ``shared-loop`` is the current ``execute``, which drives all
+of them on the executor's long-lived loop.  ``execute_async`` runs the same
+pipeline on a loop owned by the caller for reference.  Overhead is reported
+as microseconds per step.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from typing import Any, Callable, Dict
+
+from cognitive_core.core.pipeline_executor import PipelineExecutor
+from cognitive_core.domain.pipelines import Pipeline, Task
+
+
+class LoopPerStepExecutor(PipelineExecutor):
+    """``execute`` as it was: one ``asyncio.run`` per awaitable step."""
+
+    def _invoke(self, task: Task, kwargs: Dict[str, Any]) -> Any:
+        result = task.func(**kwargs)
+        if asyncio.iscoroutine(result):
+            return asyncio.run(result)
+        return result
+
+
+async def _step(**upstream: Any) -> int:
+    await asyncio.sleep(0)
+    return len(upstream)
+
+
+def make_pipeline(steps: int) -> Pipeline:
+    tasks = [
+        Task(name=f"s{index}", func=_step, depends_on=(f"s{index - 1}",) if index else ())
+        for index in range(steps)
+    ]
+    return Pipeline(id="chain", name="Chain", steps=tasks)
+
+
+def _time(run: Callable[[], Any], runs: int) -> float:
+    run()  # Warm up: the shared loop starts on first use.
+    start = time.perf_counter()
+    for _ in range(runs):
+        run()
+    return time.perf_counter() - start
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--steps", type=int, default=200)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    pipeline = make_pipeline(args.steps)
+    old = LoopPerStepExecutor()
+    new = PipelineExecutor()
+    columns = {
+        "loop-per-step": lambda: old.execute(pipeline),
+        "shared-loop": lambda: new.execute(pipeline),
+        "execute_async": lambda: asyncio.run(new.execute_async(pipeline)),
+    }
+    print(f"steps={args.steps} runs={args.runs}")
+    print(f"{'mode':>14} {'total s':>9} {'us/step':>9}")
+    for name, run in columns.items():
+        elapsed = _time(run, args.runs)
+        print(f"{name:>14} {elapsed:>9.3f} {elapsed * 1e6 / (args.steps * args.runs):>9.1f}")
+    new.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,10 @@
 from __future__ import annotations
 
+# Imported before any tracer provider can register its fork handler: CPython's
+# handler releases the thread-pool shutdown lock in forked children and must
+# run first, or the OpenTelemetry SDK's handler deadlocks starting a thread
+# pool there, hanging the forked ingest workers and memory shards.
+import concurrent.futures.thread  # noqa: F401
 import re
 from importlib import metadata as importlib_metadata
 from pathlib import Path
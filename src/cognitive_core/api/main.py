@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import Response
@@ -16,7 +18,21 @@ except Exception:  # pragma: no cover - fallback
 from .routers import events, health, math, pipelines
 
 setup_telemetry(settings.app_name, enable_console_export=settings.telemetry_console_export)
-app = FastAPI(title=settings.app_name, dependencies=[Depends(verify_api_key)])
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    # Persistent queues may hold runs submitted before a restart.
+    pipelines.start_job_workers()
+    try:
+        yield
+    finally:
+        pipelines.shutdown()
+
+
+app = FastAPI(
+    title=settings.app_name, dependencies=[Depends(verify_api_key)], lifespan=lifespan
+)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.allowed_origins,
@@ -1,17 +1,38 @@
-from fastapi import APIRouter, Body, HTTPException
-from pydantic import BaseModel
+import json
+import logging
+import threading
+from typing import Any, AsyncIterator
 
+from fastapi import APIRouter, Body, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+
+from ...config import settings
 from ...core.agents_router import AgentsRouter
+from ...core.job_queue import (
+    InMemoryJobQueue,
+    JobQueue,
+    JobWorkerPool,
+    RedisJobQueue,
+    SQLiteJobQueue,
+)
 from ...core.pipeline_executor import PipelineExecutor
 from ...domain.agents import DebateRound
 from ...utils.telemetry import instrument_route, record_llm_tokens
 from ...pipelines import registry as pipeline_registry
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 
-executor = PipelineExecutor()
+# Batch runs share the server's event loop, so synchronous steps go to threads.
+executor = PipelineExecutor(
+    max_concurrency=settings.pipeline_max_concurrency, offload_sync_steps=True
+)
 agents_router = AgentsRouter()
+_job_pool: JobWorkerPool | None = None
+_job_pool_lock = threading.Lock()
 
 
 class RunRequest(BaseModel):
@@ -24,8 +45,33 @@ class DebateRequest(BaseModel):
     concurrent: bool = False
 
 
+class SubmitRunRequest(BaseModel):
+    pipeline_id: str
+    inputs: dict[str, Any] = Field(default_factory=dict)
+
+
+class BatchRunItem(BaseModel):
+    pipeline_id: str
+    inputs: dict[str, Any] = Field(default_factory=dict)
+
+
+class BatchRunRequest(BaseModel):
+    runs: list[BatchRunItem] = Field(min_length=1)
+    max_runs: int | None = Field(
+        default=None,
+        ge=1,
+        description=(
+            "Maximum number of runs of this batch executed at once, capped by the "
+            "server's batch concurrency."
+        ),
+    )
+
+
 RunRequest.model_rebuild()
+SubmitRunRequest.model_rebuild()
 DebateRequest.model_rebuild()
+BatchRunItem.model_rebuild()
+BatchRunRequest.model_rebuild()
 
 
 @router.get("/v1/pipelines/{pipeline_id}")
@@ -53,6 +99,139 @@ def run_pipeline(req: RunRequest = Body(...)):
     }
 
 
+def _build_job_queue() -> JobQueue:
+    backend = settings.pipeline_queue_backend
+    lifetimes = {
+        "lease": settings.pipeline_queue_lease,
+        "retention": settings.pipeline_queue_retention,
+    }
+    if backend == "sqlite":
+        return SQLiteJobQueue(settings.pipeline_queue_url or "pipeline_jobs.db", **lifetimes)
+    if backend == "redis":
+        try:
+            return RedisJobQueue(settings.pipeline_queue_url or None, **lifetimes)
+        except Exception as exc:
+            logger.warning(
+                "Redis pipeline queue unavailable (%s); falling back to in-memory queue.", exc
+            )
+    elif backend != "memory":
+        logger.warning("Unknown pipeline queue backend %r; using in-memory queue.", backend)
+    return InMemoryJobQueue(retention=settings.pipeline_queue_retention)
+
+
+def job_pool() -> JobWorkerPool:
+    """Return the worker pool draining submitted runs, creating it on first use."""
+
+    global _job_pool
+    with _job_pool_lock:
+        if _job_pool is None:
+            _job_pool = JobWorkerPool(
+                _build_job_queue(),
+                executor,
+                pipeline_registry.get_pipeline,
+                workers=settings.pipeline_queue_workers,
+            )
+        return _job_pool
+
+
+def start_job_workers() -> None:
+    """Start draining the job queue, so runs queued before a restart resume."""
+
+    job_pool().start()
+
+
+def shutdown() -> None:
+    """Stop the job workers, then release the executor's pools and step loop."""
+
+    with _job_pool_lock:
+        pool = _job_pool
+    if pool is not None:
+        pool.stop()
+    executor.shutdown()
+
+
+@router.post("/v1/pipelines/runs", status_code=202)
+@instrument_route("submit_pipeline_run")
+def submit_pipeline_run(req: SubmitRunRequest = Body(...)):
+    """Queue a pipeline run and return its id without waiting for it."""
+
+    if not pipeline_registry.get_pipeline(req.pipeline_id):
+        raise HTTPException(status_code=404, detail="Pipeline not found")
+    job = job_pool().submit(req.pipeline_id, req.inputs)
+    return {"pipeline_id": job.pipeline_id, "run_id": job.id, "status": job.status}
+
+
+@router.get("/v1/pipelines/runs/{run_id}")
+@instrument_route("get_pipeline_run")
+def get_pipeline_run(run_id: str):
+    job = job_pool().queue.get(run_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Run not found")
+    record = job.to_dict()
+    record["run_id"] = record.pop("id")
+    record.pop("inputs")
+    return record
+
+
+@router.post("/v1/pipelines/batch")
+@instrument_route("run_pipeline_batch")
+async def run_pipeline_batch(request: Request, req: BatchRunRequest = Body(...)):
+    """Run many pipelines and stream one result per run as each completes.
+
+    Results are newline-delimited JSON, or server-sent events when the client
+    accepts ``text/event-stream``.  Every result carries the ``index`` of its
+    entry in ``runs``; unknown pipelines and failed runs are reported in
+    their result without stopping the batch.
+    """
+
+    if len(req.runs) > settings.pipeline_batch_max_runs:
+        raise HTTPException(
+            status_code=413,
+            detail=f"A batch may contain at most {settings.pipeline_batch_max_runs} runs",
+        )
+    max_runs = settings.pipeline_batch_concurrency
+    if req.max_runs is not None:
+        max_runs = min(max_runs, req.max_runs)
+    sse = "text/event-stream" in request.headers.get("accept", "")
+    media_type = "text/event-stream" if sse else "application/x-ndjson"
+    return StreamingResponse(_batch_results(req.runs, max_runs, sse), media_type=media_type)
+
+
+async def _batch_results(
+    items: list[BatchRunItem], max_runs: int, sse: bool
+) -> AsyncIterator[str]:
+    batch = []
+    positions = []
+    for index, item in enumerate(items):
+        pipeline = pipeline_registry.get_pipeline(item.pipeline_id)
+        if pipeline is None:
+            yield _format_result(
+                {"index": index, "pipeline_id": item.pipeline_id, "status": "not_found"}, sse
+            )
+            continue
+        batch.append((pipeline, item.inputs))
+        positions.append(index)
+
+    async for offset, outcome in executor.execute_many(batch, max_runs=max_runs):
+        pipeline, _ = batch[offset]
+        result: dict[str, Any] = {"index": positions[offset], "pipeline_id": pipeline.id}
+        if isinstance(outcome, Exception):
+            result.update(status="failed", error=f"{type(outcome).__name__}: {outcome}")
+        else:
+            record_llm_tokens("run_pipeline_batch", len(outcome.artifacts))
+            result.update(
+                run_id=outcome.id,
+                status=outcome.status,
+                artifacts=[a.name for a in outcome.artifacts],
+            )
+        yield _format_result(result, sse)
+
+
+def _format_result(result: dict[str, Any], sse: bool) -> str:
+    data = json.dumps(result)
+    return f"event: run\ndata: {data}\n\n" if sse else data + "\n"
+
+
 @router.post("/pipelines/aots_debate")
 @instrument_route("aots_debate")
 def aots_debate(req: DebateRequest) -> DebateRound:
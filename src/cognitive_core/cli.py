@@ -7,8 +7,9 @@ import json
 import os
 import subprocess
 import sys
+import time
 from pathlib import Path
-from typing import Any, Iterable
+from typing import Any, Callable, Iterable
 
 from . import __version__
 from .app.services import dot as dot_service
@@ -167,6 +168,63 @@ def _run_pipeline(name: str, api_url: str | None) -> dict[str, Any]:
     return _run_pipeline_locally(name)
 
 
+def _progress_reporter(interval: float = 1.0) -> Callable[[Any], None]:
+    """Return an ingest progress callback printing at most every ``interval`` seconds."""
+
+    last = 0.0
+
+    def report(stats: Any) -> None:
+        nonlocal last
+        now = time.monotonic()
+        if now - last >= interval:
+            last = now
+            print(
+                f"ingested {stats.documents} memories ({stats.docs_per_second:,.0f} docs/s)",
+                file=sys.stderr,
+                flush=True,
+            )
+
+    return report
+
+
+def _ingest_memories(args: argparse.Namespace) -> dict[str, Any]:
+    from .core.memory import FaissMemoryAdapter, SQLiteVecMemoryAdapter
+    from .core.memory.ingest import detect_format, ingest, iter_records
+
+    source_format = args.format
+    if source_format == "auto":
+        source_format = detect_format(args.source)
+    if args.backend == "sqlite":
+        adapter: Any = SQLiteVecMemoryAdapter(args.output, ranking=args.ranking)
+    else:
+        adapter = FaissMemoryAdapter(ranking=args.ranking)
+
+    stream = sys.stdin if args.source == "-" else open(args.source, encoding="utf-8")
+    try:
+        stats = ingest(
+            adapter,
+            iter_records(stream, format=source_format, field=args.field),
+            chunk_size=args.chunk_size,
+            workers=args.workers,
+            progress=None if args.quiet else _progress_reporter(),
+        )
+        if args.backend == "faiss":
+            adapter.snapshot(args.output)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+        if args.backend == "sqlite":
+            adapter.close()
+
+    return {
+        "backend": args.backend,
+        "output": str(args.output),
+        "documents": stats.documents,
+        "seconds": round(stats.elapsed, 3),
+        "docs_per_second": round(stats.docs_per_second, 1),
+    }
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(prog="cogctl")
     parser.add_argument("-V", "--version", action="version", version=f"%(prog)s {__version__}")
@@ -202,6 +260,27 @@ def build_parser() -> argparse.ArgumentParser:
         ),
     )
 
+    p_memory = sub.add_parser("memory")
+    memory_sub = p_memory.add_subparsers(dest="action", required=True)
+    p_ingest = memory_sub.add_parser("ingest")
+    p_ingest.add_argument("source", help="Text or JSONL file with one memory per line, or '-' for stdin.")
+    p_ingest.add_argument(
+        "--output",
+        required=True,
+        help="SQLite database file, or snapshot directory for the faiss backend.",
+    )
+    p_ingest.add_argument("--backend", choices=("sqlite", "faiss"), default="sqlite")
+    p_ingest.add_argument("--format", choices=("auto", "text", "jsonl"), default="auto")
+    p_ingest.add_argument("--field", default="text", help="JSONL object member holding the text.")
+    p_ingest.add_argument("--chunk-size", type=int, default=1000)
+    p_ingest.add_argument(
+        "--workers",
+        type=int,
+        help="Tokeniser processes (default: CPU count; 0 tokenises in the main process).",
+    )
+    p_ingest.add_argument("--ranking", choices=("cosine", "bm25"), default="cosine")
+    p_ingest.add_argument("--quiet", action="store_true", help="Do not report progress on stderr.")
+
     p_plugin = sub.add_parser("plugin")
     plugin_sub = p_plugin.add_subparsers(dest="action", required=True)
     plugin_sub.add_parser("list")
@@ -257,6 +336,16 @@ def handle_args(args: argparse.Namespace) -> int:
         print(json.dumps(result))
         return 0
 
+    if args.cmd == "memory" and args.action == "ingest":
+        try:
+            result = _ingest_memories(args)
+        except (OSError, ValueError, RuntimeError) as exc:
+            print(str(exc), file=sys.stderr)
+            return 1
+
+        print(json.dumps(result))
+        return 0
+
     if args.cmd == "plugin":
         from .plugins import REGISTRY
         from .plugins.plugin_loader import load_plugins
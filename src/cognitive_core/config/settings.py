@@ -57,6 +57,59 @@ class Settings(BaseSettings):
         default="default-src 'self'",
         description="Value for the Content-Security-Policy header applied to all responses.",
     )
+    pipeline_queue_backend: str = Field(
+        default="memory",
+        description=(
+            "Queue for runs submitted to POST /v1/pipelines/runs: 'memory', 'sqlite' "
+            "or 'redis'."
+        ),
+    )
+    pipeline_queue_url: str = Field(
+        default="",
+        description=(
+            "SQLite database path or Redis URL of the pipeline run queue; Redis falls "
+            "back to REDIS_URL."
+        ),
+    )
+    pipeline_queue_workers: int = Field(
+        default=2,
+        ge=1,
+        description="Number of worker threads draining the pipeline run queue.",
+    )
+    pipeline_queue_lease: float = Field(
+        default=300.0,
+        gt=0,
+        description=(
+            "Seconds after which a running job whose worker stopped renewing it is "
+            "queued again (SQLite and Redis queues)."
+        ),
+    )
+    pipeline_queue_retention: float = Field(
+        default=86400.0,
+        gt=0,
+        description="Seconds a finished pipeline run stays available for polling.",
+    )
+    pipeline_max_concurrency: int | None = Field(
+        default=32,
+        ge=1,
+        description=(
+            "Maximum number of pipeline steps the API runs at once across all requests; "
+            "empty or 'none' for no limit."
+        ),
+    )
+    pipeline_batch_max_runs: int = Field(
+        default=1000,
+        ge=1,
+        description="Maximum number of pipeline runs accepted in one batch request.",
+    )
+    pipeline_batch_concurrency: int = Field(
+        default=8,
+        ge=1,
+        description=(
+            "Maximum number of runs of a batch request executed at once; requests may "
+            "ask for less but not more."
+        ),
+    )
 
     @field_validator("allowed_origins", mode="before")
     @classmethod
@@ -88,4 +141,11 @@ class Settings(BaseSettings):
 
         return [str(value).strip()]
 
+    @field_validator("pipeline_max_concurrency", mode="before")
+    @classmethod
+    def _parse_optional_limit(cls, value: Any) -> Any:
+        if isinstance(value, str) and value.strip().lower() in ("", "none"):
+            return None
+        return value
+
     model_config = SettingsConfigDict(env_file=".env", env_prefix="COG_")
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+"""Incremental on-disk checkpoints of pipeline runs."""
+
+from dataclasses import asdict, dataclass, field
+import json
+import os
+from pathlib import Path
+import pickle
+import tempfile
+from typing import Dict, List, Tuple
+
+from ..domain.pipelines import Artifact, Event, Run
+
+_RUN = "run.json"
+_EVENTS = "events.jsonl"
+_INPUTS = "inputs.pkl"
+_STEP_SUFFIX = ".step"
+
+
+@dataclass
+class Checkpoint:
+    """State of a run as last persisted: the run itself and its finished steps.
+
+    ``steps`` maps a step's position in the pipeline to its name and artifact.
+    """
+
+    run: Run
+    steps: Dict[int, Tuple[str, Artifact]] = field(default_factory=dict)
+
+
+class FileCheckpointStore:
+    """Persist pipeline runs step by step below ``directory``.
+
+    Every run gets a sub-directory named after its id holding ``run.json``
+    (pipeline id and status), ``inputs.pkl`` with the run inputs,
+    ``events.jsonl`` with one event per line, appended as events are emitted,
+    and one pickle per completed step, written atomically.  A process that
+    dies mid-run therefore loses at most the step in progress.  Artifacts
+    that cannot be pickled are not checkpointed; their steps run again on
+    resume.
+    """
+
+    def __init__(self, directory: str | os.PathLike[str]) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def create(self, run: Run) -> None:
+        """Start checkpointing ``run``."""
+
+        run_dir = self._run_dir(run.id)
+        run_dir.mkdir(exist_ok=True)
+        if run.inputs and not (run_dir / _INPUTS).exists():
+            self._write(run_dir / _INPUTS, pickle.dumps(run.inputs, protocol=4))
+        self.set_status(run.id, run.pipeline_id, run.status)
+
+    def set_status(self, run_id: str, pipeline_id: str, status: str) -> None:
+        """Record the status of a run."""
+
+        payload = json.dumps({"id": run_id, "pipeline_id": pipeline_id, "status": status})
+        self._write(self._run_dir(run_id) / _RUN, payload.encode("utf-8"))
+
+    def append_event(self, run_id: str, event: Event) -> None:
+        """Append ``event`` to the run's event log."""
+
+        with open(self._run_dir(run_id) / _EVENTS, "a", encoding="utf-8") as handle:
+            handle.write(json.dumps(asdict(event)) + "\n")
+
+    def save_step(self, run_id: str, position: int, name: str, artifact: Artifact) -> None:
+        """Record that the step at ``position`` produced ``artifact``."""
+
+        try:
+            payload = pickle.dumps((name, artifact), protocol=4)
+        except Exception:
+            return
+        self._write(self._run_dir(run_id) / f"{position}{_STEP_SUFFIX}", payload)
+
+    def load(self, run_id: str) -> Checkpoint:
+        """Return the persisted state of ``run_id``.
+
+        Raises ``ValueError`` if no checkpoint exists for the run.
+        """
+
+        run_dir = self._run_dir(run_id)
+        try:
+            meta = json.loads((run_dir / _RUN).read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            raise ValueError(f"No checkpoint for run {run_id!r}") from None
+        run = Run(id=meta["id"], pipeline_id=meta["pipeline_id"], status=meta["status"])
+        run.events = self._load_events(run_dir / _EVENTS)
+        try:
+            with open(run_dir / _INPUTS, "rb") as handle:
+                run.inputs = pickle.load(handle)
+        except FileNotFoundError:
+            pass
+        checkpoint = Checkpoint(run=run)
+        for path in run_dir.glob(f"*{_STEP_SUFFIX}"):
+            try:
+                position = int(path.stem)
+                with open(path, "rb") as handle:
+                    checkpoint.steps[position] = pickle.load(handle)
+            except Exception:
+                continue
+        return checkpoint
+
+    def _load_events(self, path: Path) -> List[Event]:
+        events = []
+        try:
+            with open(path, encoding="utf-8") as handle:
+                for line in handle:
+                    try:
+                        events.append(Event(**json.loads(line)))
+                    except (ValueError, TypeError):
+                        # A line cut short by a crash.
+                        continue
+        except FileNotFoundError:
+            pass
+        return events
+
+    def _run_dir(self, run_id: str) -> Path:
+        if not run_id or Path(run_id).name != run_id or run_id in (".", ".."):
+            raise ValueError(f"Invalid run id {run_id!r}")
+        return self.directory / run_id
+
+    def _write(self, path: Path, payload: bytes) -> None:
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(payload)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except FileNotFoundError:
+                pass
+            raise
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+"""Concurrency limits shared between event loops and threads."""
+
+import asyncio
+from collections import deque
+import functools
+import threading
+from typing import Any, Callable, Deque
+
+
+class _Waiter:
+    __slots__ = ("wake", "granted")
+
+    def __init__(self, wake: Callable[[], Any]) -> None:
+        self.wake = wake
+        self.granted = False
+
+
+class SharedSemaphore:
+    """Counting semaphore for coroutines running on any event loop.
+
+    :class:`asyncio.Semaphore` binds to the first loop that waits on it, so it
+    cannot limit work started from several threads that each run their own
+    loop (as ``asyncio.run`` in request handlers does).  This semaphore keeps
+    its state behind a :class:`threading.Lock` and wakes waiters on their own
+    loop, first come first served.  Threads without a loop take slots with
+    :meth:`acquire_blocking`.
+    """
+
+    def __init__(self, value: int) -> None:
+        if value <= 0:
+            raise ValueError("Semaphore value must be positive")
+        self.limit = value
+        self._value = value
+        self._lock = threading.Lock()
+        self._waiters: Deque[_Waiter] = deque()
+
+    @property
+    def in_use(self) -> int:
+        """Number of slots currently held."""
+
+        with self._lock:
+            return self.limit - self._value
+
+    async def acquire(self) -> None:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._value > 0 and not self._waiters:
+                self._value -= 1
+                return
+            future = loop.create_future()
+            waiter = _Waiter(functools.partial(loop.call_soon_threadsafe, _wake, future))
+            self._waiters.append(waiter)
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                granted = waiter.granted
+                if not granted:
+                    self._waiters.remove(waiter)
+            if granted:
+                # The slot was handed over while we were being cancelled.
+                self.release()
+            raise
+
+    def acquire_blocking(self, timeout: float | None = None) -> bool:
+        """Take a slot, blocking the calling thread for at most ``timeout`` seconds.
+
+        Returns ``False`` if no slot became free in time.
+        """
+
+        event = threading.Event()
+        with self._lock:
+            if self._value > 0 and not self._waiters:
+                self._value -= 1
+                return True
+            waiter = _Waiter(event.set)
+            self._waiters.append(waiter)
+        if event.wait(timeout):
+            return True
+        with self._lock:
+            if waiter.granted:
+                # The slot was handed over just as the wait timed out.
+                return True
+            self._waiters.remove(waiter)
+        return False
+
+    def release(self) -> None:
+        with self._lock:
+            while self._waiters:
+                waiter = self._waiters.popleft()
+                try:
+                    waiter.wake()
+                except RuntimeError:  # the waiter's loop is closed
+                    continue
+                waiter.granted = True
+                return
+            self._value += 1
+
+    async def __aenter__(self) -> "SharedSemaphore":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self.release()
+
+
+def _wake(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
@@ -0,0 +1,526 @@
+from __future__ import annotations
+
+"""Queued pipeline runs drained by a local pool of worker threads."""
+
+from abc import ABC, abstractmethod
+from collections import deque
+import contextlib
+from dataclasses import asdict, dataclass, field
+import json
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple
+from uuid import uuid4
+
+try:
+    import redis
+except Exception:
+    redis = None
+
+from ..domain.pipelines import Artifact, Pipeline
+from .pipeline_executor import PipelineExecutor, failure_status
+
+logger = logging.getLogger(__name__)
+
+#: Statuses after which a job no longer changes.
+FINISHED_STATUSES = ("completed", "failed", "timed_out", "cancelled")
+
+#: Longest pause between attempts to record a finished job.
+_MAX_RETRY_DELAY = 30.0
+
+
+@dataclass
+class Job:
+    """A pipeline run submitted to a :class:`JobQueue`.
+
+    ``artifacts`` lists the name of every artifact and its data when the data
+    is JSON serialisable (``None`` otherwise).
+    """
+
+    pipeline_id: str
+    inputs: Dict[str, Any] = field(default_factory=dict)
+    id: str = field(default_factory=lambda: str(uuid4()))
+    status: str = "queued"
+    artifacts: List[Dict[str, Any]] = field(default_factory=list)
+    error: str | None = None
+    submitted_at: float = field(default_factory=time.time)
+    started_at: float | None = None
+    finished_at: float | None = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Job":
+        return cls(**data)
+
+
+class JobQueue(ABC):
+    """FIFO queue of :class:`Job` records that also tracks their status.
+
+    Finished jobs are forgotten ``retention`` seconds after they finish
+    (never with ``None``).  Queues shared between processes also give every
+    claimed job a ``lease``: workers renew it with :meth:`heartbeat`, and a
+    ``running`` job whose lease ran out, because its worker died, is queued
+    again by the next :meth:`claim`.  Jobs are therefore run at least once.
+    """
+
+    lease: float | None = None
+    retention: float | None = None
+
+    @abstractmethod
+    def submit(self, job: Job) -> None:
+        """Record ``job`` and append it to the queue."""
+
+    @abstractmethod
+    def claim(self, timeout: float) -> Job | None:
+        """Pop the oldest queued job and mark it running.
+
+        Waits up to ``timeout`` seconds for a job and returns ``None`` if none
+        arrives.
+        """
+
+    @abstractmethod
+    def update(self, job: Job) -> None:
+        """Store the new state of ``job``."""
+
+    @abstractmethod
+    def get(self, job_id: str) -> Job | None:
+        """Return the job ``job_id``, or ``None`` if it is unknown."""
+
+    def heartbeat(self, job_ids: Iterable[str]) -> None:
+        """Renew the lease of the running jobs ``job_ids``."""
+
+
+class InMemoryJobQueue(JobQueue):
+    """Process-local queue; jobs are lost when the process exits.
+
+    Its workers die with the process, so running jobs need no lease.
+    """
+
+    def __init__(
+        self, *, retention: float | None = 86400.0, clock: Callable[[], float] = time.time
+    ) -> None:
+        _check_positive("retention", retention)
+        self.retention = retention
+        self._clock = clock
+        self._jobs: Dict[str, Job] = {}
+        self._queue: Deque[str] = deque()
+        self._finished: Deque[Tuple[float, str]] = deque()
+        self._ready = threading.Condition()
+
+    def submit(self, job: Job) -> None:
+        with self._ready:
+            self._prune()
+            self._jobs[job.id] = Job.from_dict(job.to_dict())
+            self._queue.append(job.id)
+            self._ready.notify()
+
+    def claim(self, timeout: float) -> Job | None:
+        with self._ready:
+            if not self._ready.wait_for(lambda: self._queue, timeout):
+                return None
+            job = self._jobs[self._queue.popleft()]
+            job.status = "running"
+            job.started_at = time.time()
+            return Job.from_dict(job.to_dict())
+
+    def update(self, job: Job) -> None:
+        with self._ready:
+            self._jobs[job.id] = Job.from_dict(job.to_dict())
+            if job.status in FINISHED_STATUSES:
+                self._finished.append((self._clock(), job.id))
+            self._prune()
+
+    def get(self, job_id: str) -> Job | None:
+        with self._ready:
+            job = self._jobs.get(job_id)
+            return Job.from_dict(job.to_dict()) if job is not None else None
+
+    def _prune(self) -> None:
+        if self.retention is None:
+            return
+        cutoff = self._clock() - self.retention
+        while self._finished and self._finished[0][0] <= cutoff:
+            _, job_id = self._finished.popleft()
+            job = self._jobs.get(job_id)
+            if job is not None and job.status in FINISHED_STATUSES:
+                del self._jobs[job_id]
+
+
+class SQLiteJobQueue(JobQueue):
+    """Queue persisted in a SQLite database shared by local processes.
+
+    Queued jobs survive restarts.  Idle workers poll the table every
+    ``poll_interval`` seconds.  ``touched_at`` holds the last heartbeat of a
+    running job and the finishing time of a finished one.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        *,
+        poll_interval: float = 0.05,
+        lease: float | None = 300.0,
+        retention: float | None = 86400.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        _check_positive("lease", lease)
+        _check_positive("retention", retention)
+        self.path = os.fspath(path)
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self.retention = retention
+        self._clock = clock
+        with contextlib.closing(self._connect()) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " seq INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " id TEXT UNIQUE NOT NULL,"
+                " status TEXT NOT NULL,"
+                " record TEXT NOT NULL,"
+                " touched_at REAL NOT NULL DEFAULT 0)"
+            )
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+            if "touched_at" not in columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN touched_at REAL NOT NULL DEFAULT 0")
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, seq)")
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_touched ON jobs (status, touched_at)")
+
+    def submit(self, job: Job) -> None:
+        with contextlib.closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT INTO jobs (id, status, record, touched_at) VALUES (?, ?, ?, ?)",
+                (job.id, job.status, json.dumps(job.to_dict()), self._clock()),
+            )
+
+    def claim(self, timeout: float) -> Job | None:
+        deadline = time.monotonic() + timeout
+        while True:
+            job = self._claim_one()
+            if job is not None or time.monotonic() >= deadline:
+                return job
+            time.sleep(min(self.poll_interval, max(deadline - time.monotonic(), 0.0)))
+
+    def update(self, job: Job) -> None:
+        now = self._clock()
+        finished = job.status in FINISHED_STATUSES
+        with contextlib.closing(self._connect()) as conn, conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, record = ?, touched_at = ? WHERE id = ?",
+                (job.status, json.dumps(job.to_dict()), now, job.id),
+            )
+            if finished and self.retention is not None:
+                conn.execute(
+                    "DELETE FROM jobs WHERE status IN (?, ?, ?, ?) AND touched_at <= ?",
+                    (*FINISHED_STATUSES, now - self.retention),
+                )
+
+    def get(self, job_id: str) -> Job | None:
+        with contextlib.closing(self._connect()) as conn, conn:
+            row = conn.execute("SELECT record FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return Job.from_dict(json.loads(row[0])) if row else None
+
+    def heartbeat(self, job_ids: Iterable[str]) -> None:
+        with contextlib.closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "UPDATE jobs SET touched_at = ? WHERE id = ? AND status = 'running'",
+                [(self._clock(), job_id) for job_id in job_ids],
+            )
+
+    def _claim_one(self) -> Job | None:
+        conn = self._connect()
+        try:
+            # BEGIN IMMEDIATE takes the write lock, so two workers cannot
+            # claim the same job.
+            conn.execute("BEGIN IMMEDIATE")
+            now = self._clock()
+            self._requeue_expired(conn, now)
+            row = conn.execute(
+                "SELECT record FROM jobs WHERE status = 'queued' ORDER BY seq LIMIT 1"
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            job = Job.from_dict(json.loads(row[0]))
+            job.status = "running"
+            job.started_at = time.time()
+            conn.execute(
+                "UPDATE jobs SET status = ?, record = ?, touched_at = ? WHERE id = ?",
+                (job.status, json.dumps(job.to_dict()), now, job.id),
+            )
+            conn.execute("COMMIT")
+            return job
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def _requeue_expired(self, conn: sqlite3.Connection, now: float) -> None:
+        if self.lease is None:
+            return
+        rows = conn.execute(
+            "SELECT record FROM jobs WHERE status = 'running' AND touched_at <= ?",
+            (now - self.lease,),
+        ).fetchall()
+        for (record,) in rows:
+            job = _requeued(Job.from_dict(json.loads(record)))
+            conn.execute(
+                "UPDATE jobs SET status = ?, record = ?, touched_at = ? WHERE id = ?",
+                (job.status, json.dumps(job.to_dict()), now, job.id),
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+
+class RedisJobQueue(JobQueue):
+    """Queue kept in Redis: a list of job ids plus one key per job record.
+
+    Running jobs are also kept in a sorted set scored by their last
+    heartbeat, and finished records expire after ``retention`` seconds.
+    ``client`` may be any object implementing the ``set``, ``get``,
+    ``lpush``, ``rpush``, ``brpop``, ``zadd``, ``zrem`` and
+    ``zrangebyscore`` commands of :class:`redis.Redis`, which lets tests use
+    a local stand-in.
+    """
+
+    def __init__(
+        self,
+        redis_url: str | None = None,
+        *,
+        prefix: str = "cce_jobs",
+        lease: float | None = 300.0,
+        retention: float | None = 86400.0,
+        client: Any = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        _check_positive("lease", lease)
+        _check_positive("retention", retention)
+        if client is None:
+            if not redis:
+                raise RuntimeError(
+                    "redis package not installed. Install 'redis' to use RedisJobQueue."
+                )
+            client = redis.from_url(redis_url or os.environ.get("REDIS_URL"), decode_responses=True)
+        self.client = client
+        self.prefix = prefix
+        self.lease = lease
+        self.retention = retention
+        self._clock = clock
+
+    def submit(self, job: Job) -> None:
+        self._store(job)
+        self.client.lpush(f"{self.prefix}:queue", job.id)
+
+    def claim(self, timeout: float) -> Job | None:
+        self._requeue_expired()
+        # BRPOP takes whole seconds; 0 would block forever.
+        popped = self.client.brpop([f"{self.prefix}:queue"], timeout=max(1, round(timeout)))
+        if not popped:
+            return None
+        job = self.get(popped[1])
+        if job is None:
+            return None
+        job.status = "running"
+        job.started_at = time.time()
+        self.client.zadd(f"{self.prefix}:running", {job.id: self._clock()})
+        self._store(job)
+        return job
+
+    def update(self, job: Job) -> None:
+        if job.status in FINISHED_STATUSES:
+            self.client.zrem(f"{self.prefix}:running", job.id)
+            # EX takes whole seconds.
+            expiry = math.ceil(self.retention) if self.retention is not None else None
+            self._store(job, expiry)
+        else:
+            self._store(job)
+
+    def get(self, job_id: str) -> Job | None:
+        record = self.client.get(f"{self.prefix}:job:{job_id}")
+        return Job.from_dict(json.loads(record)) if record else None
+
+    def heartbeat(self, job_ids: Iterable[str]) -> None:
+        now = self._clock()
+        mapping = {job_id: now for job_id in job_ids}
+        if mapping:
+            # XX: never re-add a job that finished or was requeued meanwhile.
+            self.client.zadd(f"{self.prefix}:running", mapping, xx=True)
+
+    def _requeue_expired(self) -> None:
+        if self.lease is None:
+            return
+        running = f"{self.prefix}:running"
+        expired = self.client.zrangebyscore(running, "-inf", self._clock() - self.lease)
+        for job_id in expired:
+            # Only the worker whose ZREM succeeds requeues the job.
+            if not self.client.zrem(running, job_id):
+                continue
+            job = self.get(job_id)
+            if job is None or job.status != "running":
+                continue
+            self._store(_requeued(job))
+            # The job was submitted earlier than anything queued: serve it first.
+            self.client.rpush(f"{self.prefix}:queue", job_id)
+
+    def _store(self, job: Job, expiry: int | None = None) -> None:
+        self.client.set(f"{self.prefix}:job:{job.id}", json.dumps(job.to_dict()), ex=expiry)
+
+
+class JobWorkerPool:
+    """Drain ``queue`` on ``workers`` daemon threads using ``executor``.
+
+    ``resolve`` maps a job's pipeline id to a :class:`Pipeline`; a job whose
+    pipeline cannot be resolved fails.  Threads start on :meth:`start` and
+    finish their current job after :meth:`stop`.  When the queue has a
+    lease, one more thread renews it for the jobs in progress.  Errors from
+    the queue are logged and retried, recording a finished job with
+    exponential backoff, so a worker never dies with a job left "running".
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        executor: PipelineExecutor,
+        resolve: Callable[[str], Optional[Pipeline]],
+        *,
+        workers: int = 2,
+        poll_interval: float = 0.5,
+    ) -> None:
+        if workers <= 0:
+            raise ValueError("workers must be positive")
+        self.queue = queue
+        self.executor = executor
+        self.resolve = resolve
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self._threads: List[threading.Thread] = []
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+        self._active: Set[str] = set()
+        self._active_lock = threading.Lock()
+
+    def submit(self, pipeline_id: str, inputs: Dict[str, Any] | None = None) -> Job:
+        """Queue a run of ``pipeline_id``, starting the workers if needed."""
+
+        job = Job(pipeline_id=pipeline_id, inputs=dict(inputs or {}))
+        self.queue.submit(job)
+        self.start()
+        return job
+
+    def start(self) -> None:
+        """Start the worker threads, replacing any that died."""
+
+        with self._lock:
+            if not self._threads:
+                self._stopping.clear()
+            self._threads = [thread for thread in self._threads if thread.is_alive()]
+            running = {thread.name for thread in self._threads}
+            targets = [(f"pipeline-job-{number}", self._work) for number in range(self.workers)]
+            if self.queue.lease is not None:
+                targets.append(("pipeline-job-heartbeat", self._heartbeat))
+            for name, target in targets:
+                if name in running:
+                    continue
+                thread = threading.Thread(target=target, name=name, daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self, wait: bool = True) -> None:
+        with self._lock:
+            threads, self._threads = self._threads, []
+            self._stopping.set()
+        if wait:
+            for thread in threads:
+                thread.join()
+
+    def _work(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                job = self.queue.claim(self.poll_interval)
+            except Exception:
+                logger.exception("Failed to claim a pipeline job")
+                self._stopping.wait(self.poll_interval)
+                continue
+            if job is None:
+                continue
+            try:
+                self._run(job)
+            except Exception:
+                logger.exception("Pipeline job %s was left unfinished", job.id)
+
+    def _heartbeat(self) -> None:
+        # Renew well before the lease runs out.
+        while not self._stopping.wait(self.queue.lease / 3):
+            with self._active_lock:
+                job_ids = list(self._active)
+            if not job_ids:
+                continue
+            try:
+                self.queue.heartbeat(job_ids)
+            except Exception:
+                logger.exception("Failed to renew pipeline job leases")
+
+    def _run(self, job: Job) -> None:
+        with self._active_lock:
+            self._active.add(job.id)
+        try:
+            try:
+                pipeline = self.resolve(job.pipeline_id)
+                if pipeline is None:
+                    raise ValueError(f"Unknown pipeline {job.pipeline_id!r}")
+                run = self.executor.execute(pipeline, inputs=job.inputs, run_id=job.id)
+            except Exception as exc:
+                job.status = failure_status(exc)
+                job.error = f"{type(exc).__name__}: {exc}"
+            else:
+                job.status = run.status
+                job.artifacts = [_artifact_record(artifact) for artifact in run.artifacts]
+            job.finished_at = time.time()
+            self._finish(job)
+        finally:
+            with self._active_lock:
+                self._active.discard(job.id)
+
+    def _finish(self, job: Job) -> None:
+        # Keep renewing the lease until the final status is stored; give up
+        # only once the pool stops, leaving the job to expire and be requeued.
+        delay = self.poll_interval
+        while True:
+            try:
+                self.queue.update(job)
+                return
+            except Exception:
+                if self._stopping.is_set():
+                    raise
+                logger.exception(
+                    "Failed to record pipeline job %s; retrying in %.3gs", job.id, delay
+                )
+            self._stopping.wait(delay)
+            delay = min(delay * 2, _MAX_RETRY_DELAY)
+
+
+def _check_positive(name: str, value: float | None) -> None:
+    if value is not None and value <= 0:
+        raise ValueError(f"{name} must be positive")
+
+
+def _requeued(job: Job) -> Job:
+    logger.warning("Requeueing pipeline job %s after its worker stopped renewing it", job.id)
+    job.status = "queued"
+    job.started_at = None
+    return job
+
+
+def _artifact_record(artifact: Artifact) -> Dict[str, Any]:
+    try:
+        json.dumps(artifact.data)
+    except (TypeError, ValueError):
+        return {"name": artifact.name, "data": None}
+    return {"name": artifact.name, "data": artifact.data}
@@ -1,11 +1,30 @@
 """Memory adapter implementations."""
 
+from .async_adapter import AsyncMemoryAdapter, ExecutorMemoryAdapter, as_async
 from .base import MemoryAdapter
+from .bm25_index import BM25Index
+from .cache import CachedMemoryAdapter
+from .dense_index import DenseIndex
 from .faiss_adapter import FaissMemoryAdapter
+from .inverted_index import InvertedIndex
+from .ivf_index import IVFIndex
+from .namespaced import MemoryQuotaExceededError, NamespacedMemoryAdapter
+from .sharded import ShardedMemoryAdapter
 from .sqlitevec_adapter import SQLiteVecMemoryAdapter
 
 __all__ = [
     "MemoryAdapter",
+    "AsyncMemoryAdapter",
+    "ExecutorMemoryAdapter",
+    "as_async",
     "FaissMemoryAdapter",
     "SQLiteVecMemoryAdapter",
+    "NamespacedMemoryAdapter",
+    "ShardedMemoryAdapter",
+    "CachedMemoryAdapter",
+    "MemoryQuotaExceededError",
+    "InvertedIndex",
+    "BM25Index",
+    "DenseIndex",
+    "IVFIndex",
 ]
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+"""Asynchronous memory adapter interface for use inside an event loop."""
+
+from abc import ABC, abstractmethod
+import asyncio
+from concurrent.futures import Executor, ThreadPoolExecutor
+import functools
+from typing import Any, Callable, Iterable, List, Sequence, TypeVar
+
+from .base import MemoryAdapter
+
+
+T = TypeVar("T")
+
+
+class AsyncMemoryAdapter(ABC):
+    """Awaitable counterpart of :class:`MemoryAdapter`.
+
+    Coroutines accept the same arguments as their synchronous namesakes.
+    Disk- or network-backed stores can implement the interface natively;
+    :class:`ExecutorMemoryAdapter` provides it for any synchronous adapter.
+    """
+
+    @abstractmethod
+    async def asave(self, text: str, **kwargs: Any) -> int:
+        """Persist a piece of text into the store and return its identifier."""
+
+    @abstractmethod
+    async def aretrieve(self, query: str, top_k: int = 1, **kwargs: Any) -> List[str]:
+        """Return up to ``top_k`` pieces of text that best match ``query``."""
+
+    async def asave_many(self, texts: Iterable[str], **kwargs: Any) -> List[int]:
+        """Persist several pieces of text and return their identifiers."""
+
+        return [await self.asave(text, **kwargs) for text in texts]
+
+    async def aretrieve_many(
+        self, queries: Sequence[str], top_k: int = 1, **kwargs: Any
+    ) -> List[List[str]]:
+        """Return the :meth:`aretrieve` result for every query in ``queries``."""
+
+        return [await self.aretrieve(query, top_k, **kwargs) for query in queries]
+
+
+class ExecutorMemoryAdapter(AsyncMemoryAdapter):
+    """Run a synchronous ``adapter`` on a dedicated, bounded thread pool.
+
+    Every call is offloaded to a private :class:`ThreadPoolExecutor` of
+    ``max_workers`` threads, so at most that many memory operations run at
+    once and the event loop keeps serving other tasks while a scan is in
+    progress.  Further calls wait in the pool's queue without blocking the
+    loop.  An existing ``executor`` can be shared instead; it is then left
+    running by :meth:`close`.
+    """
+
+    def __init__(
+        self,
+        adapter: MemoryAdapter,
+        *,
+        max_workers: int = 4,
+        executor: Executor | None = None,
+    ) -> None:
+        if executor is None:
+            if max_workers <= 0:
+                raise ValueError("max_workers must be positive")
+            executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="memory")
+            self._owns_executor = True
+        else:
+            self._owns_executor = False
+        self.adapter = adapter
+        self._executor = executor
+
+    @property
+    def generation(self) -> int:
+        return self.adapter.generation
+
+    async def asave(self, text: str, **kwargs: Any) -> int:
+        return await self._run(self.adapter.save, text, **kwargs)
+
+    async def asave_many(self, texts: Iterable[str], **kwargs: Any) -> List[int]:
+        return await self._run(self.adapter.save_many, list(texts), **kwargs)
+
+    async def aretrieve(self, query: str, top_k: int = 1, **kwargs: Any) -> List[str]:
+        return await self._run(self.adapter.retrieve, query, top_k, **kwargs)
+
+    async def aretrieve_many(
+        self, queries: Sequence[str], top_k: int = 1, **kwargs: Any
+    ) -> List[List[str]]:
+        return await self._run(self.adapter.retrieve_many, list(queries), top_k, **kwargs)
+
+    async def adelete(self, memory_id: int, **kwargs: Any) -> bool:
+        """Remove the memory ``memory_id``; return ``False`` if it is unknown."""
+
+        return await self._run(self.adapter.delete, memory_id, **kwargs)
+
+    async def aupsert(self, memory_id: int, text: str, **kwargs: Any) -> None:
+        """Store ``text`` under ``memory_id``, replacing any previous memory."""
+
+        await self._run(self.adapter.upsert, memory_id, text, **kwargs)
+
+    def close(self) -> None:
+        """Shut down the private thread pool after pending calls finish."""
+
+        if self._owns_executor:
+            self._executor.shutdown(wait=True)
+
+    async def aclose(self) -> None:
+        """Like :meth:`close`, without blocking the event loop."""
+
+        await asyncio.to_thread(self.close)
+
+    async def __aenter__(self) -> "ExecutorMemoryAdapter":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def _run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+
+def as_async(adapter: MemoryAdapter | AsyncMemoryAdapter, **kwargs: Any) -> AsyncMemoryAdapter:
+    """Return ``adapter`` if it is natively async, else wrap it in an executor.
+
+    ``kwargs`` are passed to :class:`ExecutorMemoryAdapter`.
+    """
+
+    if isinstance(adapter, AsyncMemoryAdapter):
+        return adapter
+    return ExecutorMemoryAdapter(adapter, **kwargs)
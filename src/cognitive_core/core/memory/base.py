@@ -3,7 +3,15 @@ from __future__ import annotations
 """Base classes for memory adapters."""
 
 from abc import ABC, abstractmethod
-from typing import List
+from collections import Counter
+import os
+from typing import Any, Dict, Iterable, List, Sequence, TypeVar
+
+
+AdapterT = TypeVar("AdapterT", bound="MemoryAdapter")
+
+#: Ranking functions accepted by the built-in adapters' ``ranking`` option.
+RANKINGS = ("cosine", "bm25")
 
 
 class MemoryAdapter(ABC):
@@ -16,10 +24,101 @@ class MemoryAdapter(ABC):
     and higher level components can rely upon.
     """
 
+    #: Bumped whenever a change may alter retrieval results; caches compare
+    #: it with the value recorded alongside an entry to detect stale results.
+    generation: int = 0
+
     @abstractmethod
-    def save(self, text: str) -> None:
-        """Persist a piece of text into the store."""
+    def save(self, text: str) -> int:
+        """Persist a piece of text into the store and return its identifier."""
 
     @abstractmethod
-    def retrieve(self, query: str, top_k: int = 1) -> List[str]:
-        """Return up to ``top_k`` pieces of text that best match ``query``."""
+    def retrieve(
+        self,
+        query: str,
+        top_k: int = 1,
+        *,
+        mmr_lambda: float | None = None,
+        fetch_k: int | None = None,
+    ) -> List[str]:
+        """Return up to ``top_k`` pieces of text that best match ``query``.
+
+        Passing ``mmr_lambda`` re-ranks the best ``fetch_k`` matches (four per
+        requested result by default) with Maximal Marginal Relevance so that
+        near-duplicates do not crowd out other memories: ``1`` orders them by
+        cosine similarity with the query alone and lower values increasingly
+        favour memories unlike those already selected.
+        """
+
+    def save_many(self, texts: Iterable[str]) -> List[int]:
+        """Persist several pieces of text and return their identifiers.
+
+        The default implementation calls :meth:`save` for every item;
+        adapters override it to amortise tokenisation and index updates.
+        """
+
+        return [self.save(text) for text in texts]
+
+    def save_tokenized(
+        self, texts: Sequence[str], embeddings: Sequence[Counter[str]]
+    ) -> List[int]:
+        """Persist ``texts`` whose token counts were computed ahead of time.
+
+        ``embeddings[i]`` must equal the adapter's own tokenisation of
+        ``texts[i]``; bulk loaders use this to tokenise in worker processes.
+        The default implementation ignores ``embeddings`` and calls
+        :meth:`save_many`.
+        """
+
+        return self.save_many(texts)
+
+    def retrieve_many(self, queries: Sequence[str], top_k: int = 1) -> List[List[str]]:
+        """Return the :meth:`retrieve` result for every query in ``queries``.
+
+        The default implementation issues one retrieval per query; adapters
+        override it to score the whole batch in a single pass over the store.
+        """
+
+        return [self.retrieve(query, top_k) for query in queries]
+
+    def delete(self, memory_id: int) -> bool:
+        """Remove the memory ``memory_id``; return ``False`` if it is unknown."""
+
+        raise NotImplementedError(f"{type(self).__name__} does not support deletion")
+
+    def upsert(self, memory_id: int, text: str) -> None:
+        """Store ``text`` under ``memory_id``, replacing any previous memory."""
+
+        raise NotImplementedError(f"{type(self).__name__} does not support updates")
+
+    def compact(self) -> None:
+        """Reclaim space held by deleted or replaced memories."""
+
+    def stats(self) -> Dict[str, Any]:
+        """Return store size metrics such as live and tombstoned entries."""
+
+        return {}
+
+    def snapshot(self, path: str | os.PathLike[str]) -> None:
+        """Write the current store to ``path`` for a later :meth:`load`."""
+
+        raise NotImplementedError(f"{type(self).__name__} does not support snapshots")
+
+    @classmethod
+    def load(cls: type[AdapterT], path: str | os.PathLike[str], *, mmap: bool = True) -> AdapterT:
+        """Create an adapter from a snapshot written by :meth:`snapshot`.
+
+        With ``mmap=True`` the snapshot is mapped read-only so that several
+        processes loading the same file share its pages.
+        """
+
+        raise NotImplementedError(f"{cls.__name__} does not support snapshots")
+
+    def restore(self, path: str | os.PathLike[str]) -> None:
+        """Replace the memories of this adapter with the snapshot at ``path``.
+
+        Unlike :meth:`load`, the adapter keeps its own configuration, such as
+        its ranking and compaction threshold.
+        """
+
+        raise NotImplementedError(f"{type(self).__name__} does not support snapshots")
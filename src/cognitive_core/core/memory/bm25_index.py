@@ -0,0 +1,297 @@
+from __future__ import annotations
+
+"""BM25 inverted index with MaxScore dynamic pruning."""
+
+from array import array
+from bisect import bisect_left
+from collections import Counter
+import heapq
+import math
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+from .snapshot import np
+
+
+_SEED_DOCUMENTS = 64
+
+
+class BM25Index:
+    """Token -> postings index ranked with Okapi BM25.
+
+    Postings are kept per token as parallel ``array('I')`` buffers of slots
+    and term frequencies in slot order.  Alongside them the index tracks,
+    per token, the largest term frequency and the shortest document holding
+    the token; together with the current average document length these bound
+    the best score a token can contribute.  :meth:`search` uses the bounds for
+    MaxScore pruning: once ``top_k`` results are held, tokens whose combined
+    bound cannot lift a document past the current k-th score stop driving
+    candidate generation and are only probed, by binary search, for documents
+    that are still competitive.  Frequent query tokens therefore no longer
+    force a walk over their full posting lists.
+
+    Removed slots are tombstoned and skipped; like other BM25 engines the
+    collection statistics keep counting them until :meth:`compacted` rebuilds
+    the index without them.
+    """
+
+    snapshot_kind = "bm25"
+
+    def __init__(self, *, k1: float = 1.2, b: float = 0.75) -> None:
+        if k1 < 0 or not 0.0 <= b <= 1.0:
+            raise ValueError("BM25 requires k1 >= 0 and 0 <= b <= 1")
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Tuple[array, array]] = {}
+        self._max_tf: Dict[str, int] = {}
+        self._min_length: Dict[str, int] = {}
+        self._lengths = array("I")
+        self._total_length = 0
+        self._frozen_vocab: Dict[str, int] = {}
+        self._frozen: Tuple[Any, Any, Any] | None = None
+        self._dead: set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    @property
+    def tombstones(self) -> int:
+        """Number of removed slots still occupying the index."""
+
+        return len(self._dead)
+
+    def remove(self, slot: int) -> None:
+        """Tombstone ``slot`` so that searches no longer return it."""
+
+        self._dead.add(slot)
+
+    def add(self, embedding: Counter[str]) -> int:
+        """Index ``embedding`` and return the slot assigned to it."""
+
+        slot = len(self._lengths)
+        length = sum(embedding.values())
+        for token, tf in embedding.items():
+            slots, tfs = self._postings_of(token, create=True)
+            slots.append(slot)
+            tfs.append(tf)
+            if tf > self._max_tf.get(token, 0):
+                self._max_tf[token] = tf
+            if length < self._min_length.get(token, length + 1):
+                self._min_length[token] = length
+        self._lengths.append(length)
+        self._total_length += length
+        return slot
+
+    def add_many(self, embeddings: Iterable[Counter[str]]) -> List[int]:
+        """Index several embeddings and return their slots."""
+
+        return [self.add(embedding) for embedding in embeddings]
+
+    def compacted(self, keep: Sequence[int]) -> "BM25Index":
+        """Return a new index holding only ``keep`` slots, renumbered in order."""
+
+        remap = {old: new for new, old in enumerate(keep)}
+        index = BM25Index(k1=self.k1, b=self.b)
+        index._lengths = array("I", (self._lengths[slot] for slot in keep))
+        index._total_length = sum(index._lengths)
+        tokens = list(self._frozen_vocab) + [
+            token for token in list(self._postings) if token not in self._frozen_vocab
+        ]
+        for token in tokens:
+            slots, tfs = self._postings_of(token)
+            kept = [(remap[slot], tf) for slot, tf in zip(slots, tfs) if slot in remap]
+            if kept:
+                index._postings[token] = (
+                    array("I", (slot for slot, _ in kept)),
+                    array("I", (tf for _, tf in kept)),
+                )
+                index._max_tf[token] = max(tf for _, tf in kept)
+                index._min_length[token] = min(index._lengths[slot] for slot, _ in kept)
+        return index
+
+    def search(self, query: Counter[str], top_k: int) -> List[Tuple[float, int]]:
+        """Return up to ``top_k`` ``(bm25, slot)`` pairs ranked by score.
+
+        Ties are broken by insertion order and the result is padded with
+        zero-scored documents, as for :class:`InvertedIndex`.
+        """
+
+        if top_k <= 0 or not self._lengths:
+            return []
+
+        count = len(self._lengths)
+        k1, b = self.k1, self.b
+        # Per-document length normalisation, shared by every query token.
+        norm_a = k1 * (1.0 - b)
+        norm_b = k1 * b * count / self._total_length if self._total_length else 0.0
+        lengths = self._lengths
+
+        terms = []
+        for token, query_tf in query.items():
+            slots, tfs = self._postings_of(token)
+            if not slots:
+                continue
+            df = len(slots)
+            weight = query_tf * math.log(1.0 + (count - df + 0.5) / (df + 0.5)) * (k1 + 1.0)
+            max_tf = self._max_tf[token]
+            bound = weight * max_tf / (max_tf + norm_a + norm_b * self._min_length[token])
+            terms.append((bound, weight, slots, tfs))
+        terms.sort(key=lambda term: term[0])
+
+        # prefix[i] bounds the total contribution of terms[0..i].
+        prefix = []
+        running = 0.0
+        for bound, *_ in terms:
+            running += bound
+            prefix.append(running)
+
+        dead = self._dead
+        heap: List[Tuple[float, int]] = []
+        threshold = -1.0
+        cursors = [0] * len(terms)
+        first_essential = 0
+
+        # Seed the threshold with the documents of the highest-bound (usually
+        # rarest) token so pruning starts before the long lists are walked.
+        seeded: set[int] = set()
+        if terms:
+            for candidate in terms[-1][2][: max(top_k, _SEED_DOCUMENTS)]:
+                if candidate in dead:
+                    continue
+                seeded.add(candidate)
+                denominator_base = norm_a + norm_b * lengths[candidate]
+                score = 0.0
+                for _, weight, slots, tfs in terms:
+                    cursor = bisect_left(slots, candidate)
+                    if cursor < len(slots) and slots[cursor] == candidate:
+                        tf = tfs[cursor]
+                        score += weight * tf / (tf + denominator_base)
+                _offer(heap, top_k, (score, -candidate))
+            if len(heap) == top_k:
+                threshold = heap[0][0]
+                while first_essential < len(terms) and prefix[first_essential] < threshold:
+                    first_essential += 1
+
+        while True:
+            candidate = -1
+            for i in range(first_essential, len(terms)):
+                slots = terms[i][2]
+                if cursors[i] < len(slots) and (candidate < 0 or slots[cursors[i]] < candidate):
+                    candidate = slots[cursors[i]]
+            if candidate < 0:
+                break
+
+            denominator_base = norm_a + norm_b * lengths[candidate]
+            score = 0.0
+            for i in range(first_essential, len(terms)):
+                _, weight, slots, tfs = terms[i]
+                cursor = cursors[i]
+                if cursor < len(slots) and slots[cursor] == candidate:
+                    tf = tfs[cursor]
+                    score += weight * tf / (tf + denominator_base)
+                    cursors[i] = cursor + 1
+            if candidate in dead or candidate in seeded:
+                continue
+
+            for i in range(first_essential - 1, -1, -1):
+                if score + prefix[i] < threshold:
+                    break
+                _, weight, slots, tfs = terms[i]
+                cursor = bisect_left(slots, candidate, cursors[i])
+                cursors[i] = cursor
+                if cursor < len(slots) and slots[cursor] == candidate:
+                    tf = tfs[cursor]
+                    score += weight * tf / (tf + denominator_base)
+
+            if score < threshold or not _offer(heap, top_k, (score, -candidate)):
+                continue
+            if len(heap) == top_k:
+                threshold = heap[0][0]
+                while first_essential < len(terms) and prefix[first_essential] < threshold:
+                    first_essential += 1
+
+        ranked = [(score, -negated) for score, negated in sorted(heap, reverse=True)]
+        if len(ranked) < top_k:
+            matched = {slot for _, slot in ranked}
+            for slot in range(count):
+                if slot not in matched and slot not in dead:
+                    ranked.append((0.0, slot))
+                    if len(ranked) == top_k:
+                        break
+        return ranked
+
+    def search_many(
+        self, queries: Sequence[Counter[str]], top_k: int
+    ) -> List[List[Tuple[float, int]]]:
+        """Rank several queries; MaxScore prunes every query independently."""
+
+        return [self.search(query, top_k) for query in queries]
+
+    def _postings_of(self, token: str, *, create: bool = False) -> Tuple[Sequence[int], Sequence[int]]:
+        postings = self._postings.get(token)
+        if postings is not None:
+            return postings
+        row = self._frozen_vocab.get(token)
+        if row is None and not create:
+            return (), ()
+        # Snapshot postings are copied into growable buffers the first time
+        # their token is queried or extended.
+        postings = (array("I"), array("I"))
+        if row is not None:
+            indptr, slots, tfs = self._frozen
+            start, end = int(indptr[row]), int(indptr[row + 1])
+            postings[0].frombytes(np.ascontiguousarray(slots[start:end], dtype=np.uint32).tobytes())
+            postings[1].frombytes(np.ascontiguousarray(tfs[start:end], dtype=np.uint32).tobytes())
+        self._postings[token] = postings
+        return postings
+
+    def snapshot_state(self) -> Tuple[Dict[str, Any], Dict[str, "np.ndarray"]]:
+        """Return the index as JSON metadata plus CSR postings arrays."""
+
+        vocab = sorted(self._frozen_vocab.keys() | self._postings.keys())
+        indptr = np.zeros(len(vocab) + 1, dtype=np.int64)
+        slot_parts = []
+        tf_parts = []
+        for row, token in enumerate(vocab):
+            slots, tfs = self._postings_of(token)
+            slot_parts.append(np.frombuffer(slots, dtype=np.uint32))
+            tf_parts.append(np.frombuffer(tfs, dtype=np.uint32))
+            indptr[row + 1] = indptr[row] + len(slots)
+        meta = {
+            "vocab": vocab,
+            "k1": self.k1,
+            "b": self.b,
+            "max_tf": [self._max_tf[token] for token in vocab],
+            "min_length": [self._min_length[token] for token in vocab],
+        }
+        arrays = {
+            "indptr": indptr,
+            "slots": np.concatenate(slot_parts) if slot_parts else np.zeros(0, dtype=np.uint32),
+            "tfs": np.concatenate(tf_parts) if tf_parts else np.zeros(0, dtype=np.uint32),
+            "lengths": np.frombuffer(self._lengths, dtype=np.uint32),
+        }
+        return meta, arrays
+
+    @classmethod
+    def from_snapshot(cls, meta: Dict[str, Any], arrays: Dict[str, "np.ndarray"]) -> "BM25Index":
+        """Rebuild an index around arrays produced by :meth:`snapshot_state`."""
+
+        index = cls(k1=meta["k1"], b=meta["b"])
+        index._frozen_vocab = {token: row for row, token in enumerate(meta["vocab"])}
+        index._frozen = (arrays["indptr"], arrays["slots"], arrays["tfs"])
+        index._max_tf = dict(zip(meta["vocab"], meta["max_tf"]))
+        index._min_length = dict(zip(meta["vocab"], meta["min_length"]))
+        index._lengths = array("I", np.asarray(arrays["lengths"], dtype=np.uint32).tobytes())
+        index._total_length = int(np.asarray(arrays["lengths"], dtype=np.int64).sum())
+        return index
+
+
+def _offer(heap: List[Tuple[float, int]], top_k: int, entry: Tuple[float, int]) -> bool:
+    """Push ``(score, -slot)`` into the top-k min-heap; return whether it entered."""
+
+    if len(heap) < top_k:
+        heapq.heappush(heap, entry)
+    elif entry > heap[0]:
+        heapq.heapreplace(heap, entry)
+    else:
+        return False
+    return True
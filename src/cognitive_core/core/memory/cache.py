@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+"""Retrieval result cache for memory adapters."""
+
+from collections import OrderedDict
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Sequence, Tuple
+
+from ...utils.telemetry import record_memory_cache_lookup
+from .base import MemoryAdapter
+from .faiss_adapter import _embed
+
+
+class CachedMemoryAdapter(MemoryAdapter):
+    """Serve repeated retrievals from a bounded LRU cache in front of ``adapter``.
+
+    Entries are keyed by the query's normalised token counts, ``top_k`` and any
+    extra retrieval keywords (such as ``namespace``), so queries that differ
+    only in case or punctuation share an entry.  Every entry records the
+    wrapped adapter's :attr:`~MemoryAdapter.generation`; an entry is served
+    only while that generation is unchanged and the entry is younger than
+    ``ttl`` seconds.  Hits and misses are exported through
+    :func:`cognitive_core.utils.telemetry.record_memory_cache_lookup`.
+    """
+
+    def __init__(
+        self,
+        adapter: MemoryAdapter,
+        *,
+        maxsize: int = 1024,
+        ttl: float | None = 60.0,
+        name: str = "memory",
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.adapter = adapter
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.name = name
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[int, float, List[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def generation(self) -> int:
+        return self.adapter.generation
+
+    def save(self, text: str, **kwargs: Any) -> int:
+        return self.adapter.save(text, **kwargs)
+
+    def save_many(self, texts: Iterable[str], **kwargs: Any) -> List[int]:
+        return self.adapter.save_many(texts, **kwargs)
+
+    def delete(self, memory_id: int, **kwargs: Any) -> bool:
+        return self.adapter.delete(memory_id, **kwargs)
+
+    def upsert(self, memory_id: int, text: str, **kwargs: Any) -> None:
+        self.adapter.upsert(memory_id, text, **kwargs)
+
+    def compact(self, **kwargs: Any) -> None:
+        self.adapter.compact(**kwargs)
+
+    def retrieve(self, query: str, top_k: int = 1, **kwargs: Any) -> List[str]:
+        key = _cache_key(query, top_k, kwargs)
+        generation = self.adapter.generation
+        cached = self._lookup(key, generation)
+        if cached is not None:
+            return cached
+        result = self.adapter.retrieve(query, top_k, **kwargs)
+        self._store(key, generation, result)
+        return list(result)
+
+    def retrieve_many(self, queries: Sequence[str], top_k: int = 1, **kwargs: Any) -> List[List[str]]:
+        generation = self.adapter.generation
+        keys = [_cache_key(query, top_k, kwargs) for query in queries]
+        results: List[List[str] | None] = [self._lookup(key, generation) for key in keys]
+        missing = [position for position, result in enumerate(results) if result is None]
+        if missing:
+            fetched = self.adapter.retrieve_many([queries[i] for i in missing], top_k, **kwargs)
+            for position, result in zip(missing, fetched):
+                self._store(keys[position], generation, result)
+                results[position] = list(result)
+        return results  # type: ignore[return-value]
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self, **kwargs: Any) -> Dict[str, Any]:
+        stats = dict(self.adapter.stats(**kwargs))
+        with self._lock:
+            stats.update(cache_entries=len(self._entries), cache_hits=self.hits, cache_misses=self.misses)
+        return stats
+
+    def _lookup(self, key: Hashable, generation: int) -> List[str] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            hit = (
+                entry is not None
+                and entry[0] == generation
+                and (self.ttl is None or self._clock() - entry[1] < self.ttl)
+            )
+            if hit:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+                if entry is not None:
+                    del self._entries[key]
+        record_memory_cache_lookup(self.name, hit)
+        return list(entry[2]) if hit else None
+
+    def _store(self, key: Hashable, generation: int, result: List[str]) -> None:
+        # ``generation`` was read before the retrieval ran, so a write racing
+        # with it leaves an entry that the next lookup already treats as stale.
+        with self._lock:
+            self._entries[key] = (generation, self._clock(), list(result))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+def _cache_key(query: str, top_k: int, kwargs: Dict[str, Any]) -> Hashable:
+    tokens = tuple(sorted(_embed(query).items()))
+    return tokens, top_k, tuple(sorted(kwargs.items()))
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+"""Dense hashing-trick index scored with NumPy matrix products."""
+
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+import zlib
+
+try:  # pragma: no cover - optional dependency
+    import numpy as np
+except Exception:  # pragma: no cover - fallback when numpy missing
+    np = None
+
+
+# Upper bound on the number of float32 scores materialised at once when a
+# batch of queries is ranked against the store (64 MiB).
+_SCORE_BLOCK = 1 << 24
+
+
+@lru_cache(maxsize=65536)
+def _hash_token(token: str) -> int:
+    return zlib.crc32(token.encode("utf-8"))
+
+
+def hashed_vector(embedding: Counter[str], dim: int) -> "np.ndarray":
+    """Project a bag-of-words embedding into a signed ``dim``-wide float32 vector."""
+
+    vector = np.zeros(dim, dtype=np.float32)
+    for token, weight in embedding.items():
+        h = _hash_token(token)
+        vector[h % dim] += weight if h & 0x80000000 else -weight
+    return vector
+
+
+class DenseIndex:
+    """Row-major matrix of L2-normalised hashed embeddings.
+
+    Every document occupies one row of a contiguous float32 matrix that grows
+    geometrically, so a search is a single matrix-vector product followed by
+    ``argpartition`` instead of a Python loop over the store.  Hash collisions
+    make scores an approximation of the exact bag-of-words cosine; larger
+    ``dim`` values trade memory for fidelity.  An index restored from a
+    memory-mapped snapshot searches the mapped matrix directly and copies it
+    into RAM only when new rows are added.
+    """
+
+    snapshot_kind = "dense"
+
+    def __init__(self, dim: int = 1024, *, initial_capacity: int = 1024) -> None:
+        if np is None:
+            raise RuntimeError("numpy is not installed. Install 'numpy' to use DenseIndex.")
+        if dim <= 0:
+            raise ValueError("dim must be positive")
+        self.dim = dim
+        self._matrix = np.zeros((max(1, initial_capacity), dim), dtype=np.float32)
+        self._size = 0
+        self._dead: set[int] = set()
+        self._dead_slots: "np.ndarray | None" = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def tombstones(self) -> int:
+        """Number of removed rows still occupying the matrix."""
+
+        return len(self._dead)
+
+    def remove(self, slot: int) -> None:
+        """Tombstone ``slot`` so that searches no longer return it."""
+
+        self._dead.add(slot)
+        self._dead_slots = None
+
+    def _dead_array(self) -> "np.ndarray":
+        if self._dead_slots is None:
+            self._dead_slots = np.fromiter(self._dead, dtype=np.int64, count=len(self._dead))
+        return self._dead_slots
+
+    def _mask_dead(self, scores: "np.ndarray") -> int:
+        """Exclude tombstoned rows from ``scores`` and return the live count."""
+
+        if self._dead:
+            scores[..., self._dead_array()] = -np.inf
+        return scores.shape[-1] - len(self._dead)
+
+    def compacted(self, keep: Sequence[int]) -> "DenseIndex":
+        """Return a new index holding only ``keep`` rows, renumbered in order."""
+
+        index = type(self)(self.dim, initial_capacity=len(keep))
+        index._copy_rows(self, keep)
+        return index
+
+    def _copy_rows(self, source: "DenseIndex", keep: Sequence[int]) -> None:
+        rows = np.asarray(keep, dtype=np.int64)
+        self._matrix[: len(rows)] = source._matrix[rows]
+        self._size = len(rows)
+
+    @property
+    def matrix(self) -> "np.ndarray":
+        """View of the populated rows of the embedding matrix."""
+
+        return self._matrix[: self._size]
+
+    def embed(self, embedding: Counter[str]) -> "np.ndarray":
+        """Return the L2-normalised hashed vector for ``embedding``."""
+
+        return self.embed_many([embedding])[0]
+
+    def embed_many(self, embeddings: Sequence[Counter[str]]) -> "np.ndarray":
+        """Return a ``(len(embeddings), dim)`` matrix of normalised vectors."""
+
+        vectors = np.zeros((len(embeddings), self.dim), dtype=np.float32)
+        for row, embedding in enumerate(embeddings):
+            vectors[row] = hashed_vector(embedding, self.dim)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        np.divide(vectors, norms, out=vectors, where=norms > 0)
+        return vectors
+
+    def _reserve(self, extra: int) -> None:
+        needed = self._size + extra
+        if needed <= len(self._matrix):
+            return
+        capacity = max(1, len(self._matrix))
+        while capacity < needed:
+            capacity *= 2
+        grown = np.zeros((capacity, self.dim), dtype=np.float32)
+        grown[: self._size] = self._matrix[: self._size]
+        self._matrix = grown
+
+    def add(self, embedding: Counter[str]) -> int:
+        """Index ``embedding`` and return the slot assigned to it."""
+
+        self._reserve(1)
+        slot = self._size
+        self._matrix[slot] = self.embed(embedding)
+        self._size += 1
+        return slot
+
+    def add_many(self, embeddings: Iterable[Counter[str]]) -> List[int]:
+        """Index several embeddings with a single matrix write."""
+
+        vectors = self.embed_many(list(embeddings))
+        self._reserve(len(vectors))
+        start = self._size
+        self._matrix[start : start + len(vectors)] = vectors
+        self._size += len(vectors)
+        return list(range(start, self._size))
+
+    def snapshot_state(self) -> Tuple[Dict[str, Any], Dict[str, "np.ndarray"]]:
+        """Return the index as JSON metadata plus its populated matrix."""
+
+        return {"dim": self.dim}, {"vectors": self.matrix}
+
+    @classmethod
+    def from_snapshot(cls, meta: Dict[str, Any], arrays: Dict[str, "np.ndarray"]) -> "DenseIndex":
+        """Rebuild an index around arrays produced by :meth:`snapshot_state`."""
+
+        index = cls(meta["dim"], initial_capacity=1)
+        index._restore_matrix(arrays["vectors"])
+        return index
+
+    def _restore_matrix(self, vectors: "np.ndarray") -> None:
+        self._matrix = vectors
+        self._size = len(vectors)
+
+    def search(self, query: Counter[str], top_k: int) -> List[Tuple[float, int]]:
+        """Return up to ``top_k`` ``(cosine, slot)`` pairs ranked by similarity."""
+
+        if top_k <= 0 or not self._size:
+            return []
+        scores = self.matrix @ self.embed(query)
+        live = self._mask_dead(scores)
+        return _top_k(scores, min(top_k, live))
+
+    def search_many(
+        self, queries: Sequence[Counter[str]], top_k: int
+    ) -> List[List[Tuple[float, int]]]:
+        """Rank a batch of queries with blocked matrix-matrix products."""
+
+        if top_k <= 0 or not self._size:
+            return [[] for _ in queries]
+        vectors = self.embed_many(queries)
+        block = max(1, _SCORE_BLOCK // self._size)
+        results: List[List[Tuple[float, int]]] = []
+        for start in range(0, len(vectors), block):
+            scores = vectors[start : start + block] @ self.matrix.T
+            live = self._mask_dead(scores)
+            results.extend(_top_k(row, min(top_k, live)) for row in scores)
+        return results
+
+
+def _top_k(scores: "np.ndarray", top_k: int) -> List[Tuple[float, int]]:
+    """Select the ``top_k`` highest scores, breaking ties by lower slot."""
+
+    if top_k <= 0:
+        return []
+    if top_k < len(scores):
+        # argpartition picks arbitrarily among scores tied with the k-th one,
+        # so boundary ties are resolved explicitly in slot order.
+        kth = -np.partition(-scores, top_k - 1)[top_k - 1]
+        above = np.flatnonzero(scores > kth)
+        tied = np.flatnonzero(scores == kth)[: top_k - len(above)]
+        candidates = np.concatenate((above, tied))
+    else:
+        candidates = np.arange(len(scores))
+    order = candidates[np.lexsort((candidates, -scores[candidates]))]
+    return [(float(scores[slot]), int(slot)) for slot in order]
@@ -2,17 +2,28 @@ from __future__ import annotations
 
 """Simplified FAISS adapter used for tests."""
 
+from array import array
 from collections import Counter
-import heapq
-import math
+import os
 import re
-from typing import List, Tuple
+import threading
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
 
-from .base import MemoryAdapter
+from .base import RANKINGS, MemoryAdapter
+from .bm25_index import BM25Index
+from .dense_index import DenseIndex
+from .inverted_index import InvertedIndex
+from .ivf_index import IVFIndex
+from .mmr import check_mmr_options, mmr_select
+from .snapshot import MappedTexts, np, read_snapshot, require_numpy, write_snapshot
 
 
 _TOKEN_RE = re.compile(r"[a-z0-9]+")
 
+_INDEX_KINDS = {
+    cls.snapshot_kind: cls for cls in (InvertedIndex, BM25Index, DenseIndex, IVFIndex)
+}
+
 
 def _embed(text: str) -> Counter[str]:
     """Create a naive bag-of-words embedding."""
@@ -21,34 +32,254 @@ def _embed(text: str) -> Counter[str]:
     return Counter(tokens)
 
 
-def _cosine(a: Counter[str], b: Counter[str]) -> float:
-    """Compute cosine similarity between two bag-of-words vectors."""
-    intersection = set(a) & set(b)
-    dot = sum(a[token] * b[token] for token in intersection)
-    norm_a = math.sqrt(sum(v * v for v in a.values()))
-    norm_b = math.sqrt(sum(v * v for v in b.values()))
-    if norm_a == 0 or norm_b == 0:
-        return 0.0
-    return dot / (norm_a * norm_b)
+class FaissMemoryAdapter(MemoryAdapter):
+    """In-memory implementation mimicking a FAISS vector store.
+
+    Embeddings are kept in an :class:`InvertedIndex` so retrieval only scores
+    memories that share at least one token with the query.  Passing
+    ``dense_dim`` switches to a :class:`DenseIndex` that hashes tokens into
+    fixed-width float32 vectors and ranks the whole store with one NumPy
+    matrix-vector product; this requires ``numpy``.  A preconfigured index,
+    such as an approximate :class:`~cognitive_core.core.memory.ivf_index.IVFIndex`,
+    can be supplied through ``index`` instead.  ``ranking="bm25"`` ranks with
+    a :class:`BM25Index` instead of cosine similarity.
 
+    Deleted and replaced memories are tombstoned in the index.  Once the share
+    of tombstoned slots reaches ``compaction_threshold`` the index is rebuilt
+    on a background thread and swapped in atomically; pass ``None`` to only
+    compact on explicit :meth:`compact` calls.
+    """
 
-class FaissMemoryAdapter(MemoryAdapter):
-    """In-memory implementation mimicking a FAISS vector store."""
+    def __init__(
+        self,
+        *,
+        dense_dim: int | None = None,
+        index: InvertedIndex | BM25Index | DenseIndex | None = None,
+        ranking: str = "cosine",
+        compaction_threshold: float | None = 0.25,
+    ) -> None:
+        if index is not None and dense_dim is not None:
+            raise ValueError("Pass either dense_dim or index, not both")
+        if ranking not in RANKINGS:
+            raise ValueError(f"Unknown ranking {ranking!r}; expected one of {RANKINGS}")
+        if ranking == "bm25" and (index is not None or dense_dim is not None):
+            raise ValueError("ranking='bm25' cannot be combined with dense_dim or index")
+        if index is None:
+            if ranking == "bm25":
+                index = BM25Index()
+            else:
+                index = InvertedIndex() if dense_dim is None else DenseIndex(dense_dim)
+        elif len(index):
+            raise ValueError("FaissMemoryAdapter requires an empty index")
+        self.compaction_threshold = compaction_threshold
+        self._texts: List[str] | MappedTexts = []
+        self._index = index
+        # ``_ids`` maps slots to memory ids (-1 for tombstones); ``_slots`` is the inverse.
+        self._ids = array("q")
+        self._slots: Dict[int, int] = {}
+        self._next_id = 0
+        self._compactions = 0
+        self._lock = threading.RLock()
+        self._compaction_lock = threading.Lock()
+        self._compaction_thread: threading.Thread | None = None
+
+    @property
+    def index(self) -> InvertedIndex | BM25Index | DenseIndex:
+        """The index backing this adapter, e.g. to tune ``nprobe`` at runtime."""
+
+        return self._index
+
+    def save(self, text: str) -> int:
+        return self.save_many([text])[0]
 
-    def __init__(self) -> None:
-        self._store: List[Tuple[Counter[str], str]] = []
+    def save_many(self, texts: Iterable[str]) -> List[int]:
+        batch = list(texts)
+        return self.save_tokenized(batch, [_embed(text) for text in batch])
 
-    def save(self, text: str) -> None:
-        self._store.append((_embed(text), text))
+    def save_tokenized(
+        self, texts: Sequence[str], embeddings: Sequence[Counter[str]]
+    ) -> List[int]:
+        batch = list(texts)
+        with self._lock:
+            slots = self._index.add_many(embeddings)
+            self._texts.extend(batch)
+            ids = list(range(self._next_id, self._next_id + len(batch)))
+            self._next_id += len(batch)
+            self._ids.extend(ids)
+            self._slots.update(zip(ids, slots))
+            self.generation += 1
+        return ids
 
-    def retrieve(self, query: str, top_k: int = 1) -> List[str]:
-        query_emb = _embed(query)
-        if not self._store or top_k <= 0:
+    def delete(self, memory_id: int) -> bool:
+        with self._lock:
+            slot = self._slots.pop(memory_id, None)
+            if slot is None:
+                return False
+            self._tombstone(slot)
+            self.generation += 1
+            self._maybe_schedule_compaction()
+        return True
+
+    def upsert(self, memory_id: int, text: str) -> None:
+        # Negative entries of ``_ids`` mark deleted slots.
+        if memory_id < 0:
+            raise ValueError("memory_id must not be negative")
+        embedding = _embed(text)
+        with self._lock:
+            previous = self._slots.get(memory_id)
+            if previous is not None:
+                self._tombstone(previous)
+            slot = self._index.add(embedding)
+            self._texts.append(text)
+            self._ids.append(memory_id)
+            self._slots[memory_id] = slot
+            self._next_id = max(self._next_id, memory_id + 1)
+            self.generation += 1
+            self._maybe_schedule_compaction()
+
+    def retrieve(
+        self,
+        query: str,
+        top_k: int = 1,
+        *,
+        mmr_lambda: float | None = None,
+        fetch_k: int | None = None,
+    ) -> List[str]:
+        if top_k <= 0:
             return []
 
-        scored = (
-            (_cosine(query_emb, embedding), text)
-            for embedding, text in self._store
+        embedding = _embed(query)
+        pool = top_k if mmr_lambda is None else check_mmr_options(top_k, mmr_lambda, fetch_k)
+        with self._lock:
+            if not self._slots:
+                return []
+            hits = self._index.search(embedding, pool)
+            texts = [self._texts[slot] for _, slot in hits]
+        if mmr_lambda is None:
+            return texts
+        picked = mmr_select(embedding, [_embed(text) for text in texts], top_k, mmr_lambda)
+        return [texts[position] for position in picked]
+
+    def retrieve_many(self, queries: Sequence[str], top_k: int = 1) -> List[List[str]]:
+        if top_k <= 0:
+            return [[] for _ in queries]
+
+        hits = self._search_many([_embed(query) for query in queries], top_k)
+        return [[text for _, _, text in ranked] for ranked in hits]
+
+    def _search_many(
+        self, embeddings: Sequence[Counter[str]], top_k: int
+    ) -> List[List[Tuple[float, int, str]]]:
+        """Rank ``embeddings`` and return ``(score, memory_id, text)`` hits."""
+
+        with self._lock:
+            if not self._slots:
+                return [[] for _ in embeddings]
+            hits = self._index.search_many(embeddings, top_k)
+            return [
+                [(score, self._ids[slot], self._texts[slot]) for score, slot in ranked]
+                for ranked in hits
+            ]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            slots = len(self._index)
+            tombstones = slots - len(self._slots)
+            return {
+                "memories": len(self._slots),
+                "slots": slots,
+                "tombstones": tombstones,
+                "tombstone_ratio": tombstones / slots if slots else 0.0,
+                "compactions": self._compactions,
+            }
+
+    def compact(self) -> None:
+        """Rebuild the index without tombstoned slots.
+
+        The replacement index is built without holding the adapter lock, so
+        saves and retrievals proceed meanwhile; memories saved or deleted
+        during the rebuild are replayed onto it before it is swapped in.
+        """
+
+        with self._compaction_lock:
+            with self._lock:
+                index, texts = self._index, self._texts
+                size = len(index)
+                keep = [slot for slot, memory_id in enumerate(self._ids) if memory_id >= 0]
+                if len(keep) == size:
+                    return
+
+            compacted = index.compacted(keep)
+            compacted_texts = [texts[slot] for slot in keep]
+
+            with self._lock:
+                ids = array("q", (self._ids[slot] for slot in keep))
+                for new_slot, ids_slot in enumerate(keep):
+                    if self._ids[ids_slot] < 0:
+                        compacted.remove(new_slot)
+                for slot in range(size, len(index)):
+                    new_slot = compacted.add(_embed(texts[slot]))
+                    compacted_texts.append(texts[slot])
+                    ids.append(self._ids[slot])
+                    if self._ids[slot] < 0:
+                        compacted.remove(new_slot)
+                self._index, self._texts, self._ids = compacted, compacted_texts, ids
+                self._slots = {memory_id: slot for slot, memory_id in enumerate(ids) if memory_id >= 0}
+                self._compactions += 1
+
+    def _tombstone(self, slot: int) -> None:
+        self._index.remove(slot)
+        self._ids[slot] = -1
+
+    def _maybe_schedule_compaction(self) -> None:
+        if self.compaction_threshold is None:
+            return
+        slots = len(self._index)
+        if not slots or (slots - len(self._slots)) / slots < self.compaction_threshold:
+            return
+        if self._compaction_thread is not None and self._compaction_thread.is_alive():
+            return
+        self._compaction_thread = threading.Thread(
+            target=self.compact, name="memory-compaction", daemon=True
         )
-        top_results = heapq.nlargest(top_k, scored, key=lambda item: item[0])
-        return [text for _, text in top_results]
+        self._compaction_thread.start()
+
+    def snapshot(self, path: str | os.PathLike[str]) -> None:
+        require_numpy()
+        with self._lock:
+            meta, arrays = self._index.snapshot_state()
+            meta["index"] = self._index.snapshot_kind
+            meta["next_id"] = self._next_id
+            arrays["ids"] = np.array(self._ids, dtype=np.int64)
+            write_snapshot(path, meta, arrays, self._texts)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike[str], *, mmap: bool = True) -> "FaissMemoryAdapter":
+        adapter = cls()
+        adapter._restore(path, mmap=mmap)
+        return adapter
+
+    def restore(self, path: str | os.PathLike[str]) -> None:
+        self._restore(path, mmap=False)
+
+    def _restore(self, path: str | os.PathLike[str], *, mmap: bool) -> None:
+        meta, arrays, texts = read_snapshot(path, mmap=mmap)
+        try:
+            index_cls = _INDEX_KINDS[meta["index"]]
+        except KeyError:
+            raise ValueError(f"Unknown memory index kind in snapshot: {meta.get('index')!r}") from None
+        index = index_cls.from_snapshot(meta, arrays)
+        ids = array("q", np.asarray(arrays["ids"], dtype=np.int64).tobytes())
+        slots: Dict[int, int] = {}
+        for slot, memory_id in enumerate(ids):
+            if memory_id < 0:
+                index.remove(slot)
+            else:
+                slots[memory_id] = slot
+        with self._lock:
+            self._index = index
+            self._texts = texts
+            self._ids = ids
+            self._slots = slots
+            self._next_id = meta["next_id"]
+            self.generation += 1
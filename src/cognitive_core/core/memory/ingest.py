@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+"""Streaming bulk ingestion of memories from text or JSONL sources."""
+
+from collections import Counter, deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+import json
+import os
+import time
+from typing import Callable, Deque, Iterable, Iterator, List, TextIO, Tuple
+
+from .base import MemoryAdapter
+from .faiss_adapter import _embed
+
+
+@dataclass
+class IngestStats:
+    """Running totals reported while ingesting."""
+
+    documents: int = 0
+    chunks: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def docs_per_second(self) -> float:
+        return self.documents / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def tokenize_many(texts: List[str]) -> List[Counter[str]]:
+    """Tokenise ``texts`` the way the built-in adapters do."""
+
+    return [_embed(text) for text in texts]
+
+
+def iter_records(
+    stream: TextIO, *, format: str = "text", field: str = "text"
+) -> Iterator[str]:
+    """Yield memory texts from ``stream`` one line at a time.
+
+    ``format="text"`` yields every non-blank line without its line break.
+    ``format="jsonl"`` parses every non-blank line as JSON and yields either
+    the string itself or the ``field`` member of an object.
+    """
+
+    if format not in ("text", "jsonl"):
+        raise ValueError(f"Unknown ingest format {format!r}; expected 'text' or 'jsonl'")
+    for number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        if format == "text":
+            yield line.rstrip("\r\n")
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"Line {number}: invalid JSON: {exc.msg}") from exc
+        if isinstance(record, dict):
+            record = record.get(field)
+        if not isinstance(record, str):
+            raise ValueError(f"Line {number}: expected a string or an object with a {field!r} string")
+        yield record
+
+
+def detect_format(path: str) -> str:
+    """Guess the ingest format from a file name."""
+
+    return "jsonl" if path.endswith((".jsonl", ".ndjson")) else "text"
+
+
+def ingest(
+    adapter: MemoryAdapter,
+    texts: Iterable[str],
+    *,
+    chunk_size: int = 1000,
+    workers: int | None = None,
+    progress: Callable[[IngestStats], None] | None = None,
+) -> IngestStats:
+    """Stream ``texts`` into ``adapter`` in chunks of ``chunk_size``.
+
+    Chunks are tokenised in a pool of ``workers`` processes (``0`` tokenises
+    in the calling process) and handed to :meth:`MemoryAdapter.save_tokenized`
+    in input order.  At most ``2 * workers`` chunks are in flight, so memory
+    use is bounded by the chunk size rather than by the size of the input.
+    ``progress`` is called with the running totals after every chunk.
+    """
+
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 0:
+        raise ValueError("workers must not be negative")
+
+    stats = IngestStats()
+    start = time.perf_counter()
+    chunks = _chunked(texts, chunk_size)
+
+    def store(batch: List[str], embeddings: List[Counter[str]]) -> None:
+        adapter.save_tokenized(batch, embeddings)
+        stats.documents += len(batch)
+        stats.chunks += 1
+        stats.elapsed = time.perf_counter() - start
+        if progress is not None:
+            progress(stats)
+
+    if workers == 0:
+        for batch in chunks:
+            store(batch, tokenize_many(batch))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            _pipeline(pool, chunks, 2 * workers, store)
+
+    stats.elapsed = time.perf_counter() - start
+    return stats
+
+
+def _pipeline(
+    pool: Executor,
+    chunks: Iterator[List[str]],
+    depth: int,
+    store: Callable[[List[str], List[Counter[str]]], None],
+) -> None:
+    # ``Executor.map`` would drain ``chunks`` eagerly; a bounded window of
+    # futures keeps only ``depth`` chunks in memory and preserves order.
+    pending: Deque[Tuple[List[str], Future]] = deque()
+    for batch in chunks:
+        pending.append((batch, pool.submit(tokenize_many, batch)))
+        if len(pending) >= depth:
+            done, future = pending.popleft()
+            store(done, future.result())
+    while pending:
+        done, future = pending.popleft()
+        store(done, future.result())
+
+
+def _chunked(texts: Iterable[str], size: int) -> Iterator[List[str]]:
+    iterator = iter(texts)
+    while batch := list(islice(iterator, size)):
+        yield batch
@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+"""Inverted index over bag-of-words embeddings."""
+
+from array import array
+from collections import Counter
+import heapq
+import itertools
+import math
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+from .snapshot import np
+
+
+class InvertedIndex:
+    """Token -> postings index with precomputed document norms.
+
+    Documents are identified by a dense integer slot assigned in insertion
+    order.  A query only visits the postings of its own tokens, so the cost of
+    a search scales with the number of documents sharing at least one token
+    with the query rather than with the size of the store.
+
+    Tokens are interned to integer ids on first sight and every token's
+    postings are two parallel ``array('I')`` buffers of slots and term
+    weights, so a posting costs eight bytes instead of a tuple and two boxed
+    integers.  An index restored from a snapshot keeps the snapshot postings
+    in read-only CSR arrays (``indptr``/``slots``/``weights``) indexed by the
+    same token ids, and records new documents in the per-token buffers.
+    Removed slots are tombstoned: their postings stay in place and are
+    skipped until :meth:`compacted` rebuilds the index without them.
+    """
+
+    snapshot_kind = "inverted"
+
+    def __init__(self) -> None:
+        self._vocab: Dict[str, int] = {}
+        self._tokens: List[str] = []
+        # Per token id; ``None`` until a token restored from a snapshot gains postings.
+        self._slots: List[array | None] = []
+        self._weights: List[array | None] = []
+        self._norms = array("d")
+        self._frozen: Tuple[Any, Any, Any] | None = None
+        self._dead: set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self._norms)
+
+    @property
+    def vocabulary_size(self) -> int:
+        """Number of distinct tokens interned so far."""
+
+        return len(self._tokens)
+
+    @property
+    def tombstones(self) -> int:
+        """Number of removed slots still occupying the index."""
+
+        return len(self._dead)
+
+    def remove(self, slot: int) -> None:
+        """Tombstone ``slot`` so that searches no longer return it."""
+
+        self._dead.add(slot)
+
+    def compacted(self, keep: Sequence[int]) -> "InvertedIndex":
+        """Return a new index holding only ``keep`` slots, renumbered in order.
+
+        Only the slots listed in ``keep`` are read, so the index may keep
+        receiving appends while a compacted copy is being built.
+        """
+
+        remap = {old: new for new, old in enumerate(keep)}
+        index = InvertedIndex()
+        for token_id, token in enumerate(list(self._tokens)):
+            postings = [
+                (remap[slot], weight)
+                for slot, weight in self._postings_of(token_id)
+                if slot in remap
+            ]
+            if postings:
+                target = index._intern(token)
+                index._slots[target].extend(slot for slot, _ in postings)
+                index._weights[target].extend(weight for _, weight in postings)
+        index._norms = array("d", (self._norms[slot] for slot in keep))
+        return index
+
+    def add(self, embedding: Counter[str]) -> int:
+        """Index ``embedding`` and return the slot assigned to it."""
+
+        slot = len(self._norms)
+        vocab = self._vocab
+        for token, weight in embedding.items():
+            token_id = vocab.get(token)
+            if token_id is None:
+                token_id = self._intern(token)
+            slots = self._slots[token_id]
+            if slots is None:
+                slots = self._slots[token_id] = array("I")
+                self._weights[token_id] = array("I")
+            slots.append(slot)
+            self._weights[token_id].append(weight)
+        self._norms.append(math.sqrt(sum(v * v for v in embedding.values())))
+        return slot
+
+    def add_many(self, embeddings: Iterable[Counter[str]]) -> List[int]:
+        """Index several embeddings and return their slots."""
+
+        return [self.add(embedding) for embedding in embeddings]
+
+    def _intern(self, token: str) -> int:
+        token_id = len(self._tokens)
+        self._vocab[token] = token_id
+        self._tokens.append(token)
+        self._slots.append(array("I"))
+        self._weights.append(array("I"))
+        return token_id
+
+    def search(self, query: Counter[str], top_k: int) -> List[Tuple[float, int]]:
+        """Return up to ``top_k`` ``(cosine, slot)`` pairs ranked by similarity.
+
+        Ties are broken by insertion order.  When fewer than ``top_k``
+        documents share a token with the query the result is padded with
+        zero-scored documents, matching the behaviour of an exhaustive scan.
+        """
+
+        return self.search_many([query], top_k)[0]
+
+    def search_many(
+        self, queries: Sequence[Counter[str]], top_k: int
+    ) -> List[List[Tuple[float, int]]]:
+        """Rank several queries while walking each touched posting list once."""
+
+        if top_k <= 0 or not self._norms:
+            return [[] for _ in queries]
+
+        readers: Dict[int, List[Tuple[int, int]]] = {}
+        for position, query in enumerate(queries):
+            for token, query_weight in query.items():
+                token_id = self._vocab.get(token)
+                if token_id is not None:
+                    readers.setdefault(token_id, []).append((position, query_weight))
+
+        dots: List[Dict[int, float]] = [{} for _ in queries]
+        for token_id, token_readers in readers.items():
+            for slot, weight in self._postings_of(token_id):
+                for position, query_weight in token_readers:
+                    acc = dots[position]
+                    acc[slot] = acc.get(slot, 0.0) + query_weight * weight
+
+        return [self._rank(query, acc, top_k) for query, acc in zip(queries, dots)]
+
+    def _postings_of(self, token_id: int) -> Iterable[Tuple[int, int]]:
+        slots, weights = self._slots[token_id], self._weights[token_id]
+        live = zip(slots, weights) if slots is not None else ()
+        if self._frozen is None or token_id >= len(self._frozen[0]) - 1:
+            return live
+        indptr, frozen_slots, frozen_weights = self._frozen
+        start, end = int(indptr[token_id]), int(indptr[token_id + 1])
+        frozen = zip(frozen_slots[start:end].tolist(), frozen_weights[start:end].tolist())
+        return itertools.chain(frozen, live)
+
+    def snapshot_state(self) -> Tuple[Dict[str, Any], Dict[str, "np.ndarray"]]:
+        """Return the index as JSON metadata plus CSR postings arrays."""
+
+        vocab = list(self._tokens)
+        counts = np.zeros(len(vocab), dtype=np.int64)
+        slot_parts: List["np.ndarray"] = []
+        weight_parts: List["np.ndarray"] = []
+        frozen_rows = len(self._frozen[0]) - 1 if self._frozen is not None else 0
+        for token_id in range(len(vocab)):
+            if token_id < frozen_rows:
+                indptr, frozen_slots, frozen_weights = self._frozen
+                start, end = int(indptr[token_id]), int(indptr[token_id + 1])
+                slot_parts.append(frozen_slots[start:end])
+                weight_parts.append(frozen_weights[start:end])
+                counts[token_id] += end - start
+            slots = self._slots[token_id]
+            if slots is not None:
+                slot_parts.append(np.frombuffer(slots, dtype=np.uint32))
+                weight_parts.append(np.frombuffer(self._weights[token_id], dtype=np.uint32))
+                counts[token_id] += len(slots)
+        empty = np.zeros(0, dtype=np.uint32)
+        arrays = {
+            "indptr": np.concatenate(([0], np.cumsum(counts))).astype(np.int64),
+            "slots": np.concatenate(slot_parts).astype(np.uint32) if slot_parts else empty,
+            "weights": np.concatenate(weight_parts).astype(np.uint32) if weight_parts else empty,
+            "norms": np.frombuffer(self._norms, dtype=np.float64),
+        }
+        return {"vocab": vocab}, arrays
+
+    @classmethod
+    def from_snapshot(cls, meta: Dict[str, Any], arrays: Dict[str, "np.ndarray"]) -> "InvertedIndex":
+        """Rebuild an index around arrays produced by :meth:`snapshot_state`."""
+
+        index = cls()
+        index._tokens = list(meta["vocab"])
+        index._vocab = {token: token_id for token_id, token in enumerate(index._tokens)}
+        index._slots = [None] * len(index._tokens)
+        index._weights = [None] * len(index._tokens)
+        index._frozen = (arrays["indptr"], arrays["slots"], arrays["weights"])
+        index._norms = array("d", np.asarray(arrays["norms"], dtype=np.float64).tobytes())
+        return index
+
+    def _rank(
+        self, query: Counter[str], dots: Dict[int, float], top_k: int
+    ) -> List[Tuple[float, int]]:
+        query_norm = math.sqrt(sum(v * v for v in query.values()))
+        norms = self._norms
+        dead = self._dead
+        scored = (
+            (dot / (query_norm * norms[slot]), slot)
+            for slot, dot in dots.items()
+            if slot not in dead
+        )
+        ranked = heapq.nlargest(top_k, scored, key=lambda item: (item[0], -item[1]))
+
+        if len(ranked) < top_k:
+            for slot in range(len(norms)):
+                if slot not in dots and slot not in dead:
+                    ranked.append((0.0, slot))
+                    if len(ranked) == top_k:
+                        break
+        return ranked
@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+"""Inverted-file (IVF) approximate nearest-neighbour index."""
+
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+from .dense_index import DenseIndex, _top_k, np
+
+
+class IVFIndex(DenseIndex):
+    """Approximate cosine search over k-means partitions of a :class:`DenseIndex`.
+
+    Vectors are stored exactly as in :class:`DenseIndex`; additionally every
+    vector is assigned to the closest of ``nlist`` coarse centroids.  A search
+    scores the centroids, then only the members of the ``nprobe`` best lists,
+    trading recall for latency.  Until ``train_size`` vectors have been added
+    the index answers queries exactly; once the threshold is crossed the
+    centroids are trained with spherical k-means and later insertions are
+    assigned incrementally.  Call :meth:`train` to re-cluster after the data
+    distribution drifts.
+    """
+
+    snapshot_kind = "ivf"
+
+    def __init__(
+        self,
+        dim: int = 1024,
+        *,
+        nlist: int = 64,
+        nprobe: int = 4,
+        train_size: int | None = None,
+        kmeans_iterations: int = 10,
+        seed: int = 0,
+        initial_capacity: int = 1024,
+    ) -> None:
+        super().__init__(dim, initial_capacity=initial_capacity)
+        if nlist <= 0 or nprobe <= 0:
+            raise ValueError("nlist and nprobe must be positive")
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.train_size = train_size if train_size is not None else 39 * nlist
+        self.kmeans_iterations = kmeans_iterations
+        self._rng = np.random.default_rng(seed)
+        self._centroids: "np.ndarray | None" = None
+        self._lists: List[List[int]] = []
+        self._list_arrays: List["np.ndarray | None"] = []
+
+    @property
+    def is_trained(self) -> bool:
+        return self._centroids is not None
+
+    def add(self, embedding: Counter[str]) -> int:
+        return self.add_many([embedding])[0]
+
+    def add_many(self, embeddings: Iterable[Counter[str]]) -> List[int]:
+        slots = super().add_many(embeddings)
+        if self.is_trained:
+            self._assign(np.asarray(slots, dtype=np.int64))
+        elif len(self) >= self.train_size:
+            self.train()
+        return slots
+
+    def train(self) -> None:
+        """(Re)cluster every stored vector and rebuild the inverted lists."""
+
+        if not len(self):
+            return
+        vectors = self.matrix
+        nlist = min(self.nlist, len(vectors))
+        sample = min(len(vectors), max(self.train_size, 64 * nlist))
+        rows = self._rng.choice(len(vectors), size=sample, replace=False)
+        self._centroids = _spherical_kmeans(
+            vectors[rows], nlist, self.kmeans_iterations, self._rng
+        )
+        self._lists = [[] for _ in range(nlist)]
+        self._list_arrays = [None] * nlist
+        self._assign(np.arange(len(vectors), dtype=np.int64))
+
+    def compacted(self, keep: Sequence[int]) -> "IVFIndex":
+        """Return a compacted copy that keeps the trained centroids."""
+
+        index = IVFIndex(
+            self.dim,
+            nlist=self.nlist,
+            nprobe=self.nprobe,
+            train_size=self.train_size,
+            kmeans_iterations=self.kmeans_iterations,
+            initial_capacity=len(keep),
+        )
+        index._copy_rows(self, keep)
+        if self.is_trained:
+            remap = {old: new for new, old in enumerate(keep)}
+            index._centroids = self._centroids
+            index._lists = [
+                [remap[slot] for slot in members if slot in remap] for members in self._lists
+            ]
+            index._list_arrays = [None] * len(index._lists)
+        return index
+
+    def snapshot_state(self) -> Tuple[Dict[str, Any], Dict[str, "np.ndarray"]]:
+        meta, arrays = super().snapshot_state()
+        meta.update(
+            nlist=self.nlist,
+            nprobe=self.nprobe,
+            train_size=self.train_size,
+            kmeans_iterations=self.kmeans_iterations,
+        )
+        if self.is_trained:
+            arrays["centroids"] = self._centroids
+            arrays["list_indptr"] = np.cumsum([0] + [len(members) for members in self._lists])
+            arrays["list_slots"] = np.asarray(
+                [slot for members in self._lists for slot in members], dtype=np.int64
+            )
+        return meta, arrays
+
+    @classmethod
+    def from_snapshot(cls, meta: Dict[str, Any], arrays: Dict[str, "np.ndarray"]) -> "IVFIndex":
+        index = cls(
+            meta["dim"],
+            nlist=meta["nlist"],
+            nprobe=meta["nprobe"],
+            train_size=meta["train_size"],
+            kmeans_iterations=meta["kmeans_iterations"],
+            initial_capacity=1,
+        )
+        index._restore_matrix(arrays["vectors"])
+        if "centroids" in arrays:
+            index._centroids = arrays["centroids"]
+            indptr, slots = arrays["list_indptr"], arrays["list_slots"]
+            index._list_arrays = [slots[indptr[i] : indptr[i + 1]] for i in range(len(indptr) - 1)]
+            index._lists = [members.tolist() for members in index._list_arrays]
+        return index
+
+    def _assign(self, slots: "np.ndarray") -> None:
+        assignments = np.argmax(self.matrix[slots] @ self._centroids.T, axis=1)
+        for slot, list_id in zip(slots.tolist(), assignments.tolist()):
+            self._lists[list_id].append(slot)
+            self._list_arrays[list_id] = None
+
+    def _members(self, list_id: int) -> "np.ndarray":
+        members = self._list_arrays[list_id]
+        if members is None:
+            members = np.asarray(self._lists[list_id], dtype=np.int64)
+            self._list_arrays[list_id] = members
+        return members
+
+    def search(
+        self, query: Counter[str], top_k: int, *, nprobe: int | None = None
+    ) -> List[Tuple[float, int]]:
+        """Return up to ``top_k`` approximate ``(cosine, slot)`` pairs.
+
+        ``nprobe`` overrides the instance default for this call; lists keep
+        being probed in centroid order until at least ``top_k`` candidates
+        have been gathered.
+        """
+
+        return self.search_many([query], top_k, nprobe=nprobe)[0]
+
+    def search_many(
+        self, queries: Sequence[Counter[str]], top_k: int, *, nprobe: int | None = None
+    ) -> List[List[Tuple[float, int]]]:
+        if not self.is_trained or top_k <= 0 or not len(self):
+            return super().search_many(queries, top_k)
+
+        probes = min(nprobe or self.nprobe, len(self._lists))
+        vectors = self.embed_many(queries)
+        centroid_scores = vectors @ self._centroids.T
+        results = []
+        for vector, scores in zip(vectors, centroid_scores):
+            order = np.argsort(-scores, kind="stable")
+            parts = []
+            gathered = 0
+            for rank, list_id in enumerate(order):
+                if rank >= probes and gathered >= top_k:
+                    break
+                members = self._members(int(list_id))
+                parts.append(members)
+                gathered += len(members)
+            candidates = np.sort(np.concatenate(parts))
+            if self._dead:
+                candidates = candidates[~np.isin(candidates, self._dead_array())]
+            candidate_scores = self.matrix[candidates] @ vector
+            results.append(
+                [(score, int(candidates[i])) for score, i in _top_k(candidate_scores, top_k)]
+            )
+        return results
+
+
+def _spherical_kmeans(
+    vectors: "np.ndarray", k: int, iterations: int, rng: "np.random.Generator"
+) -> "np.ndarray":
+    """Cluster unit vectors by cosine similarity and return unit centroids."""
+
+    centroids = vectors[rng.choice(len(vectors), size=k, replace=False)].copy()
+    for _ in range(iterations):
+        labels = np.argmax(vectors @ centroids.T, axis=1)
+        order = np.argsort(labels, kind="stable")
+        counts = np.bincount(labels, minlength=k)
+        present = counts > 0
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        sums = np.zeros_like(centroids)
+        sums[present] = np.add.reduceat(vectors[order], starts[present], axis=0)
+        empty = ~present
+        if empty.any():
+            # Re-seed empty clusters from random members to keep all k lists useful.
+            sums[empty] = vectors[rng.choice(len(vectors), size=int(empty.sum()))]
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        np.divide(sums, norms, out=sums, where=norms > 0)
+        centroids = sums
+    return centroids
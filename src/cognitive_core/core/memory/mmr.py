@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+"""Maximal Marginal Relevance re-ranking of retrieval candidates."""
+
+from collections import Counter
+import math
+from typing import Dict, List, Sequence
+
+try:  # pragma: no cover - optional dependency
+    import numpy as np
+except Exception:  # pragma: no cover - fallback when numpy missing
+    np = None
+
+
+#: Candidates fetched per requested result when ``fetch_k`` is not given.
+FETCH_FACTOR = 4
+
+
+def check_mmr_options(top_k: int, mmr_lambda: float, fetch_k: int | None) -> int:
+    """Validate MMR options and return the size of the candidate pool."""
+
+    if np is None:
+        raise RuntimeError("numpy is not installed. Install 'numpy' to use MMR retrieval.")
+    if not 0.0 <= mmr_lambda <= 1.0:
+        raise ValueError("mmr_lambda must be between 0 and 1")
+    if fetch_k is None:
+        return FETCH_FACTOR * top_k
+    if fetch_k < top_k:
+        raise ValueError("fetch_k must be at least top_k")
+    return fetch_k
+
+
+def mmr_select(
+    query: Counter[str],
+    candidates: Sequence[Counter[str]],
+    top_k: int,
+    mmr_lambda: float,
+) -> List[int]:
+    """Return the positions of ``top_k`` diverse ``candidates`` in pick order.
+
+    Each step picks the candidate maximising
+    ``mmr_lambda * relevance - (1 - mmr_lambda) * max_similarity`` where
+    ``relevance`` is the candidate's cosine similarity with ``query`` and
+    ``max_similarity`` its largest cosine similarity to an already picked
+    candidate, so both terms share one scale whatever ranking produced the
+    candidates.  The candidates are projected once into an L2-normalised
+    matrix over their joint vocabulary; one matrix product yields every
+    pairwise similarity and each step updates the running maxima with a
+    single vectorised ``maximum``.  Ties go to the earlier candidate.
+    """
+
+    count = len(candidates)
+    top_k = min(top_k, count)
+    if top_k <= 0:
+        return []
+
+    columns: Dict[str, int] = {}
+    rows: List[int] = []
+    cols: List[int] = []
+    weights: List[float] = []
+    for row, embedding in enumerate(candidates):
+        for token, weight in embedding.items():
+            rows.append(row)
+            cols.append(columns.setdefault(token, len(columns)))
+            weights.append(weight)
+    matrix = np.zeros((count, len(columns)), dtype=np.float64)
+    matrix[rows, cols] = weights
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+
+    vector = np.zeros(len(columns), dtype=np.float64)
+    for token, weight in query.items():
+        column = columns.get(token)
+        if column is not None:
+            vector[column] = weight
+    norm = math.sqrt(sum(weight * weight for weight in query.values()))
+    relevance = matrix @ (vector / norm) if norm else np.zeros(count, dtype=np.float64)
+
+    similarity = matrix @ matrix.T
+    # Token counts are non-negative, so similarities start from zero.
+    closest = np.zeros(count, dtype=np.float64)
+    available = np.ones(count, dtype=bool)
+    picked: List[int] = []
+    for _ in range(top_k):
+        marginal = mmr_lambda * relevance - (1.0 - mmr_lambda) * closest
+        marginal = np.where(available, marginal, -np.inf)
+        best = int(np.argmax(marginal))
+        picked.append(best)
+        available[best] = False
+        np.maximum(closest, similarity[best], out=closest)
+    return picked
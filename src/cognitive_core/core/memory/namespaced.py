@@ -0,0 +1,298 @@
+from __future__ import annotations
+
+"""Multi-tenant memory with one adapter per namespace."""
+
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+import os
+from pathlib import Path
+import re
+import shutil
+import threading
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Sequence, Set, Tuple
+
+from .base import MemoryAdapter
+from .faiss_adapter import FaissMemoryAdapter
+
+
+DEFAULT_NAMESPACE = "default"
+
+_NAMESPACE_RE = re.compile(r"[A-Za-z0-9_-][A-Za-z0-9_.-]*")
+
+
+class MemoryQuotaExceededError(RuntimeError):
+    """Raised when a save would take a namespace past its memory quota."""
+
+
+class NamespacedMemoryAdapter(MemoryAdapter):
+    """Route memories to a separate adapter per namespace.
+
+    Every namespace owns an adapter created by ``factory``, so a retrieval only
+    searches the calling tenant's memories.  ``quota`` caps the number of live
+    memories per namespace, with ``quotas`` overriding it for individual
+    namespaces.  When more than ``max_resident`` namespaces are held in RAM the
+    least recently used one is snapshotted to ``spill_dir`` and dropped; on its
+    next access a fresh adapter from ``factory`` is restored from the snapshot,
+    so the namespace keeps its configuration.  Snapshots are written and read
+    without holding the adapter-wide lock, so only callers of the namespace
+    being moved wait for it.  Memory ids are local to their namespace.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], MemoryAdapter] = FaissMemoryAdapter,
+        *,
+        quota: int | None = None,
+        quotas: Mapping[str, int] | None = None,
+        max_resident: int | None = None,
+        spill_dir: str | os.PathLike[str] | None = None,
+    ) -> None:
+        if max_resident is not None:
+            if max_resident <= 0:
+                raise ValueError("max_resident must be positive")
+            if spill_dir is None:
+                raise ValueError("max_resident requires a spill_dir for evicted namespaces")
+        self._factory = factory
+        self.quota = quota
+        self.quotas = dict(quotas or {})
+        self.max_resident = max_resident
+        self._spill_dir = Path(spill_dir) if spill_dir is not None else None
+        self._resident: "OrderedDict[str, MemoryAdapter]" = OrderedDict()
+        self._spilled: Set[str] = set()
+        # Namespaces whose snapshot is being written or read outside the lock.
+        self._moving: Set[str] = set()
+        self._pins: Counter[str] = Counter()
+        self._evictions = 0
+        self._lock = threading.Lock()
+        self._moved = threading.Condition(self._lock)
+
+    def namespaces(self) -> List[str]:
+        """Return every namespace holding memories, resident or spilled."""
+
+        with self._lock:
+            return sorted({*self._resident, *self._spilled, *self._moving})
+
+    def save(self, text: str, *, namespace: str = DEFAULT_NAMESPACE) -> int:
+        return self.save_many([text], namespace=namespace)[0]
+
+    def save_many(self, texts: Iterable[str], *, namespace: str = DEFAULT_NAMESPACE) -> List[int]:
+        batch = list(texts)
+        with self._use(namespace, create=True) as adapter:
+            quota = self._quota(namespace)
+            if quota is not None:
+                stored = adapter.stats().get("memories", 0)
+                if stored + len(batch) > quota:
+                    raise MemoryQuotaExceededError(
+                        f"Namespace {namespace!r} holds {stored} of {quota} memories;"
+                        f" cannot save {len(batch)} more"
+                    )
+            ids = adapter.save_many(batch)
+        self._bump_generation()
+        return ids
+
+    def retrieve(
+        self,
+        query: str,
+        top_k: int = 1,
+        *,
+        namespace: str = DEFAULT_NAMESPACE,
+        mmr_lambda: float | None = None,
+        fetch_k: int | None = None,
+    ) -> List[str]:
+        with self._use(namespace) as adapter:
+            if adapter is None:
+                return []
+            if mmr_lambda is None:
+                return adapter.retrieve(query, top_k)
+            return adapter.retrieve(query, top_k, mmr_lambda=mmr_lambda, fetch_k=fetch_k)
+
+    def retrieve_many(
+        self, queries: Sequence[str], top_k: int = 1, *, namespace: str = DEFAULT_NAMESPACE
+    ) -> List[List[str]]:
+        with self._use(namespace) as adapter:
+            if adapter is None:
+                return [[] for _ in queries]
+            return adapter.retrieve_many(queries, top_k)
+
+    def delete(self, memory_id: int, *, namespace: str = DEFAULT_NAMESPACE) -> bool:
+        with self._use(namespace) as adapter:
+            deleted = adapter.delete(memory_id) if adapter is not None else False
+        if deleted:
+            self._bump_generation()
+        return deleted
+
+    def upsert(self, memory_id: int, text: str, *, namespace: str = DEFAULT_NAMESPACE) -> None:
+        with self._use(namespace, create=True) as adapter:
+            adapter.upsert(memory_id, text)
+            self._bump_generation()
+            quota = self._quota(namespace)
+            if quota is not None and adapter.stats().get("memories", 0) > quota:
+                # Only an insert can grow the namespace, so undoing it restores the old state.
+                adapter.delete(memory_id)
+                raise MemoryQuotaExceededError(
+                    f"Namespace {namespace!r} already holds its quota of {quota} memories"
+                )
+
+    def compact(self, *, namespace: str | None = None) -> None:
+        """Compact ``namespace``, or every resident namespace when omitted."""
+
+        if namespace is not None:
+            with self._use(namespace) as adapter:
+                if adapter is not None:
+                    adapter.compact()
+            return
+        with self._lock:
+            adapters = list(self._resident.values())
+        for adapter in adapters:
+            adapter.compact()
+
+    def drop_namespace(self, namespace: str) -> bool:
+        """Discard every memory of ``namespace``, including its spilled snapshot."""
+
+        with self._lock:
+            self._moved.wait_for(lambda: namespace not in self._moving)
+            if self._pins[namespace]:
+                raise RuntimeError(f"Namespace {namespace!r} is in use")
+            adapter = self._resident.pop(namespace, None)
+            spilled = namespace in self._spilled
+            self._spilled.discard(namespace)
+            if spilled:
+                self._remove_spill(namespace)
+            self.generation += 1
+        if adapter is not None:
+            _close(adapter)
+        return adapter is not None or spilled
+
+    def stats(self, *, namespace: str | None = None) -> Dict[str, Any]:
+        """Return adapter metrics for ``namespace`` or residency metrics overall."""
+
+        if namespace is not None:
+            with self._use(namespace) as adapter:
+                return adapter.stats() if adapter is not None else {}
+        with self._lock:
+            return {
+                "namespaces": len(self._resident) + len(self._spilled) + len(self._moving),
+                "resident": len(self._resident),
+                "spilled": len(self._spilled) + len(self._moving),
+                "evictions": self._evictions,
+            }
+
+    def _bump_generation(self) -> None:
+        with self._lock:
+            self.generation += 1
+
+    def _quota(self, namespace: str) -> int | None:
+        return self.quotas.get(namespace, self.quota)
+
+    @contextmanager
+    def _use(self, namespace: str, *, create: bool = False) -> Iterator[MemoryAdapter | None]:
+        """Pin the adapter of ``namespace`` in RAM for the duration of the block."""
+
+        _check_namespace(namespace)
+        reload = False
+        with self._lock:
+            self._moved.wait_for(lambda: namespace not in self._moving)
+            adapter = self._resident.get(namespace)
+            if adapter is not None:
+                self._resident.move_to_end(namespace)
+            elif namespace in self._spilled:
+                self._spilled.remove(namespace)
+                self._moving.add(namespace)
+                reload = True
+            elif create:
+                adapter = self._factory()
+                self._resident[namespace] = adapter
+            if adapter is not None or reload:
+                self._pins[namespace] += 1
+            victims = self._evict()
+        try:
+            try:
+                if reload:
+                    adapter = self._reload(namespace)
+            finally:
+                self._spill(victims)
+            yield adapter
+        finally:
+            if adapter is not None or reload:
+                with self._lock:
+                    self._pins[namespace] -= 1
+                    if not self._pins[namespace]:
+                        del self._pins[namespace]
+                    victims = self._evict()
+                self._spill(victims)
+
+    def _reload(self, namespace: str) -> MemoryAdapter:
+        try:
+            adapter = self._factory()
+            adapter.restore(self._spill_path(namespace))
+        except BaseException:
+            with self._lock:
+                self._moving.discard(namespace)
+                self._spilled.add(namespace)
+                self._moved.notify_all()
+            raise
+        self._remove_spill(namespace)
+        with self._lock:
+            self._moving.discard(namespace)
+            self._resident[namespace] = adapter
+            self._moved.notify_all()
+            victims = self._evict()
+        self._spill(victims)
+        return adapter
+
+    def _evict(self) -> List[Tuple[str, MemoryAdapter]]:
+        """Pick the namespaces to spill; the caller holds the lock and calls :meth:`_spill`."""
+
+        # Pinned namespaces are skipped, so residency may briefly exceed the limit.
+        victims: List[Tuple[str, MemoryAdapter]] = []
+        if self.max_resident is None:
+            return victims
+        for namespace in list(self._resident):
+            if len(self._resident) <= self.max_resident:
+                break
+            if self._pins[namespace]:
+                continue
+            victims.append((namespace, self._resident.pop(namespace)))
+            self._moving.add(namespace)
+        return victims
+
+    def _spill(self, victims: List[Tuple[str, MemoryAdapter]]) -> None:
+        for position, (namespace, adapter) in enumerate(victims):
+            try:
+                adapter.snapshot(self._spill_path(namespace))
+            except BaseException:
+                # Keep the unsaved namespaces in RAM.
+                with self._lock:
+                    for name, kept in victims[position:]:
+                        self._moving.discard(name)
+                        self._resident[name] = kept
+                    self._moved.notify_all()
+                raise
+            _close(adapter)
+            with self._lock:
+                self._moving.discard(namespace)
+                self._spilled.add(namespace)
+                self._evictions += 1
+                self._moved.notify_all()
+
+    def _spill_path(self, namespace: str) -> Path:
+        return self._spill_dir / namespace
+
+    def _remove_spill(self, namespace: str) -> None:
+        path = self._spill_path(namespace)
+        if path.is_dir():
+            shutil.rmtree(path)
+        else:
+            path.unlink(missing_ok=True)
+
+
+def _check_namespace(namespace: str) -> None:
+    # Namespaces double as spill file names, so keep them path-safe.
+    if not isinstance(namespace, str) or not _NAMESPACE_RE.fullmatch(namespace):
+        raise ValueError(f"Invalid memory namespace: {namespace!r}")
+
+
+def _close(adapter: MemoryAdapter) -> None:
+    close = getattr(adapter, "close", None)
+    if close is not None:
+        close()
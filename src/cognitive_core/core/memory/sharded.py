@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+"""Memory store partitioned across worker processes."""
+
+from collections import defaultdict
+import heapq
+from itertools import islice
+import multiprocessing
+import os
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple
+import weakref
+
+from .base import MemoryAdapter
+from .faiss_adapter import FaissMemoryAdapter, _embed
+from .mmr import check_mmr_options, mmr_select
+
+
+Hit = Tuple[float, int, str]
+
+
+class ShardedMemoryAdapter(MemoryAdapter):
+    """Partition memories across ``shards`` worker processes.
+
+    Every shard is a dedicated process holding its own adapter created by
+    ``factory``, which must return a :class:`FaissMemoryAdapter`.  Memory ``i``
+    lives on shard ``i % shards``, so saves, deletions and updates touch a
+    single shard while :meth:`retrieve` sends the query to every shard at once
+    and merges the per-shard top-k lists with a heap, breaking score ties by
+    memory id.  The shards tokenise and score in parallel, so retrieval
+    latency on a large store falls with the number of cores.  Scores are
+    comparable across shards for cosine ranking; with ``ranking="bm25"`` each
+    shard uses its own collection statistics.
+
+    ``mp_context`` selects the :mod:`multiprocessing` start method; with
+    ``"spawn"`` the ``factory`` must be picklable.  Call :meth:`close` (or use
+    the adapter as a context manager) to stop the workers.
+    """
+
+    def __init__(
+        self,
+        shards: int | None = None,
+        *,
+        factory: Callable[[], FaissMemoryAdapter] = FaissMemoryAdapter,
+        mp_context: Any = None,
+    ) -> None:
+        if shards is None:
+            shards = os.cpu_count() or 1
+        if shards <= 0:
+            raise ValueError("shards must be positive")
+        if mp_context is None or isinstance(mp_context, str):
+            mp_context = multiprocessing.get_context(mp_context)
+        self.shards = shards
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self._conns = []
+        processes = []
+        for shard in range(shards):
+            parent, child = mp_context.Pipe()
+            process = mp_context.Process(
+                target=_serve, args=(child, factory), name=f"memory-shard-{shard}", daemon=True
+            )
+            process.start()
+            child.close()
+            self._conns.append(parent)
+            processes.append(process)
+        self._finalizer = weakref.finalize(self, _shutdown, self._conns, processes)
+        try:
+            self._collect(range(shards))
+        except BaseException:
+            self.close()
+            raise
+
+    def __enter__(self) -> "ShardedMemoryAdapter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stop the shard processes."""
+
+        with self._lock:
+            self._finalizer()
+
+    def save(self, text: str) -> int:
+        return self.save_many([text])[0]
+
+    def save_many(self, texts: Iterable[str]) -> List[int]:
+        batch = list(texts)
+        with self._lock:
+            ids = list(range(self._next_id, self._next_id + len(batch)))
+            self._next_id += len(batch)
+            per_shard: Dict[int, Tuple[List[int], List[str]]] = defaultdict(lambda: ([], []))
+            for memory_id, text in zip(ids, batch):
+                local_ids, local_texts = per_shard[memory_id % self.shards]
+                local_ids.append(memory_id // self.shards)
+                local_texts.append(text)
+            self._call({shard: ("save", args) for shard, args in per_shard.items()})
+            self.generation += 1
+        return ids
+
+    def delete(self, memory_id: int) -> bool:
+        if memory_id < 0:
+            return False
+        shard, local_id = self._locate(memory_id)
+        with self._lock:
+            deleted = self._call({shard: ("delete", (local_id,))})[shard]
+            if deleted:
+                self.generation += 1
+        return deleted
+
+    def upsert(self, memory_id: int, text: str) -> None:
+        if memory_id < 0:
+            raise ValueError("memory_id must not be negative")
+        shard, local_id = self._locate(memory_id)
+        with self._lock:
+            self._call({shard: ("upsert", (local_id, text))})
+            self._next_id = max(self._next_id, memory_id + 1)
+            self.generation += 1
+
+    def compact(self) -> None:
+        with self._lock:
+            self._call({shard: ("compact", ()) for shard in range(self.shards)})
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            per_shard = self._call({shard: ("stats", ()) for shard in range(self.shards)})
+        totals = {
+            key: sum(stats[key] for stats in per_shard.values())
+            for key in ("memories", "slots", "tombstones", "compactions")
+        }
+        totals["tombstone_ratio"] = totals["tombstones"] / totals["slots"] if totals["slots"] else 0.0
+        totals["shards"] = self.shards
+        return totals
+
+    def retrieve(
+        self,
+        query: str,
+        top_k: int = 1,
+        *,
+        mmr_lambda: float | None = None,
+        fetch_k: int | None = None,
+    ) -> List[str]:
+        if top_k <= 0:
+            return []
+
+        pool = top_k if mmr_lambda is None else check_mmr_options(top_k, mmr_lambda, fetch_k)
+        texts = self._search([query], pool)[0]
+        if mmr_lambda is None:
+            return texts
+        picked = mmr_select(_embed(query), [_embed(text) for text in texts], top_k, mmr_lambda)
+        return [texts[position] for position in picked]
+
+    def retrieve_many(self, queries: Sequence[str], top_k: int = 1) -> List[List[str]]:
+        if top_k <= 0:
+            return [[] for _ in queries]
+        return self._search(list(queries), top_k)
+
+    def _search(self, queries: List[str], top_k: int) -> List[List[str]]:
+        with self._lock:
+            per_shard = self._call(
+                {shard: ("search", (queries, top_k)) for shard in range(self.shards)}
+            )
+        results = []
+        for position in range(len(queries)):
+            ranked = [
+                sorted(
+                    (-score, local_id * self.shards + shard, text)
+                    for score, local_id, text in hits[position]
+                )
+                for shard, hits in per_shard.items()
+            ]
+            # Every shard list is sorted by (-score, memory id); a heap merge of
+            # the lists yields the global ranking with ties in id order.
+            merged = islice(heapq.merge(*ranked), top_k)
+            results.append([text for _, _, text in merged])
+        return results
+
+    def _locate(self, memory_id: int) -> Tuple[int, int]:
+        """Return the ``(shard, local_id)`` holding ``memory_id``."""
+
+        local_id, shard = divmod(memory_id, self.shards)
+        return shard, local_id
+
+    def _call(self, requests: Dict[int, Tuple[str, tuple]]) -> Dict[int, Any]:
+        """Send ``requests`` to their shards, then collect every reply."""
+
+        if not self._finalizer.alive:
+            raise RuntimeError("ShardedMemoryAdapter is closed")
+        for shard, request in requests.items():
+            self._conns[shard].send(request)
+        return self._collect(requests)
+
+    def _collect(self, shards: Iterable[int]) -> Dict[int, Any]:
+        # Every reply is read before raising so the pipes stay in step.
+        replies = {shard: self._conns[shard].recv() for shard in shards}
+        for error, _ in replies.values():
+            if error is not None:
+                raise error
+        return {shard: result for shard, (_, result) in replies.items()}
+
+
+def _serve(conn: Any, factory: Callable[[], FaissMemoryAdapter]) -> None:
+    # The first reply reports whether the shard's adapter could be created.
+    try:
+        adapter = factory()
+    except Exception as exc:  # pragma: no cover - exercised in the worker
+        conn.send((exc, None))
+        conn.close()
+        return
+    conn.send((None, None))
+
+    def save(local_ids: List[int], texts: List[str]) -> None:
+        for local_id, text in zip(local_ids, texts):
+            adapter.upsert(local_id, text)
+
+    def search(queries: List[str], top_k: int) -> List[List[Hit]]:
+        return adapter._search_many([_embed(query) for query in queries], top_k)
+
+    handlers = {
+        "save": save,
+        "search": search,
+        "delete": adapter.delete,
+        "upsert": adapter.upsert,
+        "compact": adapter.compact,
+        "stats": adapter.stats,
+    }
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            break
+        if request is None:
+            break
+        method, args = request
+        try:
+            conn.send((None, handlers[method](*args)))
+        except Exception as exc:  # pragma: no cover - exercised in the worker
+            conn.send((exc, None))
+    conn.close()
+
+
+def _shutdown(conns: List[Any], processes: List[Any]) -> None:
+    for conn in conns:
+        try:
+            conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        conn.close()
+    for process in processes:
+        process.join(timeout=5)
+        if process.is_alive():
+            process.terminate()
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+"""Columnar on-disk snapshots for in-memory adapter stores.
+
+A snapshot is a directory holding ``meta.json``, the memory texts as one
+UTF-8 blob with an offsets table, and the index state as ``.npy`` arrays.
+Loading with ``mmap=True`` maps every array read-only so worker processes
+share the pages through the OS page cache instead of re-tokenising the
+corpus at start-up.
+"""
+
+import json
+import os
+from pathlib import Path
+import shutil
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+try:  # pragma: no cover - optional dependency
+    import numpy as np
+except Exception:  # pragma: no cover - fallback when numpy missing
+    np = None
+
+
+FORMAT_VERSION = 1
+
+_META = "meta.json"
+_TEXTS = "texts.bin"
+_TEXT_OFFSETS = "text_offsets.npy"
+
+
+def require_numpy() -> None:
+    if np is None:
+        raise RuntimeError("numpy is not installed. Install 'numpy' to use memory snapshots.")
+
+
+class MappedTexts:
+    """Sequence of memory texts backed by a (possibly mapped) UTF-8 blob.
+
+    Texts present in the snapshot are decoded on access; texts appended after
+    loading are kept in a regular list.
+    """
+
+    def __init__(self, blob: Any, offsets: "np.ndarray") -> None:
+        self._blob = blob
+        self._offsets = offsets
+        self._base = len(offsets) - 1
+        self._extra: List[str] = []
+
+    def __len__(self) -> int:
+        return self._base + len(self._extra)
+
+    def __getitem__(self, index: int) -> str:
+        if index < 0:
+            index += len(self)
+        if index < self._base:
+            start, end = int(self._offsets[index]), int(self._offsets[index + 1])
+            return bytes(self._blob[start:end]).decode("utf-8")
+        return self._extra[index - self._base]
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def append(self, text: str) -> None:
+        self._extra.append(text)
+
+    def extend(self, texts: Iterable[str]) -> None:
+        self._extra.extend(texts)
+
+
+def write_snapshot(
+    path: str | os.PathLike[str],
+    meta: Dict[str, Any],
+    arrays: Dict[str, "np.ndarray"],
+    texts: Sequence[str],
+) -> None:
+    """Atomically write a snapshot directory at ``path``."""
+
+    require_numpy()
+    target = Path(path)
+    staging = target.with_name(target.name + ".tmp")
+    if staging.exists():
+        shutil.rmtree(staging)
+    staging.mkdir(parents=True)
+
+    offsets = np.zeros(len(texts) + 1, dtype=np.int64)
+    with open(staging / _TEXTS, "wb") as blob:
+        for position, text in enumerate(texts):
+            encoded = text.encode("utf-8")
+            blob.write(encoded)
+            offsets[position + 1] = offsets[position] + len(encoded)
+    np.save(staging / _TEXT_OFFSETS, offsets)
+    for name, array in arrays.items():
+        np.save(staging / f"{name}.npy", np.ascontiguousarray(array))
+    document = {"format": FORMAT_VERSION, "arrays": sorted(arrays), **meta}
+    (staging / _META).write_text(json.dumps(document), encoding="utf-8")
+
+    if target.exists():
+        shutil.rmtree(target)
+    staging.rename(target)
+
+
+def read_snapshot(
+    path: str | os.PathLike[str], *, mmap: bool = True
+) -> Tuple[Dict[str, Any], Dict[str, "np.ndarray"], MappedTexts]:
+    """Read a snapshot written by :func:`write_snapshot`."""
+
+    require_numpy()
+    source = Path(path)
+    meta = json.loads((source / _META).read_text(encoding="utf-8"))
+    if meta.get("format") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported memory snapshot format: {meta.get('format')!r}")
+
+    mmap_mode = "r" if mmap else None
+    arrays = {name: np.load(source / f"{name}.npy", mmap_mode=mmap_mode) for name in meta["arrays"]}
+    offsets = np.load(source / _TEXT_OFFSETS, mmap_mode=mmap_mode)
+    blob_path = source / _TEXTS
+    if mmap and blob_path.stat().st_size:
+        blob: Any = np.memmap(blob_path, dtype=np.uint8, mode="r")
+    else:
+        blob = blob_path.read_bytes()
+    return meta, arrays, MappedTexts(blob, offsets)
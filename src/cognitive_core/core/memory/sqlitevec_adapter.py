@@ -1,18 +1,126 @@
 from __future__ import annotations
 
-"""Simplified SQLiteVec adapter used for tests."""
+"""SQLite-backed memory adapter with an on-disk inverted index."""
 
 from collections import Counter
-import heapq
+import json
 import math
+import os
+from pathlib import Path
 import re
-from typing import List, Tuple
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Sequence
 
-from .base import MemoryAdapter
+from .base import RANKINGS, MemoryAdapter
+from .mmr import check_mmr_options, mmr_select
 
 
 _TOKEN_RE = re.compile(r"[a-z0-9]+")
 
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    text TEXT NOT NULL,
+    norm REAL NOT NULL,
+    length INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS postings (
+    token TEXT NOT NULL,
+    doc_id INTEGER NOT NULL REFERENCES documents(id),
+    weight INTEGER NOT NULL,
+    PRIMARY KEY (token, doc_id)
+) WITHOUT ROWID;
+"""
+
+_INSERT_DOCUMENT = "INSERT INTO documents (text, norm, length) VALUES (?, ?, ?)"
+_UPSERT_DOCUMENT = """
+INSERT INTO documents (id, text, norm, length) VALUES (?, ?, ?, ?)
+ON CONFLICT(id) DO UPDATE
+SET text = excluded.text, norm = excluded.norm, length = excluded.length
+"""
+
+# Databases created before BM25 support lack document lengths; derive them
+# once from the postings.
+_ADD_LENGTH_COLUMN = """
+ALTER TABLE documents ADD COLUMN length INTEGER NOT NULL DEFAULT 0;
+UPDATE documents SET length = t.total
+FROM (SELECT doc_id, SUM(weight) AS total FROM postings GROUP BY doc_id) AS t
+WHERE t.doc_id = documents.id;
+"""
+_DELETE_DOCUMENT = "DELETE FROM documents WHERE id = ?"
+_DELETE_POSTING = "DELETE FROM postings WHERE token = ? AND doc_id = ?"
+_INSERT_POSTING = "INSERT INTO postings (token, doc_id, weight) VALUES (?, ?, ?)"
+
+# Scores are computed entirely inside SQLite: the query embedding is passed as
+# a JSON object and joined against the postings of its own tokens only.
+_TOP_K = """
+SELECT d.id, d.text
+FROM json_each(?) AS q
+JOIN postings AS p ON p.token = q.key
+JOIN documents AS d ON d.id = p.doc_id
+GROUP BY d.id
+ORDER BY SUM(p.weight * q.value) / (? * d.norm) DESC, d.id ASC
+LIMIT ?
+"""
+
+# Batched variant: every query contributes ``[position, token, weight, norm]``
+# rows and a window function keeps the best ``top_k`` documents per query.
+_TOP_K_MANY = """
+WITH q AS (
+    SELECT
+        json_extract(value, '$[0]') AS position,
+        json_extract(value, '$[1]') AS token,
+        json_extract(value, '$[2]') AS weight,
+        json_extract(value, '$[3]') AS norm
+    FROM json_each(?)
+),
+scored AS (
+    SELECT
+        q.position AS position,
+        d.id AS doc_id,
+        ROW_NUMBER() OVER (
+            PARTITION BY q.position
+            ORDER BY SUM(p.weight * q.weight) / (MAX(q.norm) * d.norm) DESC, d.id ASC
+        ) AS rank
+    FROM q
+    JOIN postings AS p ON p.token = q.token
+    JOIN documents AS d ON d.id = p.doc_id
+    GROUP BY q.position, d.id
+)
+SELECT s.position, d.id, d.text
+FROM scored AS s
+JOIN documents AS d ON d.id = s.doc_id
+WHERE s.rank <= ?
+ORDER BY s.position, s.rank
+"""
+
+# BM25: ``q.value`` carries the query term weight times IDF times (k1 + 1);
+# the two parameters are the length normalisation k1 * (1 - b) and k1 * b / avgdl.
+_BM25_TOP_K = """
+SELECT d.id, d.text
+FROM json_each(?) AS q
+JOIN postings AS p ON p.token = q.key
+JOIN documents AS d ON d.id = p.doc_id
+GROUP BY d.id
+ORDER BY SUM(q.value * p.weight / (p.weight + ? + ? * d.length)) DESC, d.id ASC
+LIMIT ?
+"""
+
+_DOCUMENT_FREQUENCIES = """
+SELECT q.value, COUNT(*)
+FROM json_each(?) AS q
+JOIN postings AS p ON p.token = q.value
+GROUP BY q.value
+"""
+
+_PADDING = """
+SELECT id, text FROM documents
+WHERE id NOT IN (SELECT value FROM json_each(?))
+ORDER BY id
+LIMIT ?
+"""
+
 
 def _embed(text: str) -> Counter[str]:
     """Create a naive bag-of-words embedding."""
@@ -21,34 +129,331 @@ def _embed(text: str) -> Counter[str]:
     return Counter(tokens)
 
 
-def _cosine(a: Counter[str], b: Counter[str]) -> float:
-    """Compute cosine similarity between two bag-of-words vectors."""
-    intersection = set(a) & set(b)
-    dot = sum(a[token] * b[token] for token in intersection)
-    norm_a = math.sqrt(sum(v * v for v in a.values()))
-    norm_b = math.sqrt(sum(v * v for v in b.values()))
-    if norm_a == 0 or norm_b == 0:
-        return 0.0
-    return dot / (norm_a * norm_b)
+def _prepare(embedding: Counter[str]) -> tuple[float, int, Counter[str]]:
+    norm = math.sqrt(sum(v * v for v in embedding.values()))
+    return norm, sum(embedding.values()), embedding
 
 
 class SQLiteVecMemoryAdapter(MemoryAdapter):
-    """In-memory implementation mimicking a SQLiteVec vector store."""
+    """Memory store persisted in a SQLite database.
 
-    def __init__(self) -> None:
-        self._store: List[Tuple[Counter[str], str]] = []
+    Documents and their token postings live in two tables, with document norms
+    precomputed at save time so ``retrieve`` runs the top-k cosine ranking as a
+    single SQL query over the postings of the query tokens.  File-backed
+    databases use WAL journaling so several worker processes can share one
+    memory file.  The default ``":memory:"`` path keeps the store private to
+    the adapter instance.  ``read_only=True`` opens an existing file as an
+    immutable database and ``mmap_size`` enables memory-mapped I/O.
+    ``ranking="bm25"`` ranks with Okapi BM25 (parameters ``k1`` and ``b``)
+    instead of cosine similarity.
 
-    def save(self, text: str) -> None:
-        self._store.append((_embed(text), text))
+    Deleting or replacing memories frees database pages; once the share of
+    free pages reaches ``compaction_threshold`` the database is vacuumed on a
+    background thread.  Pass ``None`` to only compact on explicit
+    :meth:`compact` calls.
+    """
 
-    def retrieve(self, query: str, top_k: int = 1) -> List[str]:
-        query_emb = _embed(query)
-        if not self._store or top_k <= 0:
-            return []
+    def __init__(
+        self,
+        path: str | os.PathLike[str] = ":memory:",
+        *,
+        timeout: float = 30.0,
+        read_only: bool = False,
+        mmap_size: int | None = None,
+        ranking: str = "cosine",
+        k1: float = 1.2,
+        b: float = 0.75,
+        compaction_threshold: float | None = 0.25,
+    ) -> None:
+        if ranking not in RANKINGS:
+            raise ValueError(f"Unknown ranking {ranking!r}; expected one of {RANKINGS}")
+        self.path = os.fspath(path)
+        self.ranking = ranking
+        self.k1 = k1
+        self.b = b
+        self._collection: tuple[int, int, int] | None = None
+        self.compaction_threshold = compaction_threshold
+        self._lock = threading.Lock()
+        self._compactions = 0
+        self._writes = 0
+        self._compaction_thread: threading.Thread | None = None
+        if read_only:
+            # An immutable, read-only connection needs no locking or journal files.
+            uri = f"{Path(self.path).resolve().as_uri()}?mode=ro&immutable=1"
+            self._conn = sqlite3.connect(uri, uri=True, timeout=timeout, check_same_thread=False)
+        else:
+            self._conn = sqlite3.connect(self.path, timeout=timeout, check_same_thread=False)
+        if mmap_size is not None:
+            self._conn.execute(f"PRAGMA mmap_size={int(mmap_size)}")
+        if read_only:
+            return
+        if self.path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.executescript(_SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(documents)")}
+        if "length" not in columns:
+            with self._conn:
+                self._conn.executescript(_ADD_LENGTH_COLUMN)
+
+    def snapshot(self, path: str | os.PathLike[str]) -> None:
+        """Write a consistent, self-contained copy of the database to ``path``."""
+
+        target = Path(path)
+        staging = target.with_name(target.name + ".tmp")
+        staging.unlink(missing_ok=True)
+        dest = sqlite3.connect(staging)
+        try:
+            with self._lock:
+                self._conn.backup(dest)
+            # Rollback journaling lets readers open the copy without -wal/-shm files.
+            dest.execute("PRAGMA journal_mode=DELETE")
+        finally:
+            dest.close()
+        os.replace(staging, target)
+
+    @classmethod
+    def load(
+        cls, path: str | os.PathLike[str], *, mmap: bool = True, mmap_size: int = 1 << 30
+    ) -> "SQLiteVecMemoryAdapter":
+        """Open a snapshot written by :meth:`snapshot`.
+
+        With ``mmap=True`` the snapshot is opened read-only and immutable with
+        memory-mapped I/O, so concurrent workers share its pages and further
+        :meth:`save` calls fail.  With ``mmap=False`` the snapshot is copied into
+        a private, writable in-memory database.
+        """
+
+        source = Path(path)
+        if not source.is_file():
+            raise FileNotFoundError(f"Memory snapshot not found: {source}")
+        if mmap:
+            return cls(source, read_only=True, mmap_size=mmap_size)
+
+        adapter = cls()
+        adapter.restore(source)
+        return adapter
+
+    def restore(self, path: str | os.PathLike[str]) -> None:
+        source = Path(path)
+        if not source.is_file():
+            raise FileNotFoundError(f"Memory snapshot not found: {source}")
+        src = sqlite3.connect(source)
+        try:
+            with self._lock:
+                src.backup(self._conn)
+                self._collection = None
+                self._writes += 1
+        finally:
+            src.close()
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+
+        if self._compaction_thread is not None:
+            self._compaction_thread.join()
+        with self._lock:
+            self._conn.close()
+
+    def save(self, text: str) -> int:
+        return self.save_many([text])[0]
+
+    def save_many(self, texts: Iterable[str]) -> List[int]:
+        batch = list(texts)
+        return self.save_tokenized(batch, [_embed(text) for text in batch])
+
+    def save_tokenized(
+        self, texts: Sequence[str], embeddings: Sequence[Counter[str]]
+    ) -> List[int]:
+        prepared = [(text, *_prepare(embedding)) for text, embedding in zip(texts, embeddings)]
+
+        with self._lock, self._conn:
+            ids = []
+            postings = []
+            for text, norm, length, embedding in prepared:
+                doc_id = self._conn.execute(_INSERT_DOCUMENT, (text, norm, length)).lastrowid
+                ids.append(doc_id)
+                postings.extend((token, doc_id, weight) for token, weight in embedding.items())
+            self._conn.executemany(_INSERT_POSTING, postings)
+            self._writes += 1
+        return ids
 
-        scored = (
-            (_cosine(query_emb, embedding), text)
-            for embedding, text in self._store
+    def delete(self, memory_id: int) -> bool:
+        with self._lock:
+            with self._conn:
+                if not self._remove_postings(memory_id):
+                    return False
+                self._conn.execute(_DELETE_DOCUMENT, (memory_id,))
+                self._writes += 1
+            self._maybe_schedule_compaction()
+        return True
+
+    def upsert(self, memory_id: int, text: str) -> None:
+        norm, length, embedding = _prepare(_embed(text))
+        with self._lock:
+            with self._conn:
+                self._remove_postings(memory_id)
+                self._conn.execute(_UPSERT_DOCUMENT, (memory_id, text, norm, length))
+                self._conn.executemany(
+                    _INSERT_POSTING,
+                    [(token, memory_id, weight) for token, weight in embedding.items()],
+                )
+                self._writes += 1
+            self._maybe_schedule_compaction()
+
+    def _remove_postings(self, memory_id: int) -> bool:
+        row = self._conn.execute("SELECT text FROM documents WHERE id = ?", (memory_id,)).fetchone()
+        if row is None:
+            return False
+        self._conn.executemany(
+            _DELETE_POSTING, [(token, memory_id) for token in _embed(row[0])]
+        )
+        return True
+
+    @property
+    def generation(self) -> int:
+        """Local write count plus SQLite's ``data_version``.
+
+        ``data_version`` advances when another connection commits, so writes
+        by other processes sharing the database file also bump the generation.
+        """
+
+        with self._lock:
+            return self._writes + self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            documents = self._conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+            postings = self._conn.execute("SELECT COUNT(*) FROM postings").fetchone()[0]
+            pages, free_pages = self._page_counts()
+        return {
+            "memories": documents,
+            "postings": postings,
+            "pages": pages,
+            "free_pages": free_pages,
+            "free_page_ratio": free_pages / pages if pages else 0.0,
+            "compactions": self._compactions,
+        }
+
+    def compact(self) -> None:
+        """Rebuild the database file without the pages freed by deletions."""
+
+        with self._lock:
+            self._conn.execute("VACUUM")
+            self._compactions += 1
+
+    def _page_counts(self) -> tuple[int, int]:
+        pages = self._conn.execute("PRAGMA page_count").fetchone()[0]
+        free_pages = self._conn.execute("PRAGMA freelist_count").fetchone()[0]
+        return pages, free_pages
+
+    def _maybe_schedule_compaction(self) -> None:
+        if self.compaction_threshold is None:
+            return
+        pages, free_pages = self._page_counts()
+        if not pages or free_pages / pages < self.compaction_threshold:
+            return
+        if self._compaction_thread is not None and self._compaction_thread.is_alive():
+            return
+        self._compaction_thread = threading.Thread(
+            target=self.compact, name="memory-compaction", daemon=True
         )
-        top_results = heapq.nlargest(top_k, scored, key=lambda item: item[0])
-        return [text for _, text in top_results]
+        self._compaction_thread.start()
+
+    def retrieve(
+        self,
+        query: str,
+        top_k: int = 1,
+        *,
+        mmr_lambda: float | None = None,
+        fetch_k: int | None = None,
+    ) -> List[str]:
+        if top_k <= 0:
+            return []
+
+        query_emb = _embed(query)
+        pool = top_k if mmr_lambda is None else check_mmr_options(top_k, mmr_lambda, fetch_k)
+        if self.ranking == "bm25":
+            texts = self._retrieve_bm25(query_emb, pool)
+        else:
+            texts = self._retrieve_cosine(query_emb, pool)
+        if mmr_lambda is None:
+            return texts
+        picked = mmr_select(query_emb, [_embed(text) for text in texts], top_k, mmr_lambda)
+        return [texts[position] for position in picked]
+
+    def _retrieve_cosine(self, query_emb: Counter[str], top_k: int) -> List[str]:
+        query_norm = math.sqrt(sum(v * v for v in query_emb.values()))
+        with self._lock:
+            rows = []
+            if query_emb:
+                rows = self._conn.execute(
+                    _TOP_K, (json.dumps(query_emb), query_norm, top_k)
+                ).fetchall()
+            self._pad(rows, top_k)
+        return [text for _, text in rows]
+
+    def retrieve_many(self, queries: Sequence[str], top_k: int = 1) -> List[List[str]]:
+        if top_k <= 0:
+            return [[] for _ in queries]
+        if self.ranking == "bm25":
+            return super().retrieve_many(queries, top_k)
+
+        terms = []
+        for position, query in enumerate(queries):
+            query_emb = _embed(query)
+            query_norm = math.sqrt(sum(v * v for v in query_emb.values()))
+            terms.extend([position, token, weight, query_norm] for token, weight in query_emb.items())
+
+        rows: List[list] = [[] for _ in queries]
+        with self._lock:
+            if terms:
+                for position, doc_id, text in self._conn.execute(
+                    _TOP_K_MANY, (json.dumps(terms), top_k)
+                ):
+                    rows[position].append((doc_id, text))
+            for ranked in rows:
+                self._pad(ranked, top_k)
+        return [[text for _, text in ranked] for ranked in rows]
+
+    def _retrieve_bm25(self, query_emb: Counter[str], top_k: int) -> List[str]:
+        with self._lock:
+            count, total_length = self._collection_stats()
+            rows = []
+            if query_emb and count:
+                frequencies = self._conn.execute(
+                    _DOCUMENT_FREQUENCIES, (json.dumps(list(query_emb)),)
+                ).fetchall()
+                weights = {
+                    token: query_emb[token]
+                    * math.log(1.0 + (count - df + 0.5) / (df + 0.5))
+                    * (self.k1 + 1.0)
+                    for token, df in frequencies
+                }
+                if weights:
+                    norm_a = self.k1 * (1.0 - self.b)
+                    norm_b = self.k1 * self.b * count / total_length if total_length else 0.0
+                    rows = self._conn.execute(
+                        _BM25_TOP_K, (json.dumps(weights), norm_a, norm_b, top_k)
+                    ).fetchall()
+            self._pad(rows, top_k)
+        return [text for _, text in rows]
+
+    def _collection_stats(self) -> tuple[int, int]:
+        # Counting documents scans the table, so the result is cached until
+        # this or another connection writes to the database.
+        generation = self._writes + self._conn.execute("PRAGMA data_version").fetchone()[0]
+        if self._collection is None or self._collection[0] != generation:
+            count, total_length = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(length), 0) FROM documents"
+            ).fetchone()
+            self._collection = (generation, count, total_length)
+        return self._collection[1], self._collection[2]
+
+    def _pad(self, rows: list, top_k: int) -> None:
+        # Documents sharing no token with the query score zero and are
+        # returned in insertion order, as an exhaustive scan would.
+        if len(rows) < top_k:
+            seen = json.dumps([doc_id for doc_id, _ in rows])
+            rows.extend(self._conn.execute(_PADDING, (seen, top_k - len(rows))).fetchall())
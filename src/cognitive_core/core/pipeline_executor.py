@@ -1,55 +1,800 @@
 from __future__ import annotations
 
 import asyncio
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+import contextlib
+import functools
 import inspect
-from time import time
+import os
+import threading
+from time import monotonic, time
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Mapping, Set, Tuple
 from uuid import uuid4
 
-from ..domain.pipelines import Artifact, Event, Pipeline, Run
+from ..domain.pipelines import Artifact, Event, Pipeline, Run, Task
+from ..pipelines import registry as pipeline_registry
+from .checkpoint import FileCheckpointStore
+from .concurrency import SharedSemaphore
+from .step_cache import StepCache
+from .streaming import SpooledStream, StreamChannel
+
+
+class PipelineTimeoutError(TimeoutError):
+    """Raised when a pipeline step or a whole run exceeds its deadline."""
 
 
 class PipelineExecutor:
-    """Executes pipelines synchronously or asynchronously."""
+    """Executes pipelines synchronously or asynchronously.
 
-    def execute(self, pipeline: Pipeline) -> Run:
-        run = Run(id=str(uuid4()), pipeline_id=pipeline.id, status="running")
+    Steps run in dependency order and receive the data of their upstream
+    artifacts as keyword arguments (see :class:`~cognitive_core.domain.pipelines.Task`).
+    :meth:`execute` runs one step at a time; :meth:`execute_async` starts
+    every step as soon as its dependencies have completed, so independent
+    steps overlap and the run takes as long as its critical path.
 
-        for step in pipeline.steps:
-            step_name = getattr(step, "__name__", "step")
-            run.events.append(Event(step=step_name, type="start", timestamp=time()))
-            artifact = step()
-            if inspect.isawaitable(artifact):
-                try:
-                    asyncio.get_running_loop()
-                except RuntimeError:
-                    artifact = asyncio.run(artifact)
-                else:
-                    raise RuntimeError(
-                        "PipelineExecutor.execute cannot run awaitable steps while an "
-                        "event loop is running; use execute_async instead."
-                    )
-            if not isinstance(artifact, Artifact):
-                artifact = Artifact(name=step_name, data=artifact)
-            run.artifacts.append(artifact)
-            run.events.append(Event(step=step_name, type="end", timestamp=time()))
+    :meth:`execute_async` honours each task's ``execution`` hint: synchronous
+    steps marked ``"thread"`` or ``"process"`` run on a thread pool of
+    ``max_threads`` workers or a process pool of ``max_processes`` workers,
+    both created on first use and released by :meth:`shutdown`.  With
+    ``offload_sync_steps``, synchronous ``"inline"`` steps run on the thread
+    pool too, so a server sharing the loop stays responsive and such steps of
+    concurrent runs overlap.  :meth:`execute` runs every step inline, except that coroutine and async
+    generator steps are driven by one event loop on a background thread that
+    lives as long as the executor, so clients and connection pools a step
+    binds to the loop can be reused by later steps and runs.  The loop is
+    started on first use and stopped by :meth:`shutdown`.
+
+    Concurrency in :meth:`execute_async` is bounded at three levels: the
+    ``max_concurrency`` argument of a run, the executor's own
+    ``max_concurrency`` shared by all of its runs, and ``resource_limits``,
+    which cap the steps of each :attr:`Task.resource` class across those runs.
+    A step holds its slots only while it runs, not while it waits for its
+    dependencies.  The executor-wide limits are :class:`SharedSemaphore`
+    instances, so they hold even for runs started on different event loops,
+    and :meth:`execute` takes the same slots for each step, blocking its
+    thread until they are free.
+
+    With a :class:`~cognitive_core.core.step_cache.StepCache`, both methods
+    look up every step by its identity and inputs before running it.  A hit
+    reuses the cached artifact and is recorded as a ``"cache_hit"`` event in
+    place of the step's ``"start"`` and ``"end"`` events.
+
+    With a :class:`~cognitive_core.core.checkpoint.FileCheckpointStore`,
+    every event and completed step is persisted as the run progresses, and
+    :meth:`resume` (or :meth:`resume_async`) continues an interrupted or
+    failed run from its last completed steps.
+
+    Generator steps stream their artifact into a
+    :class:`~cognitive_core.core.streaming.SpooledStream` that spills to
+    ``spill_directory`` once it exceeds ``spill_threshold`` bytes.  Under
+    :meth:`execute_async`, coroutine steps that depend on a generator step
+    start while it is still running and read its chunks as they arrive; a
+    reader more than ``stream_buffer`` chunks behind pauses the producer.
+
+    Every step is bounded by its :attr:`Task.timeout`, or ``step_timeout``
+    when it has none, and both methods accept a ``timeout`` for the whole
+    run; exceeding either raises :class:`PipelineTimeoutError` and records a
+    ``"timeout"`` event.  :meth:`execute_async` cancels the step and every
+    other step of the run; threads and processes a step offloaded run to
+    completion in the background and keep its slots until they finish.
+    :meth:`execute` cannot interrupt a synchronous step, so a step with a
+    deadline runs on the thread pool and is abandoned, still holding its
+    slots, if it overruns.  Cancelling the task awaiting
+    :meth:`execute_async` likewise cancels every step of the run.  A failed
+    run has status ``"failed"``, ``"timed_out"`` or ``"cancelled"``.
+
+    Idempotent steps with :attr:`Task.hedge_after` are started a second time
+    by :meth:`execute_async` if the first attempt is still running after that
+    many seconds; the first attempt to succeed wins and the other is
+    cancelled.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_threads: int | None = None,
+        max_processes: int | None = None,
+        max_concurrency: int | None = None,
+        resource_limits: Mapping[str, int] | None = None,
+        cache: StepCache | None = None,
+        checkpoints: FileCheckpointStore | None = None,
+        stream_buffer: int = 16,
+        spill_threshold: int = 1 << 20,
+        spill_directory: str | os.PathLike[str] | None = None,
+        step_timeout: float | None = None,
+        offload_sync_steps: bool = False,
+    ) -> None:
+        for name, value in (
+            ("max_threads", max_threads),
+            ("max_processes", max_processes),
+            ("max_concurrency", max_concurrency),
+            ("stream_buffer", stream_buffer),
+        ):
+            if value is not None and value <= 0:
+                raise ValueError(f"{name} must be positive")
+        self.max_threads = max_threads
+        self.max_processes = max_processes
+        self._slots = SharedSemaphore(max_concurrency) if max_concurrency is not None else None
+        self._resource_slots = {
+            resource: SharedSemaphore(limit) for resource, limit in (resource_limits or {}).items()
+        }
+        self.cache = cache
+        self.checkpoints = checkpoints
+        if spill_threshold < 0:
+            raise ValueError("spill_threshold must not be negative")
+        check_timeout("step_timeout", step_timeout)
+        self.step_timeout = step_timeout
+        self.offload_sync_steps = offload_sync_steps
+        self.stream_buffer = stream_buffer
+        self.spill_threshold = spill_threshold
+        self.spill_directory = spill_directory
+        self._pools: Dict[str, Executor] = {}
+        self._pools_lock = threading.Lock()
+        self._step_loop: Tuple[asyncio.AbstractEventLoop, threading.Thread] | None = None
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut down the pools and the step loop; they are recreated on demand."""
+
+        with self._pools_lock:
+            pools, self._pools = self._pools, {}
+            step_loop, self._step_loop = self._step_loop, None
+        for pool in pools.values():
+            pool.shutdown(wait=wait)
+        if step_loop is not None:
+            loop, thread = step_loop
+            loop.call_soon_threadsafe(loop.stop)
+            if wait:
+                thread.join()
+
+    def execute(
+        self,
+        pipeline: Pipeline,
+        *,
+        inputs: Mapping[str, Any] | None = None,
+        timeout: float | None = None,
+        run_id: str | None = None,
+    ) -> Run:
+        run = new_run(pipeline, inputs, run_id)
+        return self._execute(pipeline, run, {}, timeout)
+
+    def resume(
+        self, run_id: str, pipeline: Pipeline | None = None, *, timeout: float | None = None
+    ) -> Run:
+        """Continue the checkpointed run ``run_id``, skipping completed steps.
+
+        ``pipeline`` defaults to the registered pipeline the run was started
+        for.  Requires a checkpoint store.
+        """
+
+        pipeline, run, results = self._restore(run_id, pipeline)
+        return self._execute(pipeline, run, results, timeout)
+
+    def _execute(
+        self,
+        pipeline: Pipeline,
+        run: Run,
+        results: Dict[int, Artifact],
+        timeout: float | None,
+    ) -> Run:
+        check_timeout("timeout", timeout)
+        tasks = pipeline.tasks
+        dependencies = pipeline.dependencies()
+        deadline = monotonic() + timeout if timeout is not None else None
+        self._checkpoint_status(run)
+
+        def run_timed_out() -> PipelineTimeoutError:
+            return PipelineTimeoutError(
+                f"Run {run.id} of pipeline {pipeline.id!r} timed out after {timeout:.3g}s"
+            )
+
+        try:
+            for position in pipeline.topological_order():
+                if position in results:
+                    continue
+                task = tasks[position]
+                kwargs = step_kwargs(run, tasks, dependencies[position], results)
+                key = self._cache_key(task, kwargs)
+                cached = self._cached(run, task, key)
+                if cached is not None:
+                    self._complete(run, position, task, cached, results)
+                    continue
+                with contextlib.ExitStack() as slots:
+                    # Same order as execute_async, so sync and async runs cannot deadlock.
+                    for semaphore in (self._slots, self._resource_slots.get(task.resource)):
+                        if semaphore is None:
+                            continue
+                        wait = max(deadline - monotonic(), 0.0) if deadline is not None else None
+                        if not semaphore.acquire_blocking(wait):
+                            raise run_timed_out()
+                        slots.callback(semaphore.release)
+                    limit = task.timeout if task.timeout is not None else self.step_timeout
+                    if deadline is not None:
+                        remaining = deadline - monotonic()
+                        if remaining <= 0:
+                            # Do not start a step that has no time left.
+                            raise run_timed_out()
+                        limit = remaining if limit is None else min(limit, remaining)
+                    self._emit(run, Event(step=task.name, type="start", timestamp=time()))
+                    if limit is None:
+                        artifact = self._invoke(task, kwargs)
+                    else:
+                        handle = _LoopCall()
+                        future = self._pool("thread").submit(self._invoke, task, kwargs, handle)
+                        try:
+                            artifact = future.result(limit)
+                        except BaseException as exc:
+                            # Stop the step's coroutine on the shared loop too;
+                            # a synchronous step keeps its slots until it ends.
+                            future.cancel()
+                            handle.cancel()
+                            release_when_done(slots, {future})
+                            if not isinstance(exc, FutureTimeoutError):
+                                raise
+                            self._emit(
+                                run, Event(step=task.name, type="timeout", timestamp=time())
+                            )
+                            raise PipelineTimeoutError(
+                                f"Step {task.name!r} of run {run.id} timed out after {limit:.3g}s"
+                            ) from None
+                artifact = as_artifact(task, artifact)
+                if key is not None:
+                    self.cache.put(key, artifact)
+                self._complete(run, position, task, artifact, results)
+                self._emit(run, Event(step=task.name, type="end", timestamp=time()))
+        except BaseException as exc:
+            run.status = failure_status(exc)
+            self._checkpoint_status(run)
+            raise
 
         run.status = "completed"
+        self._checkpoint_status(run)
         return run
 
-    async def execute_async(self, pipeline: Pipeline) -> Run:
-        run = Run(id=str(uuid4()), pipeline_id=pipeline.id, status="running")
-
-        async def run_step(step: object) -> None:
-            step_name = getattr(step, "__name__", "step")
-            run.events.append(Event(step=step_name, type="start", timestamp=time()))
-            result = step()
-            if inspect.isawaitable(result):
-                result = await result
-            if not isinstance(result, Artifact):
-                result = Artifact(name=step_name, data=result)
-            run.artifacts.append(result)
-            run.events.append(Event(step=step_name, type="end", timestamp=time()))
-
-        await asyncio.gather(*(run_step(step) for step in pipeline.steps))
+    async def execute_async(
+        self,
+        pipeline: Pipeline,
+        *,
+        inputs: Mapping[str, Any] | None = None,
+        max_concurrency: int | None = None,
+        timeout: float | None = None,
+        run_id: str | None = None,
+    ) -> Run:
+        run = new_run(pipeline, inputs, run_id)
+        return await self._execute_async(pipeline, run, {}, max_concurrency, timeout)
+
+    async def resume_async(
+        self,
+        run_id: str,
+        pipeline: Pipeline | None = None,
+        *,
+        max_concurrency: int | None = None,
+        timeout: float | None = None,
+    ) -> Run:
+        """Asynchronous counterpart of :meth:`resume`."""
+
+        pipeline, run, results = self._restore(run_id, pipeline)
+        return await self._execute_async(pipeline, run, results, max_concurrency, timeout)
+
+    async def execute_many(
+        self,
+        batch: Iterable[Tuple[Pipeline, Mapping[str, Any] | None]],
+        *,
+        max_runs: int = 8,
+        max_concurrency: int | None = None,
+        timeout: float | None = None,
+    ) -> AsyncIterator[Tuple[int, Run | Exception]]:
+        """Run every ``(pipeline, inputs)`` pair of ``batch`` concurrently.
+
+        At most ``max_runs`` runs are in flight at once; ``max_concurrency``
+        and ``timeout`` apply to each of them as in :meth:`execute_async`.
+        Yields ``(index, run)`` as each run finishes, in completion order.  A
+        run that fails yields ``(index, exception)`` instead, so one failure
+        does not stop the batch.  ``batch`` is consumed lazily.  Closing the
+        iterator cancels the runs in flight; so does an error raised while
+        iterating ``batch``, which is then re-raised here.
+        """
+
+        if max_runs <= 0:
+            raise ValueError("max_runs must be positive")
+        items = enumerate(batch)
+        finished: asyncio.Queue = asyncio.Queue(maxsize=max_runs)
+
+        async def worker() -> None:
+            try:
+                # Workers share ``items``; ``next`` never yields to the loop.
+                for index, (pipeline, inputs) in items:
+                    try:
+                        outcome: Run | Exception = await self.execute_async(
+                            pipeline,
+                            inputs=inputs,
+                            max_concurrency=max_concurrency,
+                            timeout=timeout,
+                        )
+                    except Exception as exc:
+                        outcome = exc
+                    await finished.put((index, outcome))
+            except Exception as exc:
+                # ``batch`` itself failed: hand the error to the consumer.
+                await finished.put(exc)
+                return
+            await finished.put(None)
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(max_runs)]
+        try:
+            running = len(workers)
+            while running:
+                item = await finished.get()
+                if item is None:
+                    running -= 1
+                elif isinstance(item, Exception):
+                    raise item
+                else:
+                    yield item
+        finally:
+            for future in workers:
+                future.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def _execute_async(
+        self,
+        pipeline: Pipeline,
+        run: Run,
+        results: Dict[int, Artifact],
+        max_concurrency: int | None,
+        timeout: float | None,
+    ) -> Run:
+        if max_concurrency is not None and max_concurrency <= 0:
+            raise ValueError("max_concurrency must be positive")
+        check_timeout("timeout", timeout)
+        tasks = pipeline.tasks
+        dependencies = pipeline.dependencies()
+        nodes: Dict[int, asyncio.Future] = {}
+        run_slots = SharedSemaphore(max_concurrency) if max_concurrency is not None else None
+        channels = {
+            position: StreamChannel(self._spool(), buffer=self.stream_buffer)
+            for position, task in enumerate(tasks)
+            if task.streaming and position not in results
+        }
+        self._checkpoint_status(run)
+
+        async def run_step(position: int) -> None:
+            upstream = dependencies[position]
+            task = tasks[position]
+            live = (
+                {parent for parent in upstream if parent in channels}
+                if inspect.iscoroutinefunction(task.func) or inspect.isasyncgenfunction(task.func)
+                else set()
+            )
+            pending = [
+                nodes[parent] for parent in upstream if parent in nodes and parent not in live
+            ]
+            if pending:
+                await asyncio.gather(*pending)
+            for parent in live:
+                # Start only once the producer holds its slots, so a reader
+                # waiting on it can never starve it of concurrency slots.
+                await channels[parent].started.wait()
+            readers = {parent: channels[parent].reader() for parent in live}
+            kwargs = step_kwargs(run, tasks, upstream, results)
+            for parent, reader in readers.items():
+                kwargs[tasks[parent].name] = reader
+            key = self._cache_key(task, kwargs)
+            cached = self._cached(run, task, key)
+            if cached is not None:
+                self._complete(run, position, task, cached, results)
+                return
+            offloaded: Set[Future] = set()
+            with contextlib.ExitStack() as slots:
+                # Always acquired in the same order, so runs cannot deadlock.
+                for semaphore in (run_slots, self._slots, self._resource_slots.get(task.resource)):
+                    if semaphore is not None:
+                        await semaphore.acquire()
+                        slots.callback(semaphore.release)
+                try:
+                    async with contextlib.AsyncExitStack() as attached:
+                        # Producers wait for readers only once they hold their slots.
+                        for reader in readers.values():
+                            await reader.attach()
+                            attached.push_async_callback(reader.aclose)
+                        channel = channels.get(position)
+                        if channel is not None:
+                            channel.started.set()
+                        self._emit(run, Event(step=task.name, type="start", timestamp=time()))
+                        limit = task.timeout if task.timeout is not None else self.step_timeout
+                        invocation = self._invoke_async(run, task, kwargs, channel, offloaded)
+                        if limit is None:
+                            result = await invocation
+                        else:
+                            try:
+                                result = await asyncio.wait_for(invocation, limit)
+                            except asyncio.TimeoutError:
+                                self._emit(
+                                    run, Event(step=task.name, type="timeout", timestamp=time())
+                                )
+                                raise PipelineTimeoutError(
+                                    f"Step {task.name!r} of run {run.id} timed out "
+                                    f"after {limit:.3g}s"
+                                ) from None
+                finally:
+                    # Work cancelled mid-flight on a pool keeps the slots it runs in.
+                    release_when_done(slots, offloaded)
+            result = as_artifact(task, result)
+            if key is not None:
+                self.cache.put(key, result)
+            self._complete(run, position, task, result, results)
+            self._emit(run, Event(step=task.name, type="end", timestamp=time()))
+
+        try:
+            # Topological order guarantees that upstream nodes exist before the
+            # steps waiting on them are created.
+            for position in pipeline.topological_order():
+                if position not in results:
+                    nodes[position] = asyncio.ensure_future(run_step(position))
+            if timeout is None:
+                await wait_all(nodes.values())
+            else:
+                try:
+                    await asyncio.wait_for(wait_all(nodes.values()), timeout)
+                except PipelineTimeoutError:
+                    raise
+                except asyncio.TimeoutError:
+                    raise PipelineTimeoutError(
+                        f"Run {run.id} of pipeline {pipeline.id!r} timed out after {timeout:.3g}s"
+                    ) from None
+        except BaseException as exc:
+            run.status = failure_status(exc)
+            self._checkpoint_status(run)
+            raise
         run.status = "completed"
+        self._checkpoint_status(run)
         return run
+
+    def _restore(
+        self, run_id: str, pipeline: Pipeline | None
+    ) -> Tuple[Pipeline, Run, Dict[int, Artifact]]:
+        if self.checkpoints is None:
+            raise RuntimeError("Resuming a run requires a checkpoint store")
+        checkpoint = self.checkpoints.load(run_id)
+        run = checkpoint.run
+        if pipeline is None:
+            pipeline = pipeline_registry.get_pipeline(run.pipeline_id)
+            if pipeline is None:
+                raise ValueError(f"Unknown pipeline {run.pipeline_id!r} for run {run_id!r}")
+        elif pipeline.id != run.pipeline_id:
+            raise ValueError(f"Run {run_id!r} belongs to pipeline {run.pipeline_id!r}")
+        tasks = pipeline.tasks
+        # A step is only reused while the pipeline still has it at that position.
+        results = {
+            position: artifact
+            for position, (name, artifact) in checkpoint.steps.items()
+            if position < len(tasks) and tasks[position].name == name
+        }
+        order = pipeline.topological_order()
+        run.artifacts = [results[position] for position in order if position in results]
+        run.status = "running"
+        return pipeline, run, results
+
+    def _emit(self, run: Run, event: Event) -> None:
+        run.events.append(event)
+        if self.checkpoints is not None:
+            self.checkpoints.append_event(run.id, event)
+
+    def _complete(
+        self,
+        run: Run,
+        position: int,
+        task: Task,
+        artifact: Artifact,
+        results: Dict[int, Artifact],
+    ) -> None:
+        results[position] = artifact
+        run.artifacts.append(artifact)
+        if self.checkpoints is not None:
+            self.checkpoints.save_step(run.id, position, task.name, artifact)
+
+    def _checkpoint_status(self, run: Run) -> None:
+        if self.checkpoints is not None:
+            self.checkpoints.create(run)
+
+    def _spool(self) -> SpooledStream:
+        return SpooledStream(threshold=self.spill_threshold, directory=self.spill_directory)
+
+    def _invoke(
+        self, task: Task, kwargs: Dict[str, Any], handle: "_LoopCall | None" = None
+    ) -> Any:
+        result = task.func(**kwargs)
+        if inspect.isgenerator(result):
+            spool = self._spool()
+            for chunk in result:
+                spool.append(chunk)
+            return spool
+        if inspect.isawaitable(result) or inspect.isasyncgen(result):
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                future = asyncio.run_coroutine_threadsafe(self._resolve(result), self._loop())
+                if handle is not None:
+                    handle.attach(future)
+                try:
+                    return future.result()
+                except BaseException:
+                    future.cancel()
+                    raise
+            raise RuntimeError(
+                "PipelineExecutor.execute cannot run awaitable steps while an "
+                "event loop is running; use execute_async instead."
+            )
+        return result
+
+    async def _invoke_async(
+        self,
+        run: Run,
+        task: Task,
+        kwargs: Dict[str, Any],
+        channel: StreamChannel | None,
+        offloaded: Set[Future],
+    ) -> Any:
+        if task.hedge_after is None:
+            result = await self._call(task, kwargs, offloaded)
+        else:
+            result = await self._hedge(run, task, kwargs, offloaded)
+        if inspect.isgenerator(result) or inspect.isasyncgen(result):
+            channel = channel or StreamChannel(self._spool(), buffer=self.stream_buffer)
+            result = await self._stream(task, result, channel, offloaded)
+        return result
+
+    async def _hedge(
+        self, run: Run, task: Task, kwargs: Dict[str, Any], offloaded: Set[Future]
+    ) -> Any:
+        attempts = {asyncio.ensure_future(self._call(task, kwargs, offloaded))}
+        try:
+            done, _ = await asyncio.wait(attempts, timeout=task.hedge_after)
+            if not done:
+                self._emit(run, Event(step=task.name, type="hedge", timestamp=time()))
+                attempts.add(asyncio.ensure_future(self._call(task, kwargs, offloaded)))
+            # The first attempt to succeed wins; fail only once both have failed.
+            while True:
+                done, pending = await asyncio.wait(attempts, return_when=asyncio.FIRST_COMPLETED)
+                for attempt in done:
+                    if attempt.exception() is None:
+                        return attempt.result()
+                if not pending:
+                    raise next(iter(done)).exception()
+                attempts = pending
+        finally:
+            for attempt in attempts:
+                attempt.cancel()
+
+    async def _resolve(self, result: Any) -> Any:
+        if inspect.isasyncgen(result):
+            spool = self._spool()
+            async for chunk in result:
+                spool.append(chunk)
+            return spool
+        return await result
+
+    async def _stream(
+        self, task: Task, result: Any, channel: StreamChannel, offloaded: Set[Future]
+    ) -> SpooledStream:
+        try:
+            if inspect.isasyncgen(result):
+                async for chunk in result:
+                    await channel.publish(chunk)
+            elif self._execution(task) == "inline":
+                for chunk in result:
+                    await channel.publish(chunk)
+            else:
+                pool = self._pool(self._execution(task))
+                while True:
+                    chunk = await offload(pool, offloaded, next, result, _EXHAUSTED)
+                    if chunk is _EXHAUSTED:
+                        break
+                    await channel.publish(chunk)
+        except BaseException as exc:
+            await channel.finish(exc)
+            raise
+        await channel.finish()
+        return channel.spool
+
+    def _cache_key(self, task: Task, kwargs: Dict[str, Any]) -> str | None:
+        if self.cache is None or not task.cache or task.streaming:
+            return None
+        return self.cache.key(task, kwargs)
+
+    def _cached(self, run: Run, task: Task, key: str | None) -> Artifact | None:
+        if key is None:
+            return None
+        artifact = self.cache.get(key)
+        if artifact is not None:
+            self._emit(run, Event(step=task.name, type="cache_hit", timestamp=time()))
+        return artifact
+
+    def _execution(self, task: Task) -> str:
+        if (
+            task.execution == "inline"
+            and self.offload_sync_steps
+            and not inspect.iscoroutinefunction(task.func)
+            and not inspect.isasyncgenfunction(task.func)
+        ):
+            return "thread"
+        return task.execution
+
+    async def _call(self, task: Task, kwargs: Dict[str, Any], offloaded: Set[Future]) -> Any:
+        execution = self._execution(task)
+        if execution == "inline":
+            result = task.func(**kwargs)
+        else:
+            result = await offload(
+                self._pool(execution), offloaded, functools.partial(task.func, **kwargs)
+            )
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+    def _loop(self) -> asyncio.AbstractEventLoop:
+        with self._pools_lock:
+            if self._step_loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=_run_loop, args=(loop,), name="pipeline-loop", daemon=True
+                )
+                thread.start()
+                self._step_loop = (loop, thread)
+            return self._step_loop[0]
+
+    def _pool(self, execution: str) -> Executor:
+        with self._pools_lock:
+            pool = self._pools.get(execution)
+            if pool is None:
+                if execution == "thread":
+                    pool = ThreadPoolExecutor(
+                        max_workers=self.max_threads, thread_name_prefix="pipeline-step"
+                    )
+                else:
+                    pool = ProcessPoolExecutor(max_workers=self.max_processes)
+                self._pools[execution] = pool
+            return pool
+
+
+_EXHAUSTED = object()
+
+
+class _LoopCall:
+    """Lets :meth:`PipelineExecutor.execute` cancel a step it abandoned.
+
+    The step's coroutine runs on the executor's loop from a helper thread;
+    cancelling before the coroutine is scheduled cancels it on arrival.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._future: Future | None = None
+        self._cancelled = False
+
+    def attach(self, future: Future) -> None:
+        with self._lock:
+            self._future = future
+            if self._cancelled:
+                future.cancel()
+
+    def cancel(self) -> None:
+        with self._lock:
+            self._cancelled = True
+            if self._future is not None:
+                self._future.cancel()
+
+
+def _run_loop(loop: asyncio.AbstractEventLoop) -> None:
+    asyncio.set_event_loop(loop)
+    try:
+        loop.run_forever()
+    finally:
+        # Steps abandoned after a timeout may still be pending.
+        pending = asyncio.all_tasks(loop)
+        for task in pending:
+            task.cancel()
+        loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
+
+
+def check_timeout(name: str, timeout: float | None) -> None:
+    if timeout is not None and timeout <= 0:
+        raise ValueError(f"{name} must be positive")
+
+
+def failure_status(exc: BaseException) -> str:
+    """Return the status of a run that ended with ``exc``."""
+
+    if isinstance(exc, asyncio.CancelledError):
+        return "cancelled"
+    if isinstance(exc, PipelineTimeoutError):
+        return "timed_out"
+    return "failed"
+
+
+def offload(
+    pool: Executor, offloaded: Set[Future], func: Callable[..., Any], *args: Any
+) -> "asyncio.Future[Any]":
+    """Run ``func`` on ``pool``, tracking it in ``offloaded`` until it finishes."""
+
+    future = pool.submit(func, *args)
+    offloaded.add(future)
+    future.add_done_callback(offloaded.discard)
+    return asyncio.wrap_future(future)
+
+
+def release_when_done(slots: contextlib.ExitStack, futures: Iterable[Future]) -> None:
+    """Keep the slots held by ``slots`` until every one of ``futures`` has finished.
+
+    Python threads cannot be interrupted, and neither can a process pool task
+    once it started, so a step abandoned on a pool still occupies its slots.
+    """
+
+    running = [future for future in list(futures) if not future.done()]
+    if not running:
+        return
+    release = slots.pop_all()
+    remaining = [len(running)]
+    lock = threading.Lock()
+
+    def finished(_: Future) -> None:
+        with lock:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+        if last:
+            release.close()
+
+    for future in running:
+        future.add_done_callback(finished)
+
+
+def new_run(
+    pipeline: Pipeline, inputs: Mapping[str, Any] | None = None, run_id: str | None = None
+) -> Run:
+    return Run(
+        id=run_id or str(uuid4()),
+        pipeline_id=pipeline.id,
+        status="running",
+        inputs=dict(inputs or {}),
+    )
+
+
+def step_kwargs(
+    run: Run, tasks: List[Task], upstream: Iterable[int], results: Dict[int, Artifact]
+) -> Dict[str, Any]:
+    """Keyword arguments of a step: upstream data, or the run inputs for root steps."""
+
+    upstream = tuple(upstream)
+    if not upstream:
+        return dict(run.inputs)
+    return {
+        tasks[parent].name: results[parent].data for parent in upstream if parent in results
+    }
+
+
+def as_artifact(task: Task, result: Any) -> Artifact:
+    """Wrap a step's return value in an :class:`Artifact` named after the step."""
+
+    return result if isinstance(result, Artifact) else Artifact(name=task.name, data=result)
+
+
+async def wait_all(futures: Iterable[asyncio.Future]) -> None:
+    """Wait for ``futures``; on the first failure cancel the rest and re-raise."""
+
+    pending = set(futures)
+    try:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_EXCEPTION)
+        # Retrieve every exception, not just the one re-raised, so failures
+        # that finished together are not reported as never retrieved.
+        errors = [
+            future.exception() for future in done if not future.cancelled() and future.exception()
+        ]
+        if errors:
+            raise errors[0]
+    finally:
+        for future in pending:
+            future.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
@@ -1,30 +1,87 @@
 from __future__ import annotations
 
+import asyncio
 import inspect
-from time import time
-from uuid import uuid4
+from time import monotonic, time
+from typing import Any, Awaitable, Dict, Mapping
 
 from ..domain.pipelines import Artifact, Event, Pipeline, Run
+from .pipeline_executor import (
+    PipelineTimeoutError,
+    as_artifact,
+    check_timeout,
+    failure_status,
+    new_run,
+    step_kwargs,
+)
 
 
 class PipelineExecutorAsync:
-    """Executes pipeline steps sequentially, awaiting coroutine steps."""
+    """Executes pipeline steps sequentially, awaiting coroutine steps.
 
-    async def execute(self, pipeline: Pipeline) -> Run:
-        run = Run(id=str(uuid4()), pipeline_id=pipeline.id, status="running")
+    Coroutine steps are cancelled once they exceed their
+    :attr:`~cognitive_core.domain.pipelines.Task.timeout` or the run's
+    ``timeout``, raising :class:`PipelineTimeoutError`.  Synchronous steps
+    cannot be interrupted: no step starts once the run's deadline has passed,
+    and a synchronous step that ran past it fails the run when it returns.
+    """
 
-        for step in pipeline.steps:
-            step_name = getattr(step, "__name__", "step")
-            run.events.append(Event(step=step_name, type="start", timestamp=time()))
+    async def execute(
+        self,
+        pipeline: Pipeline,
+        *,
+        inputs: Mapping[str, Any] | None = None,
+        timeout: float | None = None,
+    ) -> Run:
+        check_timeout("timeout", timeout)
+        run = new_run(pipeline, inputs)
+        tasks = pipeline.tasks
+        dependencies = pipeline.dependencies()
+        results: Dict[int, Artifact] = {}
+        deadline = monotonic() + timeout if timeout is not None else None
 
-            result = step()
-            if inspect.isawaitable(result):
-                result = await result
-            if not isinstance(result, Artifact):
-                result = Artifact(name=step_name, data=result)
-            run.artifacts.append(result)
+        def run_timed_out() -> PipelineTimeoutError:
+            return PipelineTimeoutError(
+                f"Run {run.id} of pipeline {pipeline.id!r} timed out after {timeout:.3g}s"
+            )
 
-            run.events.append(Event(step=step_name, type="end", timestamp=time()))
+        try:
+            for position in pipeline.topological_order():
+                task = tasks[position]
+                if deadline is not None and deadline - monotonic() <= 0:
+                    raise run_timed_out()
+                run.events.append(Event(step=task.name, type="start", timestamp=time()))
+
+                result = task.func(**step_kwargs(run, tasks, dependencies[position], results))
+                if inspect.isawaitable(result):
+                    limit = task.timeout
+                    if deadline is not None:
+                        remaining = max(deadline - monotonic(), 0.0)
+                        limit = remaining if limit is None else min(limit, remaining)
+                    if limit is None:
+                        result = await result
+                    else:
+                        result = await self._wait(run, task.name, result, limit)
+                elif deadline is not None and deadline - monotonic() <= 0:
+                    run.events.append(Event(step=task.name, type="timeout", timestamp=time()))
+                    raise run_timed_out()
+                result = as_artifact(task, result)
+                results[position] = result
+                run.artifacts.append(result)
+
+                run.events.append(Event(step=task.name, type="end", timestamp=time()))
+        except BaseException as exc:
+            run.status = failure_status(exc)
+            raise
 
         run.status = "completed"
         return run
+
+    async def _wait(self, run: Run, step: str, awaitable: Awaitable[Any], limit: float) -> Any:
+        try:
+            return await asyncio.wait_for(awaitable, limit)
+        except asyncio.TimeoutError:
+            run.events.append(Event(step=step, type="timeout", timestamp=time()))
+            raise PipelineTimeoutError(
+                f"Step {step!r} of run {run.id} timed out after {limit:.3g}s"
+            ) from None
@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+"""Content-addressed cache of pipeline step results."""
+
+from collections import OrderedDict
+import hashlib
+import marshal
+import os
+from pathlib import Path
+import pickle
+import tempfile
+import threading
+import time
+import types
+from typing import Any, Callable, Dict, Iterator, Set, Tuple
+
+from ..domain.pipelines import Artifact, Task
+
+_SUFFIX = ".pkl"
+
+
+class StepCache:
+    """Two-tier cache of step :class:`Artifact` objects keyed by their inputs.
+
+    The key of a step is a SHA-256 digest of the step's identity and of the
+    keyword arguments it receives from upstream steps.  The identity covers
+    the step's name, the qualified name and bytecode of its function, its
+    closure values and defaults, and the module globals the function refers
+    to: plain values by content and functions recursively by the same rules.
+    A step is therefore recomputed when its code, the code of the module-level
+    helpers it calls, the globals they read or its inputs change.  Changes
+    the key cannot see are not detected: attributes of imported modules,
+    methods of classes, and files or services the step reads.  Steps whose
+    function, referenced globals or inputs cannot be pickled are never cached.
+
+    Up to ``maxsize`` artifacts are kept in memory in LRU order.  With a
+    ``directory`` they are also written to disk, which survives restarts and
+    is shared between processes; ``max_bytes`` caps its size by evicting the
+    least recently used files.  Entries older than ``ttl`` seconds are ignored
+    and removed by both tiers.  Cached artifacts are shared between runs, so
+    steps should not mutate the data they receive.
+    """
+
+    def __init__(
+        self,
+        *,
+        maxsize: int = 256,
+        ttl: float | None = None,
+        directory: str | os.PathLike[str] | None = None,
+        max_bytes: int | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be positive")
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.directory = Path(directory) if directory is not None else None
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, Artifact]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_bytes: int | None = None
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, task: Task, kwargs: Dict[str, Any]) -> str | None:
+        """Return the cache key of ``task`` called with ``kwargs``, if it has one."""
+
+        try:
+            inputs = pickle.dumps(sorted(kwargs.items()), protocol=4)
+            identity = _fingerprint(task)
+        except Exception:
+            return None
+        digest = hashlib.sha256(identity)
+        digest.update(inputs)
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Artifact | None:
+        """Return the artifact stored under ``key`` or ``None`` on a miss."""
+
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if self._fresh(entry[0], now):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._entries[key]
+        entry = self._load(key, now)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(key, entry)
+        return entry[1]
+
+    def put(self, key: str, artifact: Artifact) -> None:
+        """Store ``artifact`` under ``key`` in every tier."""
+
+        entry = (self._clock(), artifact)
+        with self._lock:
+            self._remember(key, entry)
+        if self.directory is not None:
+            self._dump(key, entry)
+
+    def clear(self) -> None:
+        """Drop every entry from both tiers."""
+
+        with self._lock:
+            self._entries.clear()
+            self._disk_bytes = None
+        if self.directory is not None:
+            for path in self.directory.glob(f"*{_SUFFIX}"):
+                _unlink(path)
+
+    def _fresh(self, stored_at: float, now: float) -> bool:
+        return self.ttl is None or now - stored_at < self.ttl
+
+    def _remember(self, key: str, entry: Tuple[float, Artifact]) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def _path(self, key: str) -> Path:
+        assert self.directory is not None
+        return self.directory / f"{key}{_SUFFIX}"
+
+    def _load(self, key: str, now: float) -> Tuple[float, Artifact] | None:
+        if self.directory is None:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "rb") as handle:
+                entry = pickle.load(handle)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Truncated or written by an incompatible version.
+            self._discard(path)
+            return None
+        if not self._fresh(entry[0], now):
+            self._discard(path)
+            return None
+        try:
+            # The modification time orders files for eviction.
+            os.utime(path)
+        except OSError:
+            pass
+        return entry
+
+    def _dump(self, key: str, entry: Tuple[float, Artifact]) -> None:
+        try:
+            payload = pickle.dumps(entry, protocol=4)
+        except Exception:
+            return
+        assert self.directory is not None
+        path = self._path(key)
+        previous = _size(path)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(payload)
+            os.replace(tmp, path)
+        except OSError:
+            _unlink(Path(tmp))
+            return
+        if self.max_bytes is None:
+            return
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = self._scan_bytes()
+            else:
+                self._disk_bytes += len(payload) - previous
+            if self._disk_bytes > self.max_bytes:
+                self._evict()
+
+    def _scan_bytes(self) -> int:
+        assert self.directory is not None
+        return sum(_size(path) for path in self.directory.glob(f"*{_SUFFIX}"))
+
+    def _evict(self) -> None:
+        assert self.directory is not None and self.max_bytes is not None
+        files = []
+        for path in self.directory.glob(f"*{_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        files.sort()
+        total = sum(size for _, size, _ in files)
+        for _, size, path in files:
+            if total <= self.max_bytes:
+                break
+            _unlink(path)
+            total -= size
+        self._disk_bytes = total
+
+    def _discard(self, path: Path) -> None:
+        size = _size(path)
+        _unlink(path)
+        with self._lock:
+            if self._disk_bytes is not None:
+                self._disk_bytes -= size
+
+
+def _fingerprint(task: Task) -> bytes:
+    func = task.func
+    if not isinstance(func, types.FunctionType):
+        # Callable objects and ``functools.partial`` carry their state.
+        return pickle.dumps((task.name, pickle.dumps(func, protocol=4)), protocol=4)
+    return pickle.dumps((task.name, _function_state(func, set())), protocol=4)
+
+
+def _function_state(func: types.FunctionType, seen: Set[int]) -> Tuple[Any, ...]:
+    seen.add(id(func))
+    namespace = func.__globals__
+    referenced = {
+        name: _value_state(namespace[name], seen)
+        for name in sorted(set(_global_names(func.__code__)))
+        if name in namespace
+    }
+    return (
+        func.__module__,
+        func.__qualname__,
+        marshal.dumps(func.__code__),
+        tuple(_value_state(cell.cell_contents, seen) for cell in func.__closure__ or ()),
+        func.__defaults__,
+        func.__kwdefaults__,
+        referenced,
+    )
+
+
+def _value_state(value: Any, seen: Set[int]) -> Any:
+    if isinstance(value, types.FunctionType):
+        if id(value) in seen:
+            # Recursion: the function is already part of the key.
+            return ("function", value.__module__, value.__qualname__)
+        return _function_state(value, seen)
+    if isinstance(value, types.ModuleType):
+        return ("module", value.__name__)
+    if isinstance(value, type):
+        return ("class", value.__module__, value.__qualname__)
+    return ("value", pickle.dumps(value, protocol=4))
+
+
+def _global_names(code: types.CodeType) -> Iterator[str]:
+    # ``co_names`` also lists attribute names; the extra lookups are harmless.
+    yield from code.co_names
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            yield from _global_names(const)
+
+
+def _size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
+
+
+def _unlink(path: Path) -> None:
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
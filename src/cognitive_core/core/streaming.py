@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+"""Incremental artifacts produced by generator pipeline steps."""
+
+import asyncio
+import os
+import pickle
+import tempfile
+import threading
+from typing import IO, Any, AsyncIterator, Iterator, List
+
+
+class SpooledStream:
+    """Append-only sequence of chunks that spills to disk past ``threshold``.
+
+    Chunks are pickled on :meth:`append` and kept in memory until their total
+    size exceeds ``threshold`` bytes; from then on every chunk lives in an
+    anonymous temporary file in ``directory``, so a long stream costs a few
+    offsets of memory per chunk.  Chunks must therefore be picklable.  The
+    stream can be iterated any number of times, with ``for`` or ``async
+    for``, and supports indexing; the temporary file is removed by
+    :meth:`close` or garbage collection.
+    """
+
+    def __init__(
+        self, *, threshold: int = 1 << 20, directory: str | os.PathLike[str] | None = None
+    ) -> None:
+        if threshold < 0:
+            raise ValueError("threshold must not be negative")
+        self.threshold = threshold
+        self.directory = directory
+        self.nbytes = 0
+        self._chunks: List[bytes] = []
+        self._offsets: List[int] = []
+        self._file: IO[bytes] | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def spilled(self) -> bool:
+        """Whether the chunks have moved to disk."""
+
+        return self._file is not None
+
+    def append(self, chunk: Any) -> None:
+        payload = pickle.dumps(chunk, protocol=4)
+        with self._lock:
+            if self._file is None and self.nbytes + len(payload) > self.threshold:
+                self._spill()
+            if self._file is None:
+                self._chunks.append(payload)
+            else:
+                self._file.seek(0, os.SEEK_END)
+                self._offsets.append(self._file.tell())
+                self._file.write(payload)
+            self.nbytes += len(payload)
+
+    def __len__(self) -> int:
+        return len(self._offsets) if self._file is not None else len(self._chunks)
+
+    def __getitem__(self, index: int) -> Any:
+        with self._lock:
+            if self._file is None:
+                return pickle.loads(self._chunks[index])
+            start = self._offsets[index]
+            end = self._offsets[index + 1] if index + 1 < len(self._offsets) else None
+            self._file.seek(start)
+            payload = self._file.read() if end is None else self._file.read(end - start)
+        return pickle.loads(payload)
+
+    def __iter__(self) -> Iterator[Any]:
+        for index in range(len(self)):
+            yield self[index]
+
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        # Lets coroutine steps read a finished stream like a live StreamReader.
+        for chunk in self:
+            yield chunk
+
+    def close(self) -> None:
+        """Release the chunks and the temporary file, if any."""
+
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+            self._file = None
+            self._chunks = []
+            self._offsets = []
+            self.nbytes = 0
+
+    def __reduce__(self) -> Any:
+        raise TypeError("SpooledStream objects cannot be pickled")
+
+    def __repr__(self) -> str:
+        where = "disk" if self.spilled else "memory"
+        return f"<SpooledStream {len(self)} chunks, {self.nbytes} bytes in {where}>"
+
+    def _spill(self) -> None:
+        self._file = tempfile.TemporaryFile(dir=self.directory)
+        for payload in self._chunks:
+            self._offsets.append(self._file.tell())
+            self._file.write(payload)
+        self._chunks = []
+
+
+class StreamChannel:
+    """Connects a streaming step to the steps that read it while it runs.
+
+    The producer :meth:`publish`-es chunks into ``spool``.  Readers start at
+    the first chunk whenever they attach; the producer pauses while an
+    attached reader is ``buffer`` chunks behind, so a slow consumer throttles
+    its producer instead of letting chunks pile up.  Readers that have not
+    attached yet never hold the producer back: they catch up from the spool.
+    """
+
+    def __init__(self, spool: SpooledStream, *, buffer: int = 16) -> None:
+        if buffer <= 0:
+            raise ValueError("buffer must be positive")
+        self.spool = spool
+        self.buffer = buffer
+        self.started = asyncio.Event()
+        self._changed = asyncio.Condition()
+        self._readers: List[StreamReader] = []
+        self._done = False
+        self._error: BaseException | None = None
+
+    def reader(self) -> "StreamReader":
+        return StreamReader(self)
+
+    async def publish(self, chunk: Any) -> None:
+        self.spool.append(chunk)
+        async with self._changed:
+            self._changed.notify_all()
+            await self._changed.wait_for(self._has_room)
+        # Let readers run even when the producer never has to wait.
+        await asyncio.sleep(0)
+
+    async def finish(self, error: BaseException | None = None) -> None:
+        async with self._changed:
+            self._done = True
+            self._error = error
+            self._changed.notify_all()
+
+    def _has_room(self) -> bool:
+        if not self._readers:
+            return True
+        return len(self.spool) - min(reader.position for reader in self._readers) < self.buffer
+
+
+class StreamReader:
+    """Asynchronous iterator over the chunks of a running streaming step."""
+
+    def __init__(self, channel: StreamChannel) -> None:
+        self._channel = channel
+        self.position = 0
+        self._attached = False
+        self._closed = False
+
+    def __aiter__(self) -> "StreamReader":
+        return self
+
+    async def attach(self) -> None:
+        """Make the producer wait for this reader from now on.
+
+        Reading attaches the reader implicitly.
+        """
+
+        async with self._channel._changed:
+            if not self._attached and not self._closed:
+                self._attached = True
+                self._channel._readers.append(self)
+
+    async def __anext__(self) -> Any:
+        channel = self._channel
+        if self._closed:
+            raise StopAsyncIteration
+        await self.attach()
+        async with channel._changed:
+            await channel._changed.wait_for(
+                lambda: self.position < len(channel.spool) or channel._done
+            )
+            if self.position < len(channel.spool):
+                chunk = channel.spool[self.position]
+                self.position += 1
+                channel._changed.notify_all()
+                return chunk
+            self._detach()
+            if channel._error is not None:
+                raise RuntimeError("Upstream stream failed") from channel._error
+            raise StopAsyncIteration
+
+    async def aclose(self) -> None:
+        """Stop reading; the producer no longer waits for this reader."""
+
+        async with self._channel._changed:
+            self._detach()
+            self._closed = True
+            self._channel._changed.notify_all()
+
+    def __reduce__(self) -> Any:
+        raise TypeError("StreamReader objects cannot be pickled")
+
+    def _detach(self) -> None:
+        if self._attached:
+            self._attached = False
+            self._channel._readers.remove(self)
@@ -2,7 +2,7 @@
 
 from .agents import AgentConfig, DebateRound, Role
 from .entities import Vector
-from .pipelines import Artifact, Event, Pipeline, Run
+from .pipelines import Artifact, Event, Pipeline, Run, Task
 
 __all__ = [
     "Vector",
@@ -10,6 +10,7 @@ __all__ = [
     "Event",
     "Pipeline",
     "Run",
+    "Task",
     "Role",
     "AgentConfig",
     "DebateRound",
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Any, Awaitable, Callable, List, Union
+import heapq
+import inspect
+from typing import Any, Awaitable, Callable, Dict, List, Tuple, Union
 
 
 @dataclass(frozen=True)
@@ -23,22 +25,171 @@ class Event:
 
 @dataclass
 class Run:
-    """Execution state of a pipeline."""
+    """Execution state of a pipeline.
+
+    ``inputs`` are passed as keyword arguments to the steps without
+    dependencies.
+    """
 
     id: str
     pipeline_id: str
     status: str
     events: List[Event] = field(default_factory=list)
     artifacts: List[Artifact] = field(default_factory=list)
+    inputs: Dict[str, Any] = field(default_factory=dict)
+
 
+Step = Union[Callable[..., Any], Callable[..., Awaitable[Any]]]
 
-Step = Union[Callable[[], Any], Callable[[], Awaitable[Any]]]
+#: Where :meth:`PipelineExecutor.execute_async` runs a synchronous step.
+EXECUTION_MODES = ("inline", "thread", "process")
+
+
+@dataclass(frozen=True)
+class Task:
+    """A pipeline step with declared upstream dependencies.
+
+    ``depends_on`` names other tasks of the same pipeline.  The step runs once
+    all of them have completed and receives the ``data`` of each upstream
+    artifact as a keyword argument named after the upstream task.  ``name``
+    defaults to the function name.
+
+    ``execution`` tells the asynchronous executor where to run a synchronous
+    step: ``"inline"`` on the event loop, ``"thread"`` on its thread pool for
+    blocking I/O, or ``"process"`` on its process pool for CPU-bound work.
+    Process steps, their arguments and results must be picklable.
+
+    ``resource`` names a resource class such as ``"llm"`` or ``"cpu"``; the
+    executor caps how many steps of each class run at once.
+
+    A step may also be a generator or asynchronous generator function.  Its
+    chunks are collected into a
+    :class:`~cognitive_core.core.streaming.SpooledStream`, which becomes the
+    artifact's data and spills to disk when it grows large.  Under
+    ``execute_async``, coroutine steps downstream of it read the chunks as
+    they are produced, through a
+    :class:`~cognitive_core.core.streaming.StreamReader` passed as the
+    keyword argument; other steps receive the finished stream.  Both support
+    ``async for``, so a coroutine consumer runs under either method.
+
+    ``cache`` opts the step out of the executor's result cache when ``False``;
+    use it for steps with side effects or non-deterministic output.
+
+    ``timeout`` bounds the step's running time in seconds.  ``hedge_after``
+    marks the step as idempotent and lets the asynchronous executor start a
+    second attempt when the first has not finished after that many seconds.
+    """
+
+    func: Step
+    name: str = ""
+    depends_on: Tuple[str, ...] = ()
+    execution: str = "inline"
+    resource: str | None = None
+    cache: bool = True
+    timeout: float | None = None
+    hedge_after: float | None = None
+
+    def __post_init__(self) -> None:
+        if not self.name:
+            object.__setattr__(self, "name", getattr(self.func, "__name__", "step"))
+        if isinstance(self.depends_on, str):
+            object.__setattr__(self, "depends_on", (self.depends_on,))
+        else:
+            object.__setattr__(self, "depends_on", tuple(self.depends_on))
+        if self.execution not in EXECUTION_MODES:
+            raise ValueError(
+                f"Unknown execution mode {self.execution!r}; expected one of {EXECUTION_MODES}"
+            )
+        if self.execution != "inline" and (
+            inspect.iscoroutinefunction(self.func) or inspect.isasyncgenfunction(self.func)
+        ):
+            raise ValueError(f"Coroutine step {self.name!r} can only run inline")
+        if self.execution == "process" and inspect.isgeneratorfunction(self.func):
+            raise ValueError(f"Streaming step {self.name!r} cannot run in a process")
+        for name in ("timeout", "hedge_after"):
+            value = getattr(self, name)
+            if value is not None and value <= 0:
+                raise ValueError(f"{name} of step {self.name!r} must be positive")
+        if self.hedge_after is not None and self.streaming:
+            raise ValueError(f"Streaming step {self.name!r} cannot be hedged")
+
+    @property
+    def streaming(self) -> bool:
+        """Whether the step is a generator that yields its artifact in chunks."""
+
+        return inspect.isgeneratorfunction(self.func) or inspect.isasyncgenfunction(self.func)
 
 
 @dataclass(frozen=True)
 class Pipeline:
-    """A pipeline whose steps may be synchronous or asynchronous."""
+    """A pipeline whose steps may be synchronous or asynchronous.
+
+    Steps are plain callables or :class:`Task` objects; together their
+    ``depends_on`` declarations form a directed acyclic graph.  Plain
+    callables have no dependencies.
+    """
 
     id: str
     name: str
-    steps: List[Step]
+    steps: List[Union[Step, Task]]
+
+    def __post_init__(self) -> None:
+        self.topological_order()
+
+    @property
+    def tasks(self) -> List[Task]:
+        """The steps as :class:`Task` objects, in declaration order."""
+
+        return [step if isinstance(step, Task) else Task(step) for step in self.steps]
+
+    def dependencies(self) -> List[Tuple[int, ...]]:
+        """Return the positions of every task's upstream tasks.
+
+        Raises ``ValueError`` when a dependency names no task or a name shared
+        by several tasks.
+        """
+
+        tasks = self.tasks
+        positions: Dict[str, int] = {}
+        duplicates = set()
+        for position, task in enumerate(tasks):
+            if task.name in positions:
+                duplicates.add(task.name)
+            positions[task.name] = position
+        resolved = []
+        for task in tasks:
+            for upstream in task.depends_on:
+                if upstream not in positions:
+                    raise ValueError(f"Step {task.name!r} depends on unknown step {upstream!r}")
+                if upstream in duplicates:
+                    raise ValueError(f"Step {task.name!r} depends on ambiguous step name {upstream!r}")
+            resolved.append(tuple(positions[upstream] for upstream in task.depends_on))
+        return resolved
+
+    def topological_order(self) -> List[int]:
+        """Return task positions so every task follows its dependencies.
+
+        Independent tasks keep their declaration order.  Raises ``ValueError``
+        when the dependencies form a cycle.
+        """
+
+        dependencies = self.dependencies()
+        remaining = [len(set(upstream)) for upstream in dependencies]
+        downstream: List[List[int]] = [[] for _ in dependencies]
+        for position, upstream in enumerate(dependencies):
+            for parent in set(upstream):
+                downstream[parent].append(position)
+        ready = [position for position, count in enumerate(remaining) if count == 0]
+        heapq.heapify(ready)
+        order = []
+        while ready:
+            position = heapq.heappop(ready)
+            order.append(position)
+            for child in downstream[position]:
+                remaining[child] -= 1
+                if remaining[child] == 0:
+                    heapq.heappush(ready, child)
+        if len(order) != len(dependencies):
+            cyclic = sorted(self.tasks[position].name for position, count in enumerate(remaining) if count)
+            raise ValueError(f"Pipeline {self.id!r} has a dependency cycle through {cyclic}")
+        return order
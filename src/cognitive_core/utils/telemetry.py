@@ -33,6 +33,9 @@ except Exception:  # pragma: no cover - fallback when library missing
 
 REQUEST_LATENCY = Histogram("request_latency_seconds", "Request latency", ["route"])
 LLM_TOKENS = Counter("llm_tokens_total", "LLM tokens processed", ["route"])
+MEMORY_CACHE_LOOKUPS = Counter(
+    "memory_cache_lookups_total", "Memory retrieval cache lookups", ["cache", "result"]
+)
 
 
 def setup_telemetry(
@@ -94,3 +97,8 @@ def instrument_route(route_name: str):
 def record_llm_tokens(route_name: str, tokens: int) -> None:
     """Record the number of tokens processed by an endpoint."""
     LLM_TOKENS.labels(route=route_name).inc(tokens)
+
+
+def record_memory_cache_lookup(cache_name: str, hit: bool) -> None:
+    """Count a memory retrieval cache lookup as a hit or a miss."""
+    MEMORY_CACHE_LOOKUPS.labels(cache=cache_name, result="hit" if hit else "miss").inc()
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import pytest
+from pydantic import ValidationError
+
+from cognitive_core.config import Settings
+
+
+@pytest.mark.parametrize("raw", ["", "none", " None "])
+def test_pipeline_max_concurrency_can_be_lifted_from_the_environment(monkeypatch, raw):
+    monkeypatch.setenv("COG_PIPELINE_MAX_CONCURRENCY", raw)
+
+    assert Settings().pipeline_max_concurrency is None
+
+
+def test_pipeline_max_concurrency_defaults_to_a_limit(monkeypatch):
+    monkeypatch.delenv("COG_PIPELINE_MAX_CONCURRENCY", raising=False)
+
+    assert Settings().pipeline_max_concurrency == 32
+
+
+@pytest.mark.parametrize(
+    "name",
+    [
+        "pipeline_max_concurrency",
+        "pipeline_queue_workers",
+        "pipeline_batch_max_runs",
+        "pipeline_batch_concurrency",
+    ],
+)
+def test_pipeline_limits_must_be_positive(name):
+    with pytest.raises(ValidationError, match=name):
+        Settings(**{name: 0})
@@ -0,0 +1,75 @@
+import random
+
+import pytest
+
+from cognitive_core.core.memory.base import MemoryAdapter
+from cognitive_core.core.memory.dense_index import np
+from cognitive_core.core.memory.faiss_adapter import FaissMemoryAdapter
+from cognitive_core.core.memory.sqlitevec_adapter import SQLiteVecMemoryAdapter
+
+
+ADAPTER_FACTORIES = [
+    pytest.param(FaissMemoryAdapter, id="faiss"),
+    pytest.param(SQLiteVecMemoryAdapter, id="sqlite"),
+    pytest.param(lambda: FaissMemoryAdapter(ranking="bm25"), id="faiss-bm25"),
+    pytest.param(lambda: SQLiteVecMemoryAdapter(ranking="bm25"), id="sqlite-bm25"),
+    pytest.param(
+        lambda: FaissMemoryAdapter(dense_dim=512),
+        id="faiss-dense",
+        marks=pytest.mark.skipif(np is None, reason="numpy not installed"),
+    ),
+]
+
+
+def _corpus(seed: int) -> tuple[list[str], list[str]]:
+    rng = random.Random(seed)
+    vocab = [f"w{i}" for i in range(25)]
+    docs = [" ".join(rng.choices(vocab, k=rng.randint(0, 6))) for _ in range(120)]
+    queries = [" ".join(rng.choices(vocab, k=rng.randint(0, 3))) for _ in range(30)]
+    return docs, queries
+
+
+@pytest.mark.parametrize("factory", ADAPTER_FACTORIES)
+def test_save_many_matches_repeated_save(factory) -> None:
+    docs, queries = _corpus(5)
+    single = factory()
+    for doc in docs:
+        single.save(doc)
+    batched = factory()
+    batched.save_many(iter(docs))
+
+    for query in queries:
+        assert batched.retrieve(query, top_k=5) == single.retrieve(query, top_k=5)
+
+
+@pytest.mark.parametrize("factory", ADAPTER_FACTORIES)
+def test_retrieve_many_matches_individual_retrieval(factory) -> None:
+    docs, queries = _corpus(9)
+    adapter = factory()
+    adapter.save_many(docs)
+
+    for top_k in (1, 4, 200):
+        expected = [adapter.retrieve(query, top_k=top_k) for query in queries]
+        assert adapter.retrieve_many(queries, top_k=top_k) == expected
+    assert adapter.retrieve_many(queries, top_k=0) == [[] for _ in queries]
+    assert adapter.retrieve_many([], top_k=3) == []
+
+
+def test_base_class_provides_default_batch_methods() -> None:
+    class ListMemory(MemoryAdapter):
+        def __init__(self) -> None:
+            self.items: list[str] = []
+
+        def save(self, text: str) -> None:
+            self.items.append(text)
+
+        def retrieve(self, query: str, top_k: int = 1) -> list[str]:
+            return [item for item in self.items if query in item][:top_k]
+
+    memory = ListMemory()
+    memory.save_many(["apple pie", "banana split", "apple tart"])
+
+    assert memory.retrieve_many(["apple", "banana"], top_k=2) == [
+        ["apple pie", "apple tart"],
+        ["banana split"],
+    ]
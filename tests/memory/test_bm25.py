@@ -0,0 +1,152 @@
+import math
+import random
+import sqlite3
+from collections import Counter
+
+import pytest
+
+from cognitive_core.core.memory.bm25_index import BM25Index
+from cognitive_core.core.memory.faiss_adapter import FaissMemoryAdapter, _embed
+from cognitive_core.core.memory.sqlitevec_adapter import SQLiteVecMemoryAdapter
+
+
+def _exhaustive_bm25(docs, query, top_k, *, k1=1.2, b=0.75, dead=()):
+    count = len(docs)
+    avgdl = sum(sum(doc.values()) for doc in docs) / count
+    scored = []
+    for slot, doc in enumerate(docs):
+        if slot in dead:
+            continue
+        length = sum(doc.values())
+        score = 0.0
+        for token, query_tf in query.items():
+            tf = doc.get(token, 0)
+            if not tf:
+                continue
+            df = sum(1 for other in docs if token in other)
+            idf = math.log(1.0 + (count - df + 0.5) / (df + 0.5))
+            score += query_tf * idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * length / avgdl))
+        scored.append((score, slot))
+    scored.sort(key=lambda item: (-item[0], item[1]))
+    return scored[:top_k]
+
+
+def _zipf_docs(seed, size, vocab=200):
+    rng = random.Random(seed)
+    words = [f"w{i}" for i in range(vocab)]
+    weights = [1.0 / (rank + 1) for rank in range(vocab)]
+    return [Counter(rng.choices(words, weights, k=rng.randint(3, 25))) for _ in range(size)]
+
+
+def _assert_same_ranking(actual, expected):
+    assert [slot for _, slot in actual] == [slot for _, slot in expected]
+    assert [score for score, _ in actual] == pytest.approx([score for score, _ in expected])
+
+
+@pytest.mark.parametrize("top_k", [1, 5, 20])
+def test_maxscore_matches_exhaustive_ranking(top_k) -> None:
+    docs = _zipf_docs(0, 500)
+    index = BM25Index()
+    index.add_many(docs)
+
+    for query in _zipf_docs(1, 30):
+        # Distinct document lengths rarely tie, but ties must still resolve by slot.
+        _assert_same_ranking(index.search(query, top_k), _exhaustive_bm25(docs, query, top_k))
+
+
+def test_tombstoned_slots_are_skipped() -> None:
+    docs = _zipf_docs(2, 200)
+    index = BM25Index()
+    index.add_many(docs)
+    dead = set(range(0, 200, 3))
+    for slot in dead:
+        index.remove(slot)
+
+    for query in _zipf_docs(3, 10):
+        _assert_same_ranking(index.search(query, 10), _exhaustive_bm25(docs, query, 10, dead=dead))
+
+
+def test_pads_with_zero_scores_in_insertion_order() -> None:
+    index = BM25Index()
+    index.add_many([_embed("alpha"), _embed("beta"), _embed("gamma beta")])
+
+    assert index.search(_embed("gamma"), 3)[1:] == [(0.0, 0), (0.0, 1)]
+    assert index.search(_embed("missing"), 2) == [(0.0, 0), (0.0, 1)]
+
+
+def test_compaction_and_snapshot_preserve_rankings() -> None:
+    pytest.importorskip("numpy")
+    docs = _zipf_docs(4, 100)
+    index = BM25Index(k1=1.5, b=0.5)
+    index.add_many(docs)
+    keep = [slot for slot in range(100) if slot % 4]
+    compacted = index.compacted(keep)
+    restored = BM25Index.from_snapshot(*compacted.snapshot_state())
+    restored.add(docs[0])
+
+    reference = [docs[slot] for slot in keep] + [docs[0]]
+    for query in _zipf_docs(5, 10):
+        expected = _exhaustive_bm25(reference, query, 5, k1=1.5, b=0.5)
+        _assert_same_ranking(restored.search(query, 5), expected)
+
+
+def test_rare_terms_outrank_common_ones() -> None:
+    docs = [f"the the the note {i}" for i in range(20)]
+    docs.append("a zebra with stripes on the wide open savanna")
+    cosine, bm25 = FaissMemoryAdapter(), FaissMemoryAdapter(ranking="bm25")
+    cosine.save_many(docs)
+    bm25.save_many(docs)
+
+    assert cosine.retrieve("the zebra") == ["the the the note 0"]
+    assert bm25.retrieve("the zebra") == ["a zebra with stripes on the wide open savanna"]
+
+
+def test_sqlite_bm25_matches_in_memory_index(tmp_path) -> None:
+    rng = random.Random(6)
+    texts = [" ".join(f"w{rng.randrange(60)}" for _ in range(rng.randint(2, 15))) for _ in range(150)]
+    queries = [" ".join(f"w{rng.randrange(60)}" for _ in range(3)) for _ in range(20)]
+    sqlite_adapter = SQLiteVecMemoryAdapter(tmp_path / "bm25.db", ranking="bm25")
+    faiss_adapter = FaissMemoryAdapter(ranking="bm25")
+    sqlite_adapter.save_many(texts)
+    faiss_adapter.save_many(texts)
+
+    for query in queries:
+        assert sqlite_adapter.retrieve(query, top_k=5) == faiss_adapter.retrieve(query, top_k=5)
+    assert sqlite_adapter.retrieve_many(queries[:3], top_k=2) == faiss_adapter.retrieve_many(
+        queries[:3], top_k=2
+    )
+    sqlite_adapter.close()
+
+
+def test_sqlite_backfills_lengths_for_existing_databases(tmp_path) -> None:
+    path = tmp_path / "legacy.db"
+    legacy = sqlite3.connect(path)
+    legacy.executescript(
+        """
+        CREATE TABLE documents (id INTEGER PRIMARY KEY, text TEXT NOT NULL, norm REAL NOT NULL);
+        CREATE TABLE postings (
+            token TEXT NOT NULL, doc_id INTEGER NOT NULL, weight INTEGER NOT NULL,
+            PRIMARY KEY (token, doc_id)
+        ) WITHOUT ROWID;
+        INSERT INTO documents VALUES (1, 'rare word', 1.4142), (2, 'word word word', 3.0);
+        INSERT INTO postings VALUES ('rare', 1, 1), ('word', 1, 1), ('word', 2, 3);
+        """
+    )
+    legacy.commit()
+    legacy.close()
+
+    adapter = SQLiteVecMemoryAdapter(path, ranking="bm25")
+
+    lengths = adapter._conn.execute("SELECT id, length FROM documents ORDER BY id").fetchall()
+    assert lengths == [(1, 2), (2, 3)]
+    assert adapter.retrieve("rare") == ["rare word"]
+    adapter.close()
+
+
+def test_rejects_unknown_or_conflicting_rankings() -> None:
+    with pytest.raises(ValueError):
+        FaissMemoryAdapter(ranking="tfidf")
+    with pytest.raises(ValueError):
+        FaissMemoryAdapter(ranking="bm25", dense_dim=64)
+    with pytest.raises(ValueError):
+        SQLiteVecMemoryAdapter(ranking="tfidf")
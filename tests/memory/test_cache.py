@@ -0,0 +1,134 @@
+import pytest
+
+from cognitive_core.core.memory.cache import CachedMemoryAdapter
+from cognitive_core.core.memory.faiss_adapter import FaissMemoryAdapter
+from cognitive_core.core.memory.namespaced import NamespacedMemoryAdapter
+from cognitive_core.core.memory.sqlitevec_adapter import SQLiteVecMemoryAdapter
+from cognitive_core.utils import telemetry
+
+
+class CountingAdapter(FaissMemoryAdapter):
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls = 0
+
+    def retrieve(self, query, top_k=1):
+        self.calls += 1
+        return super().retrieve(query, top_k)
+
+    def retrieve_many(self, queries, top_k=1):
+        self.calls += len(queries)
+        return super().retrieve_many(queries, top_k)
+
+
+def test_normalised_queries_share_an_entry() -> None:
+    inner = CountingAdapter()
+    inner.save_many(["Paris is the capital of France", "Berlin is in Germany"])
+    cache = CachedMemoryAdapter(inner)
+
+    assert cache.retrieve("capital of France") == ["Paris is the capital of France"]
+    assert cache.retrieve("France, capital OF!") == ["Paris is the capital of France"]
+    assert cache.retrieve("capital of France", top_k=2) == [
+        "Paris is the capital of France",
+        "Berlin is in Germany",
+    ]
+    assert inner.calls == 2
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+@pytest.mark.parametrize("write", ["save", "delete", "upsert"])
+def test_writes_invalidate_entries(write) -> None:
+    inner = CountingAdapter()
+    ids = inner.save_many(["alpha memory", "beta memory"])
+    cache = CachedMemoryAdapter(inner)
+    before = cache.retrieve("memory", top_k=3)
+
+    if write == "save":
+        cache.save("gamma memory")
+    elif write == "delete":
+        inner.delete(ids[0])
+    else:
+        cache.upsert(ids[1], "beta memory updated")
+
+    assert cache.retrieve("memory", top_k=3) != before
+    assert inner.calls == 2
+
+
+def test_entries_expire_after_ttl() -> None:
+    now = [0.0]
+    inner = CountingAdapter()
+    inner.save("alpha")
+    cache = CachedMemoryAdapter(inner, ttl=10.0, clock=lambda: now[0])
+
+    cache.retrieve("alpha")
+    now[0] = 5.0
+    cache.retrieve("alpha")
+    now[0] = 20.0
+    cache.retrieve("alpha")
+
+    assert inner.calls == 2
+
+
+def test_lru_bound_evicts_least_recently_used() -> None:
+    inner = CountingAdapter()
+    inner.save_many(["a", "b", "c"])
+    cache = CachedMemoryAdapter(inner, maxsize=2)
+
+    cache.retrieve("a")
+    cache.retrieve("b")
+    cache.retrieve("a")
+    cache.retrieve("c")
+    cache.retrieve("a")
+    cache.retrieve("b")
+
+    assert inner.calls == 4
+    assert cache.stats()["cache_entries"] == 2
+
+
+def test_retrieve_many_only_fetches_missing_queries() -> None:
+    inner = CountingAdapter()
+    inner.save_many(["alpha", "beta", "gamma"])
+    cache = CachedMemoryAdapter(inner)
+    cache.retrieve("beta")
+
+    assert cache.retrieve_many(["alpha", "beta", "gamma"]) == [["alpha"], ["beta"], ["gamma"]]
+    assert inner.calls == 3
+
+
+def test_sqlite_writes_from_other_connections_invalidate(tmp_path) -> None:
+    writer = SQLiteVecMemoryAdapter(tmp_path / "memory.db")
+    reader = SQLiteVecMemoryAdapter(tmp_path / "memory.db")
+    writer.save("alpha memory")
+    cache = CachedMemoryAdapter(reader)
+
+    assert cache.retrieve("memory", top_k=2) == ["alpha memory"]
+    writer.save("beta memory")
+    assert cache.retrieve("memory", top_k=2) == ["alpha memory", "beta memory"]
+    writer.close()
+    reader.close()
+
+
+def test_namespace_is_part_of_the_key() -> None:
+    cache = CachedMemoryAdapter(NamespacedMemoryAdapter())
+    cache.save("alice memory", namespace="alice")
+    cache.save("bob memory", namespace="bob")
+
+    assert cache.retrieve("memory", namespace="alice") == ["alice memory"]
+    assert cache.retrieve("memory", namespace="bob") == ["bob memory"]
+
+
+def test_lookups_are_exported_to_telemetry(monkeypatch) -> None:
+    recorded = []
+    monkeypatch.setattr(
+        "cognitive_core.core.memory.cache.record_memory_cache_lookup",
+        lambda name, hit: recorded.append((name, hit)),
+    )
+    inner = FaissMemoryAdapter()
+    inner.save("alpha")
+    cache = CachedMemoryAdapter(inner, name="debate")
+
+    cache.retrieve("alpha")
+    cache.retrieve("alpha")
+
+    assert recorded == [("debate", False), ("debate", True)]
+    telemetry.record_memory_cache_lookup("debate", True)
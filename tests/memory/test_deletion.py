@@ -0,0 +1,178 @@
+import pytest
+
+from cognitive_core.core.memory.faiss_adapter import FaissMemoryAdapter
+from cognitive_core.core.memory.sqlitevec_adapter import SQLiteVecMemoryAdapter
+
+try:  # pragma: no cover - optional dependency
+    import numpy as np
+except Exception:  # pragma: no cover - fallback when numpy missing
+    np = None
+
+from cognitive_core.core.memory.ivf_index import IVFIndex
+
+
+needs_numpy = pytest.mark.skipif(np is None, reason="numpy is not installed")
+
+DOCS = [
+    "Paris is the capital of France",
+    "Berlin is the capital of Germany",
+    "Rome is the capital of Italy",
+    "Madrid is the capital of Spain",
+]
+
+ADAPTER_FACTORIES = [
+    pytest.param(lambda: FaissMemoryAdapter(compaction_threshold=None), id="faiss"),
+    pytest.param(lambda: SQLiteVecMemoryAdapter(compaction_threshold=None), id="sqlite"),
+    pytest.param(
+        lambda: FaissMemoryAdapter(ranking="bm25", compaction_threshold=None), id="faiss-bm25"
+    ),
+    pytest.param(
+        lambda: FaissMemoryAdapter(dense_dim=128, compaction_threshold=None),
+        id="faiss-dense",
+        marks=needs_numpy,
+    ),
+    pytest.param(
+        lambda: FaissMemoryAdapter(
+            index=IVFIndex(dim=128, nlist=2, train_size=3), compaction_threshold=None
+        ),
+        id="faiss-ivf",
+        marks=needs_numpy,
+    ),
+]
+
+
+@pytest.mark.parametrize("factory", ADAPTER_FACTORIES)
+def test_save_returns_distinct_ids(factory) -> None:
+    adapter = factory()
+    first = adapter.save(DOCS[0])
+    rest = adapter.save_many(DOCS[1:])
+
+    assert len({first, *rest}) == len(DOCS)
+
+
+@pytest.mark.parametrize("factory", ADAPTER_FACTORIES)
+def test_deleted_memories_are_not_retrieved(factory) -> None:
+    adapter = factory()
+    ids = adapter.save_many(DOCS)
+
+    assert adapter.delete(ids[1]) is True
+    assert adapter.delete(ids[1]) is False
+
+    assert "Berlin is the capital of Germany" not in adapter.retrieve("Berlin Germany", top_k=4)
+    assert len(adapter.retrieve("capital", top_k=10)) == 3
+    assert adapter.stats()["memories"] == 3
+
+
+@pytest.mark.parametrize("factory", ADAPTER_FACTORIES)
+def test_upsert_replaces_and_inserts(factory) -> None:
+    adapter = factory()
+    ids = adapter.save_many(DOCS)
+
+    adapter.upsert(ids[0], "Lyon is a city in France")
+    adapter.upsert(100, "Lisbon is the capital of Portugal")
+
+    assert adapter.retrieve("France", top_k=5).count("Lyon is a city in France") == 1
+    assert "Paris is the capital of France" not in adapter.retrieve("Paris", top_k=5)
+    assert adapter.retrieve("Lisbon Portugal") == ["Lisbon is the capital of Portugal"]
+    assert adapter.delete(100) is True
+    assert adapter.save("Vienna is the capital of Austria") > 100
+
+
+def test_faiss_upsert_rejects_negative_ids() -> None:
+    adapter = FaissMemoryAdapter(compaction_threshold=None)
+    adapter.save(DOCS[0])
+
+    with pytest.raises(ValueError):
+        adapter.upsert(-1, DOCS[1])
+    assert adapter.stats()["memories"] == 1
+
+
+@pytest.mark.parametrize("factory", ADAPTER_FACTORIES)
+def test_compaction_preserves_results_and_ids(factory) -> None:
+    adapter = factory()
+    # Distinct padding lengths keep scores tie-free across float32 rounding.
+    ids = adapter.save_many(f"{doc}{' filler' * i}" for i, doc in enumerate(DOCS * 5))
+    for memory_id in ids[::2]:
+        adapter.delete(memory_id)
+    queries = ["capital of France", "Germany", "Spain Madrid", "nothing"]
+    before = [adapter.retrieve(query, top_k=3) for query in queries]
+
+    adapter.compact()
+
+    assert [adapter.retrieve(query, top_k=3) for query in queries] == before
+    assert adapter.delete(ids[1]) is True
+    assert adapter.stats()["memories"] == len(ids) // 2 - 1
+
+
+def test_faiss_compacts_in_background_after_threshold() -> None:
+    adapter = FaissMemoryAdapter(compaction_threshold=0.5)
+    ids = adapter.save_many(f"memory number {i}" for i in range(10))
+    for memory_id in ids[:5]:
+        adapter.delete(memory_id)
+    adapter._compaction_thread.join()
+
+    stats = adapter.stats()
+    assert stats == {
+        "memories": 5,
+        "slots": 5,
+        "tombstones": 0,
+        "tombstone_ratio": 0.0,
+        "compactions": 1,
+    }
+    assert adapter.retrieve("memory number 7") == ["memory number 7"]
+    assert adapter.delete(ids[7]) is True
+
+
+def test_faiss_compaction_replays_concurrent_writes() -> None:
+    adapter = FaissMemoryAdapter(compaction_threshold=None)
+    ids = adapter.save_many(DOCS)
+    adapter.delete(ids[0])
+    index = adapter.index
+    original_compacted = index.compacted
+
+    def compacted_with_interleaved_writes(keep):
+        result = original_compacted(keep)
+        adapter.delete(ids[1])
+        adapter.save("Oslo is the capital of Norway")
+        return result
+
+    index.compacted = compacted_with_interleaved_writes
+    adapter.compact()
+
+    assert adapter.index is not index
+    assert adapter.retrieve("capital", top_k=10) == [
+        "Rome is the capital of Italy",
+        "Madrid is the capital of Spain",
+        "Oslo is the capital of Norway",
+    ]
+    assert adapter.stats()["tombstones"] == 1
+
+
+def test_sqlite_vacuums_after_threshold(tmp_path) -> None:
+    adapter = SQLiteVecMemoryAdapter(tmp_path / "memory.db", compaction_threshold=0.2)
+    ids = adapter.save_many(f"memory {i} " + "padding " * 50 + f"token{i}" for i in range(400))
+    for memory_id in ids[:300]:
+        adapter.delete(memory_id)
+    if adapter._compaction_thread is not None:
+        adapter._compaction_thread.join()
+
+    stats = adapter.stats()
+    assert stats["memories"] == 100
+    assert stats["compactions"] >= 1
+    assert adapter.retrieve("token350") == [f"memory 350 " + "padding " * 50 + "token350"]
+    adapter.close()
+
+
+@needs_numpy
+def test_snapshot_keeps_ids_and_tombstones(tmp_path) -> None:
+    adapter = FaissMemoryAdapter(compaction_threshold=None)
+    ids = adapter.save_many(DOCS)
+    adapter.delete(ids[2])
+    adapter.snapshot(tmp_path / "snap")
+
+    loaded = FaissMemoryAdapter.load(tmp_path / "snap")
+
+    assert "Rome is the capital of Italy" not in loaded.retrieve("Rome Italy", top_k=4)
+    assert loaded.delete(ids[3]) is True
+    assert loaded.save("Oslo is the capital of Norway") == ids[-1] + 1
+    assert loaded.stats()["tombstones"] == 2
@@ -0,0 +1,65 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from cognitive_core.core.memory.dense_index import DenseIndex
+from cognitive_core.core.memory.faiss_adapter import FaissMemoryAdapter, _embed
+from cognitive_core.core.memory.inverted_index import InvertedIndex
+
+
+def test_dense_mode_selects_relevant_context() -> None:
+    adapter = FaissMemoryAdapter(dense_dim=256)
+    adapter.save("Paris is the capital of France")
+    adapter.save("Berlin is the capital of Germany")
+    adapter.save("Rome is the capital of Italy")
+
+    assert adapter.retrieve("What is the capital of Germany?") == [
+        "Berlin is the capital of Germany"
+    ]
+    assert adapter.retrieve("Germany", top_k=0) == []
+
+
+def test_matrix_is_contiguous_and_normalised() -> None:
+    index = DenseIndex(dim=64, initial_capacity=2)
+    for text in ["alpha beta", "gamma", "", "delta delta epsilon"]:
+        index.add(_embed(text))
+
+    matrix = index.matrix
+    assert len(index) == 4
+    assert matrix.dtype == np.float32
+    assert matrix.flags["C_CONTIGUOUS"]
+    norms = np.linalg.norm(matrix, axis=1)
+    assert np.allclose(norms, [1.0, 1.0, 0.0, 1.0])
+
+
+def test_ties_are_broken_by_insertion_order() -> None:
+    index = DenseIndex(dim=32)
+    for text in ["same", "other", "same", "same"]:
+        index.add(_embed(text))
+
+    assert [slot for _, slot in index.search(_embed("same"), top_k=2)] == [0, 2]
+    assert [slot for _, slot in index.search(_embed(""), top_k=10)] == [0, 1, 2, 3]
+
+
+def test_wide_dense_index_matches_exact_scores() -> None:
+    rng = random.Random(3)
+    vocab = [f"w{i}" for i in range(50)]
+    exact = InvertedIndex()
+    dense = DenseIndex(dim=1 << 16)
+    for _ in range(100):
+        embedding = _embed(" ".join(rng.sample(vocab, k=5)))
+        exact.add(embedding)
+        dense.add(embedding)
+
+    for _ in range(20):
+        query = _embed(" ".join(rng.sample(vocab, k=3)))
+        exact_scores = {slot: score for score, slot in exact.search(query, top_k=100)}
+        for score, slot in dense.search(query, top_k=5):
+            assert score == pytest.approx(exact_scores[slot], abs=1e-5)
+
+
+def test_dense_index_rejects_invalid_dimension() -> None:
+    with pytest.raises(ValueError):
+        DenseIndex(dim=0)
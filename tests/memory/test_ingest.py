@@ -0,0 +1,113 @@
+import io
+import json
+
+import pytest
+
+from cognitive_core import cli
+from cognitive_core.core.memory.faiss_adapter import FaissMemoryAdapter
+from cognitive_core.core.memory.ingest import ingest, iter_records
+from cognitive_core.core.memory.sqlitevec_adapter import SQLiteVecMemoryAdapter
+
+
+class RecordingAdapter(FaissMemoryAdapter):
+    def __init__(self, produced) -> None:
+        super().__init__()
+        self.produced = produced
+        self.produced_at_first_store = None
+
+    def save_tokenized(self, texts, embeddings):
+        if self.produced_at_first_store is None:
+            self.produced_at_first_store = self.produced[0]
+        return super().save_tokenized(texts, embeddings)
+
+
+def test_iter_records_reads_text_and_jsonl() -> None:
+    text = io.StringIO("first line\n\n  second line  \r\n")
+    jsonl = io.StringIO('{"text": "alpha", "id": 1}\n"beta"\n\n{"body": "gamma"}\n')
+
+    assert list(iter_records(text)) == ["first line", "  second line  "]
+    records = iter_records(jsonl, format="jsonl")
+    assert [next(records), next(records)] == ["alpha", "beta"]
+    with pytest.raises(ValueError, match="Line 4"):
+        next(records)
+    with pytest.raises(ValueError, match="Line 1: invalid JSON"):
+        list(iter_records(io.StringIO("{oops\n"), format="jsonl"))
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_ingest_matches_save_many(workers) -> None:
+    texts = [f"memory {i} about topic{i % 7}" for i in range(250)]
+    expected = FaissMemoryAdapter()
+    expected.save_many(texts)
+    reports = []
+
+    adapter = FaissMemoryAdapter()
+    stats = ingest(adapter, iter(texts), chunk_size=40, workers=workers, progress=reports.append)
+
+    assert stats.documents == 250
+    assert stats.chunks == 7
+    assert len(reports) == 7
+    for query in ("topic3", "memory 17", "nothing"):
+        assert adapter.retrieve(query, top_k=5) == expected.retrieve(query, top_k=5)
+
+
+def test_ingest_streams_with_bounded_lookahead() -> None:
+    produced = [0]
+
+    def texts():
+        for i in range(1000):
+            produced[0] += 1
+            yield f"memory {i}"
+
+    adapter = RecordingAdapter(produced)
+    ingest(adapter, texts(), chunk_size=10, workers=1)
+
+    assert adapter.produced_at_first_store <= 3 * 10
+    assert adapter.stats()["memories"] == 1000
+
+
+def test_cli_ingests_jsonl_into_sqlite(tmp_path, capsys) -> None:
+    source = tmp_path / "memories.jsonl"
+    source.write_text(
+        "\n".join(json.dumps({"body": f"fact number {i}"}) for i in range(30)) + "\n",
+        encoding="utf-8",
+    )
+    output = tmp_path / "memory.db"
+
+    rc = cli.main(
+        [
+            "memory", "ingest", str(source), "--output", str(output),
+            "--field", "body", "--chunk-size", "8", "--workers", "0",
+        ]
+    )
+
+    assert rc == 0
+    summary = json.loads(capsys.readouterr().out)
+    assert summary["documents"] == 30
+    adapter = SQLiteVecMemoryAdapter(output)
+    assert adapter.retrieve("fact number 12") == ["fact number 12"]
+    adapter.close()
+
+
+def test_cli_ingests_text_into_faiss_snapshot(tmp_path, capsys) -> None:
+    pytest.importorskip("numpy")
+    source = tmp_path / "memories.txt"
+    source.write_text("alpha memory\nbeta memory\n", encoding="utf-8")
+
+    rc = cli.main(
+        ["memory", "ingest", str(source), "--backend", "faiss", "--output", str(tmp_path / "snap"), "--quiet"]
+    )
+
+    assert rc == 0
+    assert json.loads(capsys.readouterr().out)["documents"] == 2
+    assert FaissMemoryAdapter.load(tmp_path / "snap").retrieve("beta") == ["beta memory"]
+
+
+def test_cli_reports_bad_records(tmp_path, capsys) -> None:
+    source = tmp_path / "broken.jsonl"
+    source.write_text('{"text": "fine"}\n[1, 2]\n', encoding="utf-8")
+
+    rc = cli.main(["memory", "ingest", str(source), "--output", str(tmp_path / "m.db"), "--workers", "0"])
+
+    assert rc == 1
+    assert "Line 2" in capsys.readouterr().err
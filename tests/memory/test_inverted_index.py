@@ -0,0 +1,68 @@
+import heapq
+import math
+import random
+from collections import Counter
+
+from cognitive_core.core.memory.faiss_adapter import FaissMemoryAdapter, _embed
+from cognitive_core.core.memory.inverted_index import InvertedIndex
+
+
+def _cosine(a: Counter[str], b: Counter[str]) -> float:
+    dot = sum(a[token] * b[token] for token in set(a) & set(b))
+    norm_a = math.sqrt(sum(v * v for v in a.values()))
+    norm_b = math.sqrt(sum(v * v for v in b.values()))
+    if norm_a == 0 or norm_b == 0:
+        return 0.0
+    return dot / (norm_a * norm_b)
+
+
+def _linear_scan(docs: list[str], query: str, top_k: int) -> list[str]:
+    query_emb = _embed(query)
+    scored = ((_cosine(query_emb, _embed(doc)), doc) for doc in docs)
+    return [text for _, text in heapq.nlargest(top_k, scored, key=lambda item: item[0])]
+
+
+def test_search_only_touches_matching_postings() -> None:
+    index = InvertedIndex()
+    for text in ["alpha beta", "gamma", "beta beta delta"]:
+        index.add(_embed(text))
+
+    hits = index.search(_embed("beta"), top_k=2)
+
+    assert [slot for _, slot in hits] == [2, 0]
+    assert all(score > 0 for score, _ in hits)
+
+
+def test_search_pads_with_zero_scored_documents_in_insertion_order() -> None:
+    index = InvertedIndex()
+    for text in ["alpha", "beta", "gamma", ""]:
+        index.add(_embed(text))
+
+    assert index.search(_embed("gamma"), top_k=3) == [(1.0, 2), (0.0, 0), (0.0, 1)]
+    assert [slot for _, slot in index.search(_embed(""), top_k=10)] == [0, 1, 2, 3]
+
+
+def test_adapter_matches_linear_scan() -> None:
+    rng = random.Random(7)
+    vocab = [f"w{i}" for i in range(40)]
+    docs = [" ".join(rng.choices(vocab, k=rng.randint(0, 8))) for _ in range(300)]
+    adapter = FaissMemoryAdapter()
+    for doc in docs:
+        adapter.save(doc)
+
+    for _ in range(50):
+        query = " ".join(rng.choices(vocab, k=rng.randint(1, 4)))
+        for top_k in (1, 5, 50):
+            assert adapter.retrieve(query, top_k=top_k) == _linear_scan(docs, query, top_k)
+
+
+def test_tokens_are_interned_once_into_compact_buffers() -> None:
+    index = InvertedIndex()
+    for text in ["alpha beta", "beta gamma", "alpha alpha beta"]:
+        index.add(_embed(text))
+
+    assert index.vocabulary_size == 3
+    beta = index._vocab["beta"]
+    assert index._slots[beta].tolist() == [0, 1, 2]
+    assert index._weights[index._vocab["alpha"]].tolist() == [1, 2]
+    assert index._slots[beta].itemsize == 4
@@ -0,0 +1,77 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from cognitive_core.core.memory.dense_index import DenseIndex
+from cognitive_core.core.memory.faiss_adapter import FaissMemoryAdapter, _embed
+from cognitive_core.core.memory.ivf_index import IVFIndex
+
+
+def _topic_corpus(seed: int, size: int) -> list[str]:
+    rng = random.Random(seed)
+    topics = [[f"topic{t}word{i}" for i in range(20)] for t in range(8)]
+    return [" ".join(rng.choices(rng.choice(topics), k=6)) for _ in range(size)]
+
+
+def test_untrained_index_answers_exactly() -> None:
+    index = IVFIndex(dim=128, nlist=4, train_size=100)
+    exact = DenseIndex(dim=128)
+    for text in _topic_corpus(1, 50):
+        index.add(_embed(text))
+        exact.add(_embed(text))
+
+    assert not index.is_trained
+    query = _embed("topic3word1 topic3word2")
+    assert index.search(query, top_k=5) == exact.search(query, top_k=5)
+
+
+def test_probing_every_list_matches_exact_search() -> None:
+    index = IVFIndex(dim=256, nlist=8, nprobe=2, train_size=200)
+    exact = DenseIndex(dim=256)
+    docs = _topic_corpus(2, 400)
+    index.add_many(_embed(text) for text in docs)
+    exact.add_many(_embed(text) for text in docs)
+
+    assert index.is_trained
+    for query_text in _topic_corpus(3, 10):
+        query = _embed(query_text)
+        expected = [slot for _, slot in exact.search(query, top_k=10)]
+        assert [slot for _, slot in index.search(query, top_k=10, nprobe=8)] == expected
+
+
+def test_low_nprobe_keeps_high_recall_on_clustered_data() -> None:
+    index = IVFIndex(dim=256, nlist=8, nprobe=1, train_size=200)
+    exact = DenseIndex(dim=256)
+    docs = _topic_corpus(4, 600)
+    index.add_many(_embed(text) for text in docs)
+    exact.add_many(_embed(text) for text in docs)
+
+    hits = 0
+    queries = _topic_corpus(5, 20)
+    for query_text in queries:
+        query = _embed(query_text)
+        truth = {slot for _, slot in exact.search(query, top_k=5)}
+        hits += len(truth & {slot for _, slot in index.search(query, top_k=5)})
+    assert hits / (5 * len(queries)) >= 0.8
+
+
+def test_incremental_insertions_are_searchable_after_training() -> None:
+    adapter = FaissMemoryAdapter(index=IVFIndex(dim=256, nlist=4, nprobe=1, train_size=100))
+    adapter.save_many(_topic_corpus(6, 150))
+    assert adapter.index.is_trained
+
+    adapter.save("topic2word0 topic2word1 zebras")
+
+    assert adapter.retrieve("topic2word0 topic2word1 zebras") == ["topic2word0 topic2word1 zebras"]
+
+
+def test_adapter_rejects_conflicting_or_populated_indexes() -> None:
+    with pytest.raises(ValueError):
+        FaissMemoryAdapter(dense_dim=64, index=IVFIndex(dim=64))
+
+    populated = IVFIndex(dim=64)
+    populated.add(_embed("already here"))
+    with pytest.raises(ValueError):
+        FaissMemoryAdapter(index=populated)
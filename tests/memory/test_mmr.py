@@ -0,0 +1,81 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from cognitive_core.core.memory import (
+    FaissMemoryAdapter,
+    NamespacedMemoryAdapter,
+    SQLiteVecMemoryAdapter,
+)
+from cognitive_core.core.memory.faiss_adapter import _embed
+from cognitive_core.core.memory.mmr import mmr_select
+
+
+FACTORIES = [
+    pytest.param(FaissMemoryAdapter, id="faiss"),
+    pytest.param(lambda: FaissMemoryAdapter(ranking="bm25"), id="faiss-bm25"),
+    pytest.param(lambda: FaissMemoryAdapter(dense_dim=256), id="faiss-dense"),
+    pytest.param(SQLiteVecMemoryAdapter, id="sqlite"),
+    pytest.param(lambda: SQLiteVecMemoryAdapter(ranking="bm25"), id="sqlite-bm25"),
+]
+
+MEMORIES = [
+    "the deploy pipeline runs database migrations before release",
+    "the deploy pipeline runs database migrations before each release",
+    "the deploy pipeline runs the database migrations before release",
+    "release rollback restores a database snapshot",
+    "weekly report on office plants",
+]
+
+
+@pytest.mark.parametrize("factory", FACTORIES)
+def test_mmr_skips_near_duplicates(factory) -> None:
+    adapter = factory()
+    adapter.save_many(MEMORIES)
+
+    plain = adapter.retrieve("deploy pipeline database migrations release", top_k=2)
+    diverse = adapter.retrieve(
+        "deploy pipeline database migrations release", top_k=2, mmr_lambda=0.5
+    )
+
+    assert all(text in MEMORIES[:3] for text in plain)
+    assert diverse[0] == plain[0]
+    assert diverse[1] == MEMORIES[3]
+
+
+@pytest.mark.parametrize("factory", [FaissMemoryAdapter, SQLiteVecMemoryAdapter])
+def test_mmr_lambda_one_keeps_cosine_order(factory) -> None:
+    adapter = factory()
+    adapter.save_many(MEMORIES)
+
+    query = "restores the deploy database"
+    assert adapter.retrieve(query, top_k=3, mmr_lambda=1.0) == adapter.retrieve(query, top_k=3)
+
+
+def test_mmr_validates_options() -> None:
+    adapter = FaissMemoryAdapter()
+    adapter.save("alpha")
+
+    with pytest.raises(ValueError, match="mmr_lambda"):
+        adapter.retrieve("alpha", mmr_lambda=1.5)
+    with pytest.raises(ValueError, match="fetch_k"):
+        adapter.retrieve("alpha", top_k=3, mmr_lambda=0.5, fetch_k=2)
+    assert adapter.retrieve("alpha", top_k=0, mmr_lambda=0.5) == []
+    assert FaissMemoryAdapter().retrieve("alpha", mmr_lambda=0.5) == []
+
+
+def test_mmr_is_forwarded_by_namespaced_adapter() -> None:
+    adapter = NamespacedMemoryAdapter()
+    adapter.save_many(MEMORIES, namespace="ops")
+
+    assert adapter.retrieve(
+        "deploy pipeline database migrations release", top_k=2, namespace="ops", mmr_lambda=0.5
+    )[1] == MEMORIES[3]
+
+
+def test_mmr_select_prefers_uncovered_tokens() -> None:
+    candidates = [_embed(text) for text in ["a b", "a b", "a c", "d"]]
+
+    assert mmr_select(_embed("a b c"), candidates, 3, 0.5) == [0, 2, 3]
+    assert mmr_select(_embed("a b c"), candidates, 10, 1.0) == [0, 1, 2, 3]
+    assert mmr_select(_embed("a"), [], 2, 0.5) == []
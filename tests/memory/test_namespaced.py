@@ -0,0 +1,155 @@
+import threading
+
+import pytest
+
+from cognitive_core.core.memory.faiss_adapter import FaissMemoryAdapter
+from cognitive_core.core.memory.namespaced import (
+    MemoryQuotaExceededError,
+    NamespacedMemoryAdapter,
+)
+from cognitive_core.core.memory.sqlitevec_adapter import SQLiteVecMemoryAdapter
+
+
+def test_namespaces_are_isolated() -> None:
+    memory = NamespacedMemoryAdapter()
+    memory.save("Paris is the capital of France", namespace="alice")
+    memory.save("Berlin is the capital of Germany", namespace="bob")
+
+    assert memory.retrieve("capital", top_k=5, namespace="alice") == [
+        "Paris is the capital of France"
+    ]
+    assert memory.retrieve_many(["Germany", "France"], namespace="bob") == [
+        ["Berlin is the capital of Germany"],
+        ["Berlin is the capital of Germany"],
+    ]
+    assert memory.retrieve("capital", namespace="carol") == []
+    assert memory.namespaces() == ["alice", "bob"]
+
+
+def test_ids_and_deletion_are_scoped_to_the_namespace() -> None:
+    memory = NamespacedMemoryAdapter()
+    alice_id = memory.save("alice memory", namespace="alice")
+    bob_id = memory.save("bob memory", namespace="bob")
+
+    assert memory.delete(alice_id, namespace="bob") is (alice_id == bob_id)
+    assert memory.retrieve("memory", namespace="alice") == ["alice memory"]
+    assert memory.delete(alice_id, namespace="nobody") is False
+
+
+def test_quota_rejects_saves_past_the_limit() -> None:
+    memory = NamespacedMemoryAdapter(quota=2, quotas={"vip": 3})
+    ids = memory.save_many(["one", "two"], namespace="free")
+
+    with pytest.raises(MemoryQuotaExceededError):
+        memory.save("three", namespace="free")
+    with pytest.raises(MemoryQuotaExceededError):
+        memory.upsert(99, "three", namespace="free")
+    memory.upsert(ids[0], "one again", namespace="free")
+    memory.save_many(["a", "b", "c"], namespace="vip")
+
+    assert sorted(memory.retrieve("three", top_k=5, namespace="free")) == ["one again", "two"]
+    memory.delete(ids[1], namespace="free")
+    memory.save("three", namespace="free")
+
+
+@pytest.mark.parametrize(
+    "factory",
+    [
+        pytest.param(None, id="faiss"),
+        pytest.param(SQLiteVecMemoryAdapter, id="sqlite"),
+    ],
+)
+def test_cold_namespaces_are_spilled_and_reloaded(tmp_path, factory) -> None:
+    pytest.importorskip("numpy")
+    kwargs = {"factory": factory} if factory is not None else {}
+    memory = NamespacedMemoryAdapter(max_resident=2, spill_dir=tmp_path, **kwargs)
+    for tenant in ("t1", "t2", "t3"):
+        memory.save(f"{tenant} remembers the launch date", namespace=tenant)
+
+    assert memory.stats() == {"namespaces": 3, "resident": 2, "spilled": 1, "evictions": 1}
+    assert (tmp_path / "t1").exists()
+
+    assert memory.retrieve("launch", namespace="t1") == ["t1 remembers the launch date"]
+    memory.save("t1 adds a second memory", namespace="t1")
+    assert memory.stats()["evictions"] == 2
+    assert not (tmp_path / "t1").exists()
+    assert memory.retrieve("launch", namespace="t2") == ["t2 remembers the launch date"]
+    assert memory.stats(namespace="t1")["memories"] == 2
+
+
+def test_reloaded_namespaces_keep_the_factory_configuration(tmp_path) -> None:
+    pytest.importorskip("numpy")
+    (tmp_path / "sqlite").mkdir()
+    memory = NamespacedMemoryAdapter(
+        lambda: SQLiteVecMemoryAdapter(ranking="bm25"),
+        max_resident=1,
+        spill_dir=tmp_path / "sqlite",
+    )
+    memory.save("first", namespace="a")
+    memory.save("second", namespace="b")
+
+    with memory._use("a") as adapter:
+        assert adapter.ranking == "bm25"
+
+    memory = NamespacedMemoryAdapter(
+        lambda: FaissMemoryAdapter(compaction_threshold=None),
+        max_resident=1,
+        spill_dir=tmp_path / "faiss",
+    )
+    memory.save("first", namespace="a")
+    memory.save("second", namespace="b")
+
+    with memory._use("a") as adapter:
+        assert adapter.compaction_threshold is None
+        assert adapter.retrieve("first") == ["first"]
+
+
+def test_spilling_does_not_block_other_namespaces(tmp_path) -> None:
+    pytest.importorskip("numpy")
+    writing = threading.Event()
+    release = threading.Event()
+    released = []
+
+    class SlowSnapshots(FaissMemoryAdapter):
+        def snapshot(self, path) -> None:
+            writing.set()
+            released.append(release.wait(5))
+            super().snapshot(path)
+
+    memory = NamespacedMemoryAdapter(SlowSnapshots, max_resident=2, spill_dir=tmp_path)
+    memory.save("alpha", namespace="a")
+    memory.save("beta", namespace="b")
+    evicting = threading.Thread(target=memory.save, args=("gamma",), kwargs={"namespace": "c"})
+    evicting.start()
+    try:
+        assert writing.wait(5)
+        # "a" is being written to disk; "b" stays available meanwhile.
+        assert memory.retrieve("beta", namespace="b") == ["beta"]
+    finally:
+        release.set()
+        evicting.join()
+    assert released == [True]
+    assert memory.retrieve("alpha", namespace="a") == ["alpha"]
+
+
+def test_drop_namespace_discards_spilled_state(tmp_path) -> None:
+    pytest.importorskip("numpy")
+    memory = NamespacedMemoryAdapter(max_resident=1, spill_dir=tmp_path)
+    memory.save("first", namespace="a")
+    memory.save("second", namespace="b")
+
+    assert memory.drop_namespace("a") is True
+    assert memory.drop_namespace("a") is False
+    assert not (tmp_path / "a").exists()
+    assert memory.namespaces() == ["b"]
+
+
+@pytest.mark.parametrize("namespace", ["", "../etc", ".hidden", "a/b"])
+def test_rejects_unsafe_namespace_names(namespace) -> None:
+    with pytest.raises(ValueError):
+        NamespacedMemoryAdapter().save("text", namespace=namespace)
+
+
+def test_max_resident_requires_spill_dir() -> None:
+    with pytest.raises(ValueError):
+        NamespacedMemoryAdapter(max_resident=1)
@@ -0,0 +1,77 @@
+import functools
+import random
+
+import pytest
+
+from cognitive_core.core.memory.faiss_adapter import FaissMemoryAdapter
+from cognitive_core.core.memory.sharded import ShardedMemoryAdapter
+
+
+def _corpus(size: int, seed: int = 5) -> list[str]:
+    rng = random.Random(seed)
+    words = [f"w{i}" for i in range(40)]
+    return [" ".join(rng.choices(words, k=rng.randint(2, 8))) for _ in range(size)]
+
+
+@pytest.fixture
+def sharded():
+    adapters = []
+
+    def make(shards: int = 3, **kwargs) -> ShardedMemoryAdapter:
+        adapter = ShardedMemoryAdapter(shards, **kwargs)
+        adapters.append(adapter)
+        return adapter
+
+    yield make
+    for adapter in adapters:
+        adapter.close()
+
+
+def test_merged_ranking_matches_a_single_adapter(sharded) -> None:
+    corpus = _corpus(300)
+    queries = ["w1 w2", "w7", "w3 w3 w9 w30", "unknown"]
+    single = FaissMemoryAdapter()
+    single.save_many(corpus)
+    memory = sharded(4)
+
+    assert memory.save_many(corpus) == list(range(len(corpus)))
+    for query in queries:
+        assert memory.retrieve(query, top_k=7) == single.retrieve(query, top_k=7)
+    assert memory.retrieve_many(queries, top_k=5) == single.retrieve_many(queries, top_k=5)
+    assert memory.retrieve(queries[0], top_k=5, mmr_lambda=0.5) == single.retrieve(
+        queries[0], top_k=5, mmr_lambda=0.5
+    )
+
+
+def test_deletes_and_upserts_are_routed_to_the_owning_shard(sharded) -> None:
+    memory = sharded(3)
+    ids = memory.save_many(["alpha", "beta", "gamma", "delta"])
+    generation = memory.generation
+
+    assert memory.delete(ids[1]) is True
+    assert memory.delete(ids[1]) is False
+    assert memory.delete(-1) is False
+    memory.upsert(ids[2], "gamma ray")
+    memory.upsert(10, "epsilon")
+
+    assert memory.generation == generation + 3
+    assert memory.retrieve("beta", top_k=10) == ["alpha", "gamma ray", "delta", "epsilon"]
+    assert memory.retrieve("ray") == ["gamma ray"]
+    assert memory.save("zeta") == 11
+    stats = memory.stats()
+    assert stats["memories"] == 5
+    assert stats["shards"] == 3
+    memory.compact()
+    assert memory.stats()["tombstones"] == 0
+
+
+def test_shard_errors_are_raised_in_the_caller(sharded) -> None:
+    with pytest.raises(ValueError, match="Unknown ranking"):
+        sharded(2, factory=functools.partial(FaissMemoryAdapter, ranking="nope"))
+    with pytest.raises(ValueError):
+        ShardedMemoryAdapter(0)
+
+    memory = sharded(2)
+    memory.close()
+    with pytest.raises(RuntimeError, match="closed"):
+        memory.retrieve("anything")
@@ -0,0 +1,93 @@
+import sqlite3
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from cognitive_core.core.memory.faiss_adapter import FaissMemoryAdapter
+from cognitive_core.core.memory.ivf_index import IVFIndex
+from cognitive_core.core.memory.sqlitevec_adapter import SQLiteVecMemoryAdapter
+
+
+DOCS = [
+    "Paris is the capital of France",
+    "Berlin is the capital of Germany",
+    "Rome is the capital of Italy",
+    "Kyiv stands on the Dnipro — столиця України",
+    "",
+]
+QUERIES = ["capital of Germany", "Dnipro", "Italy Rome", "unknown"]
+
+FAISS_FACTORIES = [
+    pytest.param(FaissMemoryAdapter, id="inverted"),
+    pytest.param(lambda: FaissMemoryAdapter(ranking="bm25"), id="bm25"),
+    pytest.param(lambda: FaissMemoryAdapter(dense_dim=128), id="dense"),
+    pytest.param(
+        lambda: FaissMemoryAdapter(index=IVFIndex(dim=128, nlist=2, train_size=3)), id="ivf"
+    ),
+]
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+@pytest.mark.parametrize("factory", FAISS_FACTORIES)
+def test_faiss_snapshot_round_trip(tmp_path, factory, mmap) -> None:
+    adapter = factory()
+    adapter.save_many(DOCS)
+    adapter.snapshot(tmp_path / "snap")
+
+    loaded = FaissMemoryAdapter.load(tmp_path / "snap", mmap=mmap)
+
+    assert type(loaded.index) is type(adapter.index)
+    for query in QUERIES:
+        assert loaded.retrieve(query, top_k=3) == adapter.retrieve(query, top_k=3)
+
+
+@pytest.mark.parametrize("factory", FAISS_FACTORIES)
+def test_loaded_snapshot_accepts_new_memories_without_touching_files(tmp_path, factory) -> None:
+    adapter = factory()
+    adapter.save_many(DOCS)
+    adapter.snapshot(tmp_path / "snap")
+    before = {p.name: p.read_bytes() for p in (tmp_path / "snap").iterdir()}
+
+    loaded = FaissMemoryAdapter.load(tmp_path / "snap")
+    loaded.save("Madrid is the capital of Spain")
+    loaded.save("Berlin again, capital of Germany")
+
+    assert loaded.retrieve("capital of Spain Madrid") == ["Madrid is the capital of Spain"]
+    assert loaded.retrieve("Dnipro") == ["Kyiv stands on the Dnipro — столиця України"]
+    assert {p.name: p.read_bytes() for p in (tmp_path / "snap").iterdir()} == before
+
+    loaded.snapshot(tmp_path / "snap2")
+    reloaded = FaissMemoryAdapter.load(tmp_path / "snap2")
+    assert reloaded.retrieve("Madrid Spain") == ["Madrid is the capital of Spain"]
+
+
+def test_snapshot_of_empty_store(tmp_path) -> None:
+    FaissMemoryAdapter().snapshot(tmp_path / "empty")
+    loaded = FaissMemoryAdapter.load(tmp_path / "empty")
+
+    assert loaded.retrieve("anything") == []
+    loaded.save("first memory")
+    assert loaded.retrieve("memory") == ["first memory"]
+
+
+def test_sqlite_snapshot_round_trip(tmp_path) -> None:
+    adapter = SQLiteVecMemoryAdapter(tmp_path / "live.db")
+    adapter.save_many(DOCS)
+    adapter.snapshot(tmp_path / "snap.db")
+
+    mapped = SQLiteVecMemoryAdapter.load(tmp_path / "snap.db")
+    private = SQLiteVecMemoryAdapter.load(tmp_path / "snap.db", mmap=False)
+
+    for query in QUERIES:
+        expected = adapter.retrieve(query, top_k=3)
+        assert mapped.retrieve(query, top_k=3) == expected
+        assert private.retrieve(query, top_k=3) == expected
+
+    with pytest.raises(sqlite3.OperationalError):
+        mapped.save("snapshots opened with mmap are read-only")
+    private.save("Madrid is the capital of Spain")
+    assert private.retrieve("Madrid") == ["Madrid is the capital of Spain"]
+    assert mapped.retrieve("Madrid") != ["Madrid is the capital of Spain"]
+    for store in (adapter, mapped, private):
+        store.close()
@@ -0,0 +1,47 @@
+import random
+import sqlite3
+
+from cognitive_core.core.memory.faiss_adapter import FaissMemoryAdapter
+from cognitive_core.core.memory.sqlitevec_adapter import SQLiteVecMemoryAdapter
+
+
+def test_memories_persist_across_instances(tmp_path) -> None:
+    path = tmp_path / "memory.db"
+    adapter = SQLiteVecMemoryAdapter(path)
+    adapter.save("Paris is the capital of France")
+    adapter.save("Berlin is the capital of Germany")
+    adapter.close()
+
+    reopened = SQLiteVecMemoryAdapter(path)
+    assert reopened.retrieve("capital of Germany") == ["Berlin is the capital of Germany"]
+    reopened.close()
+
+
+def test_file_backed_store_uses_wal_and_is_shared(tmp_path) -> None:
+    path = tmp_path / "memory.db"
+    writer = SQLiteVecMemoryAdapter(path)
+    reader = SQLiteVecMemoryAdapter(path)
+
+    writer.save("shared memory between workers")
+
+    assert reader.retrieve("workers") == ["shared memory between workers"]
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    writer.close()
+    reader.close()
+
+
+def test_sql_ranking_matches_in_memory_index() -> None:
+    rng = random.Random(11)
+    vocab = [f"w{i}" for i in range(30)]
+    reference = FaissMemoryAdapter()
+    adapter = SQLiteVecMemoryAdapter()
+    for _ in range(200):
+        doc = " ".join(rng.choices(vocab, k=rng.randint(0, 8)))
+        reference.save(doc)
+        adapter.save(doc)
+
+    for _ in range(40):
+        query = " ".join(rng.choices(vocab, k=rng.randint(0, 4)))
+        for top_k in (1, 7, 40):
+            assert adapter.retrieve(query, top_k=top_k) == reference.retrieve(query, top_k=top_k)
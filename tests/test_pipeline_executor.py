@@ -1,7 +1,15 @@
 import asyncio
 import contextlib
+import os
+import time
 from unittest.mock import patch
 
+import pytest
+
+
+def _worker_pid(offset: int = 0) -> int:
+    return os.getpid() + offset
+
 
 def test_pipeline_executor_runs_steps():
     from cognitive_core.core.pipeline_executor import PipelineExecutor
@@ -37,6 +45,28 @@ def test_pipeline_executor_execute_awaits_async_steps():
     assert run.artifacts[0].data == 42
 
 
+def test_execute_runs_async_steps_on_one_long_lived_loop():
+    from cognitive_core.core.pipeline_executor import PipelineExecutor
+    from cognitive_core.domain.pipelines import Pipeline
+
+    loops = []
+
+    async def step():
+        loops.append(asyncio.get_running_loop())
+
+    executor = PipelineExecutor()
+    pipeline = Pipeline(id="loops", name="Loops", steps=[step, step, step])
+    executor.execute(pipeline)
+    executor.execute(pipeline)
+
+    assert len(loops) == 6 and len(set(loops)) == 1
+    executor.shutdown()
+    assert loops[0].is_closed()
+    executor.execute(pipeline)
+    assert loops[-1] is not loops[0]
+    executor.shutdown()
+
+
 def test_execute_async_runs_steps_in_parallel_and_records_events():
     from cognitive_core.core.pipeline_executor import PipelineExecutor
     from cognitive_core.domain.pipelines import Artifact, Pipeline, Run
@@ -123,3 +153,845 @@ def test_execute_async_runs_steps_in_parallel_and_records_events():
         start_event = next(e for e in run.events if e.step == step and e.type == "start")
         end_event = next(e for e in run.events if e.step == step and e.type == "end")
         assert start_event.timestamp <= end_event.timestamp
+
+
+def _diamond_pipeline(log: list[str], *, overlap: bool = False):
+    """fetch -> three branches -> merge.
+
+    With ``overlap`` every branch waits until all three have started, so the
+    run only completes if they run at the same time.
+    """
+
+    from cognitive_core.domain.pipelines import Pipeline, Task
+
+    branches_started = asyncio.Event()
+
+    async def fetch():
+        log.append("fetch")
+        await asyncio.sleep(0)
+        return 2
+
+    def make_branch(name: str, factor: int):
+        async def branch(fetch):
+            log.append(name)
+            if overlap:
+                if len(log) == 4:
+                    branches_started.set()
+                await asyncio.wait_for(branches_started.wait(), 5)
+            return fetch * factor
+
+        branch.__name__ = name
+        return Task(branch, depends_on=["fetch"])
+
+    def merge(double, triple, square):
+        log.append("merge")
+        return double + triple + square
+
+    return Pipeline(
+        id="diamond",
+        name="Diamond",
+        steps=[
+            Task(merge, depends_on=("double", "triple", "square")),
+            make_branch("double", 2),
+            make_branch("triple", 3),
+            make_branch("square", 2),
+            fetch,
+        ],
+    )
+
+
+def test_execute_runs_steps_in_dependency_order_and_passes_artifacts():
+    from cognitive_core.core.pipeline_executor import PipelineExecutor
+
+    log: list[str] = []
+    run = PipelineExecutor().execute(_diamond_pipeline(log))
+
+    assert log == ["fetch", "double", "triple", "square", "merge"]
+    assert [a.name for a in run.artifacts] == log
+    assert run.artifacts[-1].data == 4 + 6 + 4
+
+
+def test_execute_async_runs_independent_branches_concurrently():
+    from cognitive_core.core.pipeline_executor import PipelineExecutor
+
+    log: list[str] = []
+    # The branches wait for each other, so running them one after another
+    # would time out instead of completing.
+    run = asyncio.run(PipelineExecutor().execute_async(_diamond_pipeline(log, overlap=True)))
+
+    assert log[0] == "fetch" and log[-1] == "merge"
+    assert run.artifacts[-1].data == 14
+    starts = {e.step: e.timestamp for e in run.events if e.type == "start"}
+    ends = {e.step: e.timestamp for e in run.events if e.type == "end"}
+    assert all(starts[branch] >= ends["fetch"] for branch in ("double", "triple", "square"))
+    assert starts["merge"] >= max(ends[branch] for branch in ("double", "triple", "square"))
+
+
+def test_execute_async_cancels_pending_steps_when_a_step_fails():
+    from cognitive_core.core.pipeline_executor import PipelineExecutor
+    from cognitive_core.domain.pipelines import Pipeline, Task
+
+    cancelled = []
+
+    async def slow():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append("slow")
+            raise
+
+    def broken():
+        raise KeyError("boom")
+
+    def never(broken):
+        raise AssertionError("downstream of a failed step must not run")
+
+    pipeline = Pipeline(id="p", name="Fail", steps=[slow, broken, Task(never, depends_on="broken")])
+    with pytest.raises(KeyError):
+        asyncio.run(PipelineExecutor().execute_async(pipeline))
+    assert cancelled == ["slow"]
+
+
+def test_pipeline_rejects_invalid_dependencies():
+    from cognitive_core.domain.pipelines import Pipeline, Task
+
+    def a():
+        return 1
+
+    def b(a):
+        return a
+
+    with pytest.raises(ValueError, match="unknown step 'missing'"):
+        Pipeline(id="p", name="P", steps=[Task(b, depends_on=["missing"])])
+    with pytest.raises(ValueError, match="ambiguous"):
+        Pipeline(id="p", name="P", steps=[a, a, Task(b, depends_on=["a"])])
+    with pytest.raises(ValueError, match="cycle"):
+        Pipeline(
+            id="p",
+            name="P",
+            steps=[Task(a, depends_on=["b"]), Task(b, depends_on=["a"])],
+        )
+    assert Pipeline(id="p", name="P", steps=[a, a]).topological_order() == [0, 1]
+
+
+def test_execute_async_offloads_blocking_steps_to_pools():
+    from cognitive_core.core.pipeline_executor import PipelineExecutor
+    from cognitive_core.domain.pipelines import Pipeline, Task
+
+    import threading
+
+    # Each blocking step waits for the other and then for the loop to tick,
+    # so both only succeed if they run on the pool at once, off the loop.
+    both_started = threading.Barrier(2, timeout=5)
+    both_running = threading.Event()
+    ticked = threading.Event()
+
+    def block(result):
+        both_started.wait()
+        both_running.set()
+        return result if ticked.wait(5) else None
+
+    def blocking_one():
+        return block(1)
+
+    def blocking_two():
+        return block(2)
+
+    async def ticker():
+        for _ in range(5000):
+            if both_running.is_set():
+                ticked.set()
+                return
+            await asyncio.sleep(0.001)
+
+    pipeline = Pipeline(
+        id="offload",
+        name="Offload",
+        steps=[
+            Task(blocking_one, execution="thread"),
+            Task(blocking_two, execution="thread"),
+            ticker,
+            Task(_worker_pid, execution="process"),
+        ],
+    )
+    executor = PipelineExecutor(max_threads=2, max_processes=1)
+    try:
+        run = asyncio.run(executor.execute_async(pipeline))
+    finally:
+        executor.shutdown()
+
+    data = {a.name: a.data for a in run.artifacts}
+    assert data["blocking_one"] == 1 and data["blocking_two"] == 2
+    assert data["_worker_pid"] != os.getpid()
+
+
+def test_task_rejects_unknown_or_unsupported_execution_modes():
+    from cognitive_core.core.pipeline_executor import PipelineExecutor
+    from cognitive_core.domain.pipelines import Task
+
+    async def step():
+        return 1
+
+    with pytest.raises(ValueError, match="Unknown execution mode"):
+        Task(_worker_pid, execution="gpu")
+    with pytest.raises(ValueError, match="can only run inline"):
+        Task(step, execution="thread")
+    with pytest.raises(ValueError, match="max_threads"):
+        PipelineExecutor(max_threads=0)
+
+
+class _Gauge:
+    """Records how many of its steps run at once, across threads."""
+
+    def __init__(self) -> None:
+        import threading
+
+        self.running = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def step(self, name: str, resource: str | None = None):
+        from cognitive_core.domain.pipelines import Task
+
+        async def step():
+            with self._lock:
+                self.running += 1
+                self.peak = max(self.peak, self.running)
+            await asyncio.sleep(0.02)
+            with self._lock:
+                self.running -= 1
+
+        step.__name__ = name
+        return Task(step, resource=resource)
+
+
+def test_execute_async_limits_concurrency_per_run_and_per_executor():
+    from cognitive_core.core.pipeline_executor import PipelineExecutor
+    from cognitive_core.domain.pipelines import Pipeline
+
+    per_run = _Gauge()
+    pipeline = Pipeline(id="wide", name="Wide", steps=[per_run.step(f"s{i}") for i in range(12)])
+    run = asyncio.run(PipelineExecutor().execute_async(pipeline, max_concurrency=3))
+    assert per_run.peak == 3
+    assert len(run.artifacts) == 12
+
+    shared = _Gauge()
+    executor = PipelineExecutor(max_concurrency=4)
+    pipelines = [
+        Pipeline(id=f"p{n}", name="Wide", steps=[shared.step(f"s{i}") for i in range(6)])
+        for n in range(3)
+    ]
+
+    async def run_all():
+        return await asyncio.gather(*(executor.execute_async(p) for p in pipelines))
+
+    assert all(run.status == "completed" for run in asyncio.run(run_all()))
+    assert shared.peak == 4
+
+
+def test_resource_limits_apply_across_runs_on_different_event_loops():
+    import threading
+
+    from cognitive_core.core.pipeline_executor import PipelineExecutor
+    from cognitive_core.domain.pipelines import Pipeline
+
+    llm = _Gauge()
+    cpu = _Gauge()
+    lock = threading.Lock()
+    executor = PipelineExecutor(resource_limits={"llm": 2, "cpu": 1})
+
+    def make_pipeline(n: int) -> Pipeline:
+        steps = [llm.step(f"llm{i}", "llm") for i in range(4)]
+        steps += [cpu.step(f"cpu{i}", "cpu") for i in range(2)]
+        return Pipeline(id=f"p{n}", name="Mixed", steps=steps)
+
+    runs = []
+
+    def worker(n: int) -> None:
+        run = asyncio.run(executor.execute_async(make_pipeline(n)))
+        with lock:
+            runs.append(run)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(runs) == 3
+    assert llm.peak == 2
+    assert cpu.peak == 1
+
+
+def test_execute_shares_executor_limits_with_execute_async():
+    import threading
+
+    from cognitive_core.core.pipeline_executor import PipelineExecutor
+    from cognitive_core.domain.pipelines import Pipeline
+
+    gauge = _Gauge()
+    executor = PipelineExecutor(max_concurrency=2)
+
+    def make_pipeline(n: int) -> Pipeline:
+        return Pipeline(id=f"p{n}", name="Gauge", steps=[gauge.step(f"s{i}") for i in range(3)])
+
+    def worker(n: int) -> None:
+        if n % 2:
+            executor.execute(make_pipeline(n))
+        else:
+            asyncio.run(executor.execute_async(make_pipeline(n)))
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    executor.shutdown()
+
+    assert gauge.peak == 2
+
+
+_CACHE_INPUT = {"value": 1}
+
+
+def _cache_source():
+    return _CACHE_INPUT["value"]
+
+
+def _cache_double(_cache_source):
+    return _cache_source * 2
+
+
+def _cache_constant():
+    return "constant"
+
+
+def test_step_cache_skips_steps_whose_inputs_are_unchanged():
+    from cognitive_core.core.pipeline_executor import PipelineExecutor
+    from cognitive_core.core.step_cache import StepCache
+    from cognitive_core.domain.pipelines import Pipeline, Task
+
+    pipeline = Pipeline(
+        id="cached",
+        name="Cached",
+        steps=[
+            Task(_cache_source, cache=False),
+            Task(_cache_double, depends_on="_cache_source"),
+            _cache_constant,
+        ],
+    )
+    executor = PipelineExecutor(cache=StepCache())
+    _CACHE_INPUT["value"] = 1
+
+    first = executor.execute(pipeline)
+    second = asyncio.run(executor.execute_async(pipeline))
+    _CACHE_INPUT["value"] = 5
+    third = executor.execute(pipeline)
+
+    # Recording calls in a global list would change the steps' cache keys.
+    calls = [
+        e.step
+        for run in (first, second, third)
+        for e in run.events
+        if e.type == "start" and e.step != "_cache_source"
+    ]
+    assert calls == ["_cache_double", "_cache_constant", "_cache_double"]
+    assert sorted(map(repr, second.artifacts)) == sorted(map(repr, first.artifacts))
+    assert {e.step for e in second.events if e.type == "cache_hit"} == {
+        "_cache_double",
+        "_cache_constant",
+    }
+    assert [e.step for e in third.events if e.type == "cache_hit"] == ["_cache_constant"]
+    assert {a.name: a.data for a in third.artifacts}["_cache_double"] == 10
+
+
+_RESUME_CALLS: list = []
+_RESUME_FAIL = {"fail": True}
+
+
+def _resume_fetch():
+    _RESUME_CALLS.append("fetch")
+    return "document"
+
+
+def _resume_summarise(_resume_fetch):
+    _RESUME_CALLS.append("summarise")
+    if _RESUME_FAIL["fail"]:
+        raise RuntimeError("worker died")
+    return _resume_fetch.upper()
+
+
+def _resume_pipeline():
+    from cognitive_core.domain.pipelines import Pipeline, Task
+
+    return Pipeline(
+        id="resumable",
+        name="Resumable",
+        steps=[_resume_fetch, Task(_resume_summarise, depends_on="_resume_fetch")],
+    )
+
+
+@pytest.mark.parametrize("mode", ["sync", "async"])
+def test_resume_skips_checkpointed_steps(tmp_path, monkeypatch, mode):
+    from cognitive_core.core.checkpoint import FileCheckpointStore
+    from cognitive_core.core.pipeline_executor import PipelineExecutor
+    from cognitive_core.pipelines import registry
+
+    monkeypatch.setitem(registry._PIPELINES, "resumable", _resume_pipeline())
+    executor = PipelineExecutor(checkpoints=FileCheckpointStore(tmp_path))
+    _RESUME_CALLS.clear()
+    _RESUME_FAIL["fail"] = True
+
+    with pytest.raises(RuntimeError, match="worker died"):
+        executor.execute(_resume_pipeline())
+    (run_id,) = [path.name for path in tmp_path.iterdir()]
+    failed = FileCheckpointStore(tmp_path).load(run_id)
+    assert failed.run.status == "failed"
+    assert [(e.step, e.type) for e in failed.run.events] == [
+        ("_resume_fetch", "start"),
+        ("_resume_fetch", "end"),
+        ("_resume_summarise", "start"),
+    ]
+
+    _RESUME_FAIL["fail"] = False
+    resumed = PipelineExecutor(checkpoints=FileCheckpointStore(tmp_path))
+    if mode == "sync":
+        run = resumed.resume(run_id)
+    else:
+        run = asyncio.run(resumed.resume_async(run_id))
+
+    assert _RESUME_CALLS == ["fetch", "summarise", "summarise"]
+    assert run.id == run_id
+    assert run.status == "completed"
+    assert [a.data for a in run.artifacts] == ["document", "DOCUMENT"]
+    assert [e.type for e in run.events][-2:] == ["start", "end"]
+    assert FileCheckpointStore(tmp_path).load(run_id).run.status == "completed"
+
+
+def test_resume_requires_a_known_checkpoint(tmp_path):
+    from cognitive_core.core.checkpoint import FileCheckpointStore
+    from cognitive_core.core.pipeline_executor import PipelineExecutor
+
+    with pytest.raises(RuntimeError):
+        PipelineExecutor().resume("missing")
+    executor = PipelineExecutor(checkpoints=FileCheckpointStore(tmp_path))
+    with pytest.raises(ValueError):
+        executor.resume("missing")
+    with pytest.raises(ValueError):
+        executor.resume("../escape")
+
+
+def test_generator_steps_spill_their_chunks_to_disk(tmp_path):
+    from cognitive_core.core.pipeline_executor import PipelineExecutor
+    from cognitive_core.core.streaming import SpooledStream
+    from cognitive_core.domain.pipelines import Pipeline, Task
+
+    def documents():
+        for index in range(200):
+            yield f"document {index} " * 10
+
+    def count(documents):
+        return sum(1 for _ in documents)
+
+    pipeline = Pipeline(
+        id="spill",
+        name="Spill",
+        steps=[documents, Task(count, depends_on="documents")],
+    )
+    executor = PipelineExecutor(spill_threshold=4096, spill_directory=tmp_path)
+    for run in (executor.execute(pipeline), asyncio.run(executor.execute_async(pipeline))):
+        stream = run.artifacts[0].data
+        assert isinstance(stream, SpooledStream)
+        assert stream.spilled
+        assert len(stream) == 200
+        assert stream[199] == "document 199 " * 10
+        assert run.artifacts[1].data == 200
+
+
+def test_coroutine_steps_read_streams_with_backpressure():
+    from cognitive_core.core.pipeline_executor import PipelineExecutor
+    from cognitive_core.domain.pipelines import Pipeline, Task
+
+    log = []
+
+    async def tokens():
+        for index in range(40):
+            log.append(("produced", index))
+            yield index
+
+    async def consume(tokens):
+        total = 0
+        async for token in tokens:
+            log.append(("consumed", token))
+            total += token
+            await asyncio.sleep(0.001)
+        return total
+
+    pipeline = Pipeline(
+        id="stream",
+        name="Stream",
+        steps=[tokens, Task(consume, depends_on="tokens")],
+    )
+    run = asyncio.run(PipelineExecutor(stream_buffer=4).execute_async(pipeline))
+
+    assert {a.name: a.data for a in run.artifacts}["consume"] == sum(range(40))
+    produced = consumed = lag = 0
+    for kind, _ in log:
+        if kind == "produced":
+            produced += 1
+        else:
+            consumed += 1
+        lag = max(lag, produced - consumed)
+    # The consumer starts long before the producer finishes and never falls
+    # more than the buffer (plus the chunk being published) behind.
+    assert log.index(("consumed", 0)) < log.index(("produced", 39))
+    assert lag <= 5
+
+
+def test_execute_passes_finished_streams_to_coroutine_consumers():
+    from cognitive_core.core.pipeline_executor import PipelineExecutor
+    from cognitive_core.domain.pipelines import Pipeline, Task
+
+    def tokens():
+        yield from range(5)
+
+    async def consume(tokens):
+        return [token async for token in tokens]
+
+    pipeline = Pipeline(
+        id="stream", name="Stream", steps=[tokens, Task(consume, depends_on="tokens")]
+    )
+    executor = PipelineExecutor()
+    try:
+        run = executor.execute(pipeline)
+    finally:
+        executor.shutdown()
+
+    assert {a.name: a.data for a in run.artifacts}["consume"] == [0, 1, 2, 3, 4]
+
+
+def test_stream_failures_reach_readers():
+    from cognitive_core.core.pipeline_executor import PipelineExecutor
+    from cognitive_core.domain.pipelines import Pipeline, Task
+
+    async def broken():
+        yield "partial"
+        raise RuntimeError("producer failed")
+
+    async def consume(broken):
+        return [chunk async for chunk in broken]
+
+    pipeline = Pipeline(
+        id="broken", name="Broken", steps=[broken, Task(consume, depends_on="broken")]
+    )
+    with pytest.raises(RuntimeError):
+        asyncio.run(PipelineExecutor().execute_async(pipeline))
+
+
+def test_step_timeouts_cancel_hung_steps_and_release_their_slots(tmp_path):
+    from cognitive_core.core.checkpoint import FileCheckpointStore
+    from cognitive_core.core.pipeline_executor import PipelineExecutor, PipelineTimeoutError
+    from cognitive_core.domain.pipelines import Pipeline, Task
+
+    cancelled = []
+
+    async def hung():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append("hung")
+            raise
+
+    async def quick():
+        return "done"
+
+    store = FileCheckpointStore(tmp_path)
+    executor = PipelineExecutor(max_concurrency=1, checkpoints=store)
+    start = time.perf_counter()
+    with pytest.raises(PipelineTimeoutError, match="hung"):
+        pipeline = Pipeline(id="hung", name="Hung", steps=[Task(hung, timeout=0.05)])
+        asyncio.run(executor.execute_async(pipeline))
+    assert time.perf_counter() - start < 1
+    assert cancelled == ["hung"]
+    (run_id,) = [path.name for path in tmp_path.iterdir()]
+    assert store.load(run_id).run.status == "timed_out"
+    assert store.load(run_id).run.events[-1].type == "timeout"
+
+    run = asyncio.run(executor.execute_async(Pipeline(id="quick", name="Quick", steps=[quick])))
+    assert run.artifacts[0].data == "done"
+
+
+def test_run_timeouts_bound_sync_and_async_runs():
+    from cognitive_core.core.pipeline_executor import PipelineExecutor, PipelineTimeoutError
+    from cognitive_core.domain.pipelines import Pipeline
+
+    def slow():
+        time.sleep(0.5)
+
+    async def slow_async():
+        await asyncio.sleep(10)
+
+    executor = PipelineExecutor()
+    start = time.perf_counter()
+    with pytest.raises(PipelineTimeoutError, match="slow"):
+        executor.execute(Pipeline(id="slow", name="Slow", steps=[slow]), timeout=0.05)
+    with pytest.raises(PipelineTimeoutError, match="Run"):
+        asyncio.run(
+            executor.execute_async(
+                Pipeline(id="slow", name="Slow", steps=[slow_async]), timeout=0.05
+            )
+        )
+    assert time.perf_counter() - start < 0.4
+    with pytest.raises(ValueError):
+        executor.execute(Pipeline(id="slow", name="Slow", steps=[slow]), timeout=0)
+
+
+def test_execute_cancels_timed_out_coroutine_steps_on_the_shared_loop():
+    import threading
+
+    from cognitive_core.core.pipeline_executor import PipelineExecutor, PipelineTimeoutError
+    from cognitive_core.domain.pipelines import Pipeline, Task
+
+    cancelled = threading.Event()
+
+    async def hung():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    executor = PipelineExecutor()
+    with pytest.raises(PipelineTimeoutError, match="hung"):
+        executor.execute(Pipeline(id="hung", name="Hung", steps=[Task(hung, timeout=0.1)]))
+
+    assert cancelled.wait(2)
+    executor.shutdown()
+
+
+def test_timed_out_pool_steps_keep_their_slots_until_they_finish():
+    import threading
+
+    from cognitive_core.core.pipeline_executor import PipelineExecutor, PipelineTimeoutError
+    from cognitive_core.domain.pipelines import Pipeline, Task
+
+    lock = threading.Lock()
+    running = [0]
+    peak = [0]
+    released = threading.Event()
+
+    def stuck():
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        released.wait(5)
+        with lock:
+            running[0] -= 1
+
+    def wait_for_free_slots() -> None:
+        deadline = time.monotonic() + 5
+        while executor._slots.in_use and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    pipeline = Pipeline(id="stuck", name="Stuck", steps=[Task(stuck, execution="thread")])
+    executor = PipelineExecutor(max_concurrency=1, step_timeout=0.05)
+    runs = (
+        lambda timeout=None: executor.execute(pipeline, timeout=timeout),
+        lambda timeout=None: asyncio.run(executor.execute_async(pipeline, timeout=timeout)),
+    )
+    try:
+        for run in runs:
+            released.clear()
+            with pytest.raises(PipelineTimeoutError, match="Step 'stuck'"):
+                run()
+            # The abandoned step still runs, so it still holds the only slot
+            # and later runs cannot start a step beside it.
+            assert executor._slots.in_use == 1
+            for other in runs:
+                with pytest.raises(PipelineTimeoutError, match="Run"):
+                    other(timeout=0.05)
+            released.set()
+            wait_for_free_slots()
+            assert executor._slots.in_use == 0
+    finally:
+        released.set()
+        executor.shutdown()
+    assert peak[0] == 1
+
+
+def test_execute_does_not_start_steps_once_the_run_deadline_passed():
+    from cognitive_core.core.pipeline_executor import PipelineExecutor, PipelineTimeoutError
+    from cognitive_core.domain.pipelines import Pipeline
+
+    now = [0.0]
+    started = []
+
+    def use_up_the_budget():
+        started.append("first")
+        now[0] = 10.0
+
+    def second():
+        started.append("second")
+
+    pipeline = Pipeline(id="late", name="Late", steps=[use_up_the_budget, second])
+    with patch("cognitive_core.core.pipeline_executor.monotonic", lambda: now[0]):
+        with pytest.raises(PipelineTimeoutError, match="Run"):
+            PipelineExecutor().execute(pipeline, timeout=1)
+
+    assert started == ["first"]
+
+
+def test_hedged_steps_return_the_first_successful_attempt():
+    from cognitive_core.core.pipeline_executor import PipelineExecutor
+    from cognitive_core.domain.pipelines import Pipeline, Task
+
+    attempts = []
+
+    async def flaky_lookup():
+        attempts.append(len(attempts))
+        if len(attempts) == 1:
+            await asyncio.sleep(10)  # a straggler
+        return "answer"
+
+    pipeline = Pipeline(
+        id="hedged", name="Hedged", steps=[Task(flaky_lookup, hedge_after=0.02, timeout=1)]
+    )
+    start = time.perf_counter()
+    run = asyncio.run(PipelineExecutor().execute_async(pipeline))
+
+    assert time.perf_counter() - start < 0.5
+    assert run.artifacts[0].data == "answer"
+    assert [e.type for e in run.events] == ["start", "hedge", "end"]
+    assert attempts == [0, 1]
+
+
+def test_cancelling_a_run_cancels_its_running_steps():
+    from cognitive_core.core.pipeline_executor import PipelineExecutor
+    from cognitive_core.domain.pipelines import Pipeline
+
+    cancelled = []
+
+    async def step_a():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append("step_a")
+            raise
+
+    async def step_b():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append("step_b")
+            raise
+
+    async def scenario():
+        pipeline = Pipeline(id="cancel", name="Cancel", steps=[step_a, step_b])
+        run = asyncio.ensure_future(PipelineExecutor().execute_async(pipeline))
+        await asyncio.sleep(0.02)
+        run.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await run
+
+    asyncio.run(scenario())
+    assert sorted(cancelled) == ["step_a", "step_b"]
+
+
+def test_execute_many_bounds_runs_and_yields_in_completion_order():
+    from cognitive_core.core.pipeline_executor import PipelineExecutor
+    from cognitive_core.domain.pipelines import Pipeline
+
+    gauge = {"running": 0, "peak": 0}
+
+    async def fetch(delay):
+        gauge["running"] += 1
+        gauge["peak"] = max(gauge["peak"], gauge["running"])
+        await asyncio.sleep(max(delay, 0))
+        gauge["running"] -= 1
+        if delay < 0:
+            raise ValueError("negative delay")
+        return delay
+
+    pipeline = Pipeline(id="fetch", name="Fetch", steps=[fetch])
+    delays = [0.05, 0.01, -0.01, 0.03, 0.02]
+
+    async def collect():
+        return [
+            item
+            async for item in PipelineExecutor().execute_many(
+                ((pipeline, {"delay": delay}) for delay in delays), max_runs=2
+            )
+        ]
+
+    results = asyncio.run(collect())
+
+    assert sorted(index for index, _ in results) == [0, 1, 2, 3, 4]
+    assert gauge["peak"] == 2
+    outcomes = dict(results)
+    assert isinstance(outcomes[2], ValueError)
+    assert outcomes[0].artifacts[0].data == 0.05
+    assert outcomes[4].inputs == {"delay": 0.02}
+    # Short runs are reported before the long first one finishes.
+    assert results[0][0] == 1
+
+
+def test_execute_many_keeps_the_loop_responsive_with_offloaded_sync_steps():
+    from cognitive_core.core.pipeline_executor import PipelineExecutor
+    from cognitive_core.domain.pipelines import Pipeline
+
+    import threading
+
+    # Every run's step waits for the other three and then for the loop to
+    # tick, so they only succeed if all four overlap on threads, off the loop.
+    all_started = threading.Barrier(4, timeout=5)
+    all_running = threading.Event()
+    ticked = threading.Event()
+
+    def blocking():
+        all_started.wait()
+        all_running.set()
+        return "done" if ticked.wait(5) else None
+
+    pipeline = Pipeline(id="blocking", name="Blocking", steps=[blocking])
+    executor = PipelineExecutor(offload_sync_steps=True, max_threads=4)
+
+    async def scenario():
+        async def ticker():
+            while not all_running.is_set():
+                await asyncio.sleep(0.001)
+            ticked.set()
+
+        ticking = asyncio.ensure_future(ticker())
+        try:
+            return [
+                item async for item in executor.execute_many([(pipeline, {})] * 4, max_runs=4)
+            ]
+        finally:
+            ticking.cancel()
+
+    try:
+        results = asyncio.run(scenario())
+    finally:
+        executor.shutdown()
+
+    assert [run.artifacts[0].data for _, run in results] == ["done"] * 4
+
+
+def test_execute_many_reraises_errors_from_the_batch_iterator():
+    from cognitive_core.core.pipeline_executor import PipelineExecutor
+    from cognitive_core.domain.pipelines import Pipeline
+
+    pipeline = Pipeline(id="one", name="One", steps=[lambda: 1])
+
+    def batch():
+        yield pipeline, {}
+        raise ValueError("bad batch")
+
+    async def collect(results):
+        async for item in PipelineExecutor().execute_many(batch(), max_runs=2):
+            results.append(item)
+
+    results: list = []
+    with pytest.raises(ValueError, match="bad batch"):
+        asyncio.run(asyncio.wait_for(collect(results), 5))
+    assert len(results) <= 1
@@ -23,3 +23,87 @@ def test_aots_debate_missing_role_returns_404(api_client):
     assert resp.json()["detail"] == (
         "Role definition 'does-not-exist' not found in agents configuration directory."
     )
+
+
+def test_run_pipeline_batch_streams_ndjson(api_client):
+    import json
+
+    resp = api_client.post(
+        "/api/v1/pipelines/batch",
+        json={
+            "runs": [
+                {"pipeline_id": "sample"},
+                {"pipeline_id": "missing"},
+                {"pipeline_id": "sample", "inputs": {}},
+            ],
+            "max_runs": 2,
+        },
+    )
+    assert resp.status_code == 200, resp.text
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    results = sorted(map(json.loads, resp.text.splitlines()), key=lambda r: r["index"])
+    assert [r["index"] for r in results] == [0, 1, 2]
+    assert results[1]["status"] == "not_found"
+    for result in (results[0], results[2]):
+        assert result["status"] == "completed"
+        assert result["artifacts"] == ["result"]
+    assert results[0]["run_id"] != results[2]["run_id"]
+
+
+def test_run_pipeline_batch_streams_sse(api_client):
+    resp = api_client.post(
+        "/api/v1/pipelines/batch",
+        json={"runs": [{"pipeline_id": "sample"}]},
+        headers={"Accept": "text/event-stream"},
+    )
+    assert resp.status_code == 200, resp.text
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    assert resp.text.startswith("event: run\ndata: {")
+    assert api_client.post("/api/v1/pipelines/batch", json={"runs": []}).status_code == 422
+
+
+def test_submitted_runs_can_be_polled(api_client):
+    import time
+
+    from cognitive_core.api.routers import pipelines
+
+    resp = api_client.post("/api/v1/pipelines/runs", json={"pipeline_id": "sample"})
+    assert resp.status_code == 202, resp.text
+    run_id = resp.json()["run_id"]
+
+    # Wait on the queue directly so polling does not use up the rate limit.
+    deadline = time.monotonic() + 10
+    while pipelines.job_pool().queue.get(run_id).finished_at is None:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+    status = api_client.get(f"/api/v1/pipelines/runs/{run_id}")
+    assert status.status_code == 200, status.text
+    data = status.json()
+    assert data["run_id"] == run_id
+    assert data["status"] == "completed"
+    assert data["artifacts"] == [{"name": "result", "data": 1}]
+
+
+def test_app_startup_runs_jobs_queued_before_it_started():
+    import time
+
+    from fastapi.testclient import TestClient
+
+    from cognitive_core.api.main import app
+    from cognitive_core.api.routers import pipelines
+    from cognitive_core.core.job_queue import Job
+
+    pool = pipelines.job_pool()
+    pool.stop()
+    job = Job(pipeline_id="sample")
+    pool.queue.submit(job)
+
+    with TestClient(app):
+        deadline = time.monotonic() + 10
+        while pool.queue.get(job.id).finished_at is None:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+
+    assert pool.queue.get(job.id).status == "completed"
+    assert not pool._threads
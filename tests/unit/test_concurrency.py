@@ -0,0 +1,42 @@
+import asyncio
+
+import pytest
+
+from cognitive_core.core.concurrency import SharedSemaphore
+
+
+def test_cancelled_waiter_does_not_leak_a_slot():
+    semaphore = SharedSemaphore(1)
+
+    async def scenario():
+        await semaphore.acquire()
+        waiter = asyncio.ensure_future(semaphore.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        semaphore.release()
+        async with semaphore:
+            assert semaphore.in_use == 1
+
+    asyncio.run(scenario())
+    assert semaphore.in_use == 0
+
+
+def test_blocking_acquire_waits_for_a_slot_or_times_out():
+    import threading
+
+    semaphore = SharedSemaphore(1)
+    assert semaphore.acquire_blocking()
+    assert not semaphore.acquire_blocking(timeout=0.01)
+
+    threading.Timer(0.05, semaphore.release).start()
+    assert semaphore.acquire_blocking(timeout=5)
+    assert semaphore.in_use == 1
+    semaphore.release()
+    assert semaphore.in_use == 0
+
+
+def test_semaphore_rejects_non_positive_values():
+    with pytest.raises(ValueError):
+        SharedSemaphore(0)
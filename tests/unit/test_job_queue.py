@@ -0,0 +1,273 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from cognitive_core.core.job_queue import (
+    InMemoryJobQueue,
+    Job,
+    JobWorkerPool,
+    RedisJobQueue,
+    SQLiteJobQueue,
+)
+from cognitive_core.core.pipeline_executor import PipelineExecutor
+from cognitive_core.domain.pipelines import Pipeline, Task
+
+
+class FakeRedis:
+    """Local stand-in for the Redis commands used by RedisJobQueue."""
+
+    def __init__(self) -> None:
+        self.values = {}
+        self.expiry = {}
+        self.lists = {}
+        self.sorted_sets = {}
+        self.ready = threading.Condition()
+
+    def set(self, key, value, ex=None):
+        with self.ready:
+            self.values[key] = value
+            self.expiry[key] = ex
+
+    def get(self, key):
+        with self.ready:
+            return self.values.get(key)
+
+    def lpush(self, key, value):
+        with self.ready:
+            self.lists.setdefault(key, []).insert(0, value)
+            self.ready.notify_all()
+
+    def rpush(self, key, value):
+        with self.ready:
+            self.lists.setdefault(key, []).append(value)
+            self.ready.notify_all()
+
+    def zadd(self, key, mapping, xx=False):
+        with self.ready:
+            members = self.sorted_sets.setdefault(key, {})
+            for member, score in mapping.items():
+                if member in members or not xx:
+                    members[member] = score
+
+    def zrem(self, key, member):
+        with self.ready:
+            return int(self.sorted_sets.get(key, {}).pop(member, None) is not None)
+
+    def zrangebyscore(self, key, low, high):
+        with self.ready:
+            members = self.sorted_sets.get(key, {})
+            return [member for member, score in members.items() if float(low) <= score <= high]
+
+    def brpop(self, keys, timeout=0):
+        with self.ready:
+            found = self.ready.wait_for(
+                lambda: any(self.lists.get(key) for key in keys), timeout or None
+            )
+            if not found:
+                return None
+            key = next(key for key in keys if self.lists.get(key))
+            return key, self.lists[key].pop()
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_queue(kind, tmp_path, **kwargs):
+    if kind == "memory":
+        kwargs.pop("lease", None)
+        return InMemoryJobQueue(**kwargs)
+    if kind == "sqlite":
+        return SQLiteJobQueue(tmp_path / "jobs.db", poll_interval=0.01, **kwargs)
+    return RedisJobQueue(client=FakeRedis(), **kwargs)
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def queue(request, tmp_path):
+    return make_queue(request.param, tmp_path)
+
+
+def test_queue_hands_out_jobs_in_submission_order(queue):
+    first = Job(pipeline_id="sample", inputs={"n": 1})
+    second = Job(pipeline_id="sample")
+    queue.submit(first)
+    queue.submit(second)
+
+    claimed = queue.claim(timeout=1)
+    assert claimed.id == first.id
+    assert claimed.inputs == {"n": 1}
+    assert claimed.status == "running"
+    assert queue.get(first.id).status == "running"
+    assert queue.get(second.id).status == "queued"
+
+    claimed.status = "completed"
+    queue.update(claimed)
+    assert queue.get(first.id).status == "completed"
+    assert queue.claim(timeout=1).id == second.id
+    assert queue.get("missing") is None
+
+
+@pytest.mark.parametrize("kind", ["memory", "sqlite", "redis"])
+def test_finished_jobs_are_dropped_after_the_retention_period(kind, tmp_path):
+    clock = Clock()
+    queue = make_queue(kind, tmp_path, retention=60, clock=clock)
+    old, new = Job(pipeline_id="sample"), Job(pipeline_id="sample")
+    queue.submit(old)
+    queue.submit(new)
+    for job in (queue.claim(timeout=1), queue.claim(timeout=1)):
+        job.status = "completed"
+        queue.update(job)
+        clock.now += 61
+
+    if kind == "redis":
+        # Redis expires the records itself.
+        assert queue.client.expiry[f"cce_jobs:job:{old.id}"] == 60
+        return
+    assert queue.get(old.id) is None
+    assert queue.get(new.id).status == "completed"
+
+
+@pytest.mark.parametrize("kind", ["sqlite", "redis"])
+def test_running_jobs_are_requeued_once_their_lease_expires(kind, tmp_path):
+    clock = Clock()
+    queue = make_queue(kind, tmp_path, lease=30, clock=clock)
+    kept, orphaned = Job(pipeline_id="sample"), Job(pipeline_id="sample")
+    queue.submit(kept)
+    queue.submit(orphaned)
+    assert queue.claim(timeout=1).id == kept.id
+    assert queue.claim(timeout=1).id == orphaned.id
+
+    clock.now += 20
+    queue.heartbeat([kept.id])
+    clock.now += 20
+    reclaimed = queue.claim(timeout=1)
+
+    assert reclaimed.id == orphaned.id
+    assert reclaimed.status == "running"
+    assert queue.get(kept.id).status == "running"
+    assert queue.claim(timeout=0.01) is None
+
+
+def test_sqlite_queue_closes_its_connections(tmp_path, monkeypatch):
+    opened = []
+    connect = SQLiteJobQueue._connect
+
+    def tracked(self):
+        conn = connect(self)
+        opened.append(conn)
+        return conn
+
+    monkeypatch.setattr(SQLiteJobQueue, "_connect", tracked)
+    queue = SQLiteJobQueue(tmp_path / "jobs.db")
+    job = Job(pipeline_id="p")
+    queue.submit(job)
+    queue.heartbeat([job.id])
+    assert queue.claim(timeout=0).id == job.id
+    job.status = "completed"
+    queue.update(job)
+    assert queue.get(job.id).status == "completed"
+
+    assert len(opened) == 6
+    for conn in opened:
+        with pytest.raises(sqlite3.ProgrammingError, match="closed"):
+            conn.execute("SELECT 1")
+
+
+def test_empty_queue_claim_times_out():
+    queue = InMemoryJobQueue()
+    start = time.perf_counter()
+    assert queue.claim(timeout=0.05) is None
+    assert time.perf_counter() - start < 1
+
+
+def test_worker_pool_runs_queued_pipelines(queue):
+    def double(n):
+        return n * 2
+
+    def explode():
+        raise RuntimeError("boom")
+
+    pipelines = {
+        "double": Pipeline(id="double", name="Double", steps=[double]),
+        "explode": Pipeline(id="explode", name="Explode", steps=[Task(explode)]),
+    }
+    pool = JobWorkerPool(queue, PipelineExecutor(), pipelines.get, workers=2, poll_interval=0.05)
+    try:
+        jobs = [
+            pool.submit("double", {"n": 21}),
+            pool.submit("explode"),
+            pool.submit("missing"),
+        ]
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            results = [queue.get(job.id) for job in jobs]
+            if all(result.finished_at for result in results):
+                break
+            time.sleep(0.01)
+    finally:
+        pool.stop()
+
+    doubled, exploded, missing = results
+    assert doubled.status == "completed"
+    assert doubled.artifacts == [{"name": "double", "data": 42}]
+    assert exploded.status == "failed"
+    assert exploded.error == "RuntimeError: boom"
+    assert missing.status == "failed"
+    assert "Unknown pipeline" in missing.error
+
+
+def _wait_until_finished(queue, jobs):
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        results = [queue.get(job.id) for job in jobs]
+        if all(result.finished_at for result in results):
+            return results
+        time.sleep(0.01)
+    return results
+
+
+def test_worker_pool_retries_recording_finished_jobs():
+    queue = InMemoryJobQueue()
+    update = queue.update
+    failures = []
+
+    def flaky_update(job):
+        if not failures:
+            failures.append(job.id)
+            raise OSError("connection reset")
+        update(job)
+
+    queue.update = flaky_update
+    pipeline = Pipeline(id="one", name="One", steps=[lambda: 1])
+    pool = JobWorkerPool(queue, PipelineExecutor(), {"one": pipeline}.get, poll_interval=0.01)
+    try:
+        first = pool.submit("one")
+        second = pool.submit("one")
+        results = _wait_until_finished(queue, [first, second])
+    finally:
+        pool.stop()
+
+    assert failures == [first.id]
+    assert [result.status for result in results] == ["completed", "completed"]
+
+
+def test_worker_pool_start_replaces_dead_workers():
+    queue = InMemoryJobQueue()
+    pipeline = Pipeline(id="one", name="One", steps=[lambda: 1])
+    pool = JobWorkerPool(queue, PipelineExecutor(), {"one": pipeline}.get, workers=1)
+    dead = threading.Thread(target=lambda: None, name="pipeline-job-0")
+    dead.start()
+    dead.join()
+    pool._threads.append(dead)
+    try:
+        (result,) = _wait_until_finished(queue, [pool.submit("one")])
+        assert result.status == "completed"
+        assert dead not in pool._threads
+    finally:
+        pool.stop()
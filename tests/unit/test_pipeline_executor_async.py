@@ -1,7 +1,12 @@
 import asyncio
+import time
+from unittest.mock import patch
 
+import pytest
+
+from cognitive_core.core.pipeline_executor import PipelineTimeoutError
 from cognitive_core.core.pipeline_executor_async import PipelineExecutorAsync
-from cognitive_core.domain.pipelines import Pipeline
+from cognitive_core.domain.pipelines import Pipeline, Task
 
 
 def test_execute_awaits_coroutine_steps():
@@ -23,3 +28,62 @@ def test_execute_awaits_coroutine_steps():
     assert [a.data for a in run.artifacts] == ["a", "b"]
     assert run.status == "completed"
     assert len(run.events) == 4
+
+
+def test_execute_honours_declared_dependencies():
+    async def load():
+        return [3, 1, 2]
+
+    def total(load):
+        return sum(load)
+
+    pipeline = Pipeline(id="p_dag", name="Dag", steps=[Task(total, depends_on=["load"]), load])
+    run = asyncio.run(PipelineExecutorAsync().execute(pipeline))
+
+    assert [(a.name, a.data) for a in run.artifacts] == [("load", [3, 1, 2]), ("total", 6)]
+
+
+def test_execute_times_out_hung_coroutine_steps():
+    async def hung():
+        await asyncio.sleep(10)
+
+    pipeline = Pipeline(id="p_hung", name="Hung", steps=[Task(hung, timeout=0.05)])
+    with pytest.raises(PipelineTimeoutError):
+        asyncio.run(PipelineExecutorAsync().execute(pipeline))
+
+
+def test_execute_fails_sync_steps_that_overrun_the_run_deadline():
+    now = [0.0]
+    started = []
+
+    def slow():
+        started.append("slow")
+        now[0] = 10.0
+
+    def after():
+        started.append("after")
+
+    pipeline = Pipeline(id="p_late", name="Late", steps=[slow, after])
+    with patch("cognitive_core.core.pipeline_executor_async.monotonic", lambda: now[0]):
+        with pytest.raises(PipelineTimeoutError, match="Run"):
+            asyncio.run(PipelineExecutorAsync().execute(pipeline, timeout=1))
+
+    assert started == ["slow"]
+
+
+def test_execute_does_not_start_steps_once_the_run_deadline_passed():
+    started = []
+
+    async def use_up_the_budget():
+        started.append("first")
+        time.sleep(0.06)
+
+    def second():
+        started.append("second")
+
+    executor = PipelineExecutorAsync()
+    pipeline = Pipeline(id="p_spent", name="Spent", steps=[use_up_the_budget, second])
+    with pytest.raises(PipelineTimeoutError, match="Run"):
+        asyncio.run(executor.execute(pipeline, timeout=0.05))
+
+    assert started == ["first"]
@@ -0,0 +1,93 @@
+import threading
+
+import pytest
+
+from cognitive_core.core.step_cache import StepCache
+from cognitive_core.domain.pipelines import Artifact, Task
+
+
+def summarise(text):
+    return text.upper()
+
+
+CONFIG = {"model": "a"}
+
+
+def _model_name():
+    return CONFIG["model"]
+
+
+def describe(text):
+    return f"{_model_name()}: {text}"
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_key_depends_on_step_identity_and_inputs():
+    cache = StepCache()
+    task = Task(summarise)
+
+    assert cache.key(task, {"text": "a"}) == cache.key(Task(summarise), {"text": "a"})
+    assert cache.key(task, {"text": "a"}) != cache.key(task, {"text": "b"})
+    assert cache.key(task, {"text": "a"}) != cache.key(Task(summarise, name="other"), {"text": "a"})
+    assert cache.key(Task(lambda: 1), {}) != cache.key(Task(lambda: 2), {})
+    assert cache.key(task, {"text": lambda: None}) is None
+
+
+def test_key_covers_referenced_globals_and_helpers(monkeypatch):
+    cache = StepCache()
+    task = Task(describe)
+    before = cache.key(task, {"text": "a"})
+
+    monkeypatch.setitem(CONFIG, "model", "b")
+    assert cache.key(task, {"text": "a"}) != before
+    monkeypatch.setitem(CONFIG, "model", "a")
+    assert cache.key(task, {"text": "a"}) == before
+
+    monkeypatch.setitem(globals(), "_model_name", lambda: "a")
+    assert cache.key(task, {"text": "a"}) != before
+    monkeypatch.undo()
+    assert cache.key(task, {"text": "a"}) == before
+
+    monkeypatch.setitem(CONFIG, "model", threading.Lock())
+    assert cache.key(task, {"text": "a"}) is None
+
+
+def test_disk_tier_survives_restarts_and_expires(tmp_path):
+    clock = Clock()
+    cache = StepCache(directory=tmp_path, ttl=60, clock=clock)
+    key = cache.key(Task(summarise), {"text": "a"})
+    cache.put(key, Artifact(name="summarise", data="A"))
+
+    restarted = StepCache(directory=tmp_path, ttl=60, clock=clock)
+    assert restarted.get(key) == Artifact(name="summarise", data="A")
+
+    clock.now += 61
+    assert StepCache(directory=tmp_path, ttl=60, clock=clock).get(key) is None
+    assert restarted.get(key) is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_memory_and_disk_tiers_are_bounded(tmp_path):
+    cache = StepCache(maxsize=2, directory=tmp_path, max_bytes=600)
+    keys = [cache.key(Task(summarise), {"text": str(i)}) for i in range(10)]
+    for key in keys:
+        cache.put(key, Artifact(name="summarise", data="x" * 100))
+
+    assert len(cache._entries) == 2
+    assert sum(path.stat().st_size for path in tmp_path.iterdir()) <= 600
+    assert cache.get(keys[-1]) is not None
+    assert StepCache(directory=tmp_path).get(keys[0]) is None
+
+
+def test_step_cache_rejects_invalid_bounds():
+    with pytest.raises(ValueError):
+        StepCache(maxsize=0)
+    with pytest.raises(ValueError):
+        StepCache(ttl=0)